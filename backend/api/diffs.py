@@ -1,13 +1,31 @@
-from flask import Blueprint, jsonify, request
+import os
+from flask import Blueprint, Response, jsonify, request, send_file
 from flask_jwt_extended import jwt_required
 from flask_cors import CORS
 from sqlalchemy.exc import IntegrityError
 
 from services.diff_service import (
+    DIFF_MODES,
+    DEFAULT_DIFF_MODE,
+    REPORT_PAGE_SIZE,
+    add_filter_rule,
     generate_and_save_filtered_diff,
-    get_diff_report_html_content,
+    get_diff_cache_stats,
+    get_diff_report_page,
+    get_diff_report_path,
+    get_filter_rules,
+    restore_evicted_report,
+)
+from services.diff_report_store import is_compressed, iter_report_bytes
+from services.diff_job_service import (
+    enqueue_diff_batch,
+    enqueue_diff_job,
+    get_diff_job,
+    run_diff_batch,
+    series_to_pairs,
 )
 from codesys_doc_tracker.models.diff_model import Diff
+from codesys_doc_tracker.models.diff_filter_rule_model import DiffFilterRule
 
 apiDiff = Blueprint('apiDiff', __name__, url_prefix='/api/diffs')
 CORS(apiDiff)
@@ -19,23 +37,40 @@ def compare_xml_files():
     data = request.get_json()
     file1_id = data.get('file1_id')
     file2_id = data.get('file2_id')
+    mode = data.get('mode') or DEFAULT_DIFF_MODE
+    project = data.get('project')
+    run_async = bool(data.get('async'))
 
     if not file1_id or not file2_id:
         return jsonify({"success": False, "message": "Her iki dosya ID'si de gerekli."}), 400
+    if mode not in DIFF_MODES:
+        return jsonify({"success": False, "message": f"Geçersiz diff modu. Desteklenen modlar: {', '.join(DIFF_MODES)}"}), 400
 
-    try:
-        diff_filename, diff_summary = generate_and_save_filtered_diff(file1_id, file2_id)
+    if run_async:
+        try:
+            job = enqueue_diff_job(file1_id, file2_id, mode=mode, project=project)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 404
+        except Exception as e:
+            return jsonify({"success": False, "message": f"Bir hata oluştu: {str(e)}"}), 500
+        return jsonify({
+            "success": True,
+            "message": "Karşılaştırma kuyruğa alındı.",
+            "data": {"job_id": job.id, "status": job.status}
+        }), 202
 
-        diff_row = Diff.query.filter_by(diffReport_name=diff_filename).order_by(Diff.created_at.desc()).first()
-        diff_id = diff_row.id if diff_row else None
+    try:
+        diff_row, diff_summary, cached = generate_and_save_filtered_diff(file1_id, file2_id, mode=mode, project=project)
 
         return jsonify({
             "success": True,
             "message": "Fark karşılaştırma başarılı. Rapor oluşturuldu.",
             "data": {
-                "diff_id": diff_id,
-                "diff_filename": diff_filename,
-                "summary": diff_summary
+                "diff_id": diff_row.id,
+                "diff_filename": diff_row.diffReport_name,
+                "summary": diff_summary,
+                "cached": cached,
+                "stats": diff_row.stats_dict()
             }
         }), 200
 
@@ -45,19 +80,188 @@ def compare_xml_files():
         return jsonify({"success": False, "message": f"Bir hata oluştu: {str(e)}"}), 500
 
 
+# -------------------- BATCH COMPARE --------------------
+@apiDiff.route('/batch', methods=['POST'])
+@jwt_required()
+def compare_batch():
+    """
+    Body: {"series": [id1, id2, id3, ...]} (ardışık çiftler) veya {"pairs": [[eski, yeni], ...]},
+    isteğe bağlı "mode", "project" ve "async".
+    """
+    data = request.get_json() or {}
+    mode = data.get('mode') or DEFAULT_DIFF_MODE
+    project = data.get('project')
+    run_async = bool(data.get('async'))
+
+    try:
+        if data.get('series') is not None:
+            pairs = series_to_pairs([int(i) for i in data['series']])
+        else:
+            pairs = [(int(old_id), int(new_id)) for old_id, new_id in data.get('pairs') or []]
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "Geçersiz 'series' veya 'pairs' değeri."}), 400
+
+    if not pairs:
+        return jsonify({"success": False, "message": "En az bir dosya çifti ('pairs') veya iki elemanlı seri ('series') gerekli."}), 400
+    if mode not in DIFF_MODES:
+        return jsonify({"success": False, "message": f"Geçersiz diff modu. Desteklenen modlar: {', '.join(DIFF_MODES)}"}), 400
+
+    try:
+        if run_async:
+            jobs, _ = enqueue_diff_batch(pairs, mode=mode, project=project)
+            return jsonify({
+                "success": True,
+                "message": f"{len(jobs)} karşılaştırma kuyruğa alındı.",
+                "data": {"job_ids": [job.id for job in jobs]}
+            }), 202
+
+        jobs = run_diff_batch(pairs, mode=mode, project=project)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Bir hata oluştu: {str(e)}"}), 500
+
+    failed = [job for job in jobs if job.status != job.STATUS_DONE]
+    return jsonify({
+        "success": not failed,
+        "message": "Toplu karşılaştırma tamamlandı." if not failed else f"{len(failed)} karşılaştırma başarısız oldu.",
+        "data": {
+            "diff_ids": [job.diff_id for job in jobs],
+            "results": [job.to_dict() for job in jobs]
+        }
+    }), 200
+
+
+# -------------------- DIFF JOBS --------------------
+@apiDiff.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_diff_job_status(job_id):
+    job = get_diff_job(job_id)
+    if not job:
+        return jsonify({"success": False, "message": "İş bulunamadı."}), 404
+    return jsonify({"success": True, "data": job.to_dict()}), 200
+
+
 # -------------------- REPORT CONTENT --------------------
 @apiDiff.route('/report/<path:filename>', methods=['GET'])
 @jwt_required()
 def get_diff_report(filename):
+    """
+    ?offset=&limit= verilirse yalnızca o satır aralığı JSON olarak döner.
+    Aksi halde rapor diskten akış halinde gönderilir; HTTP Range (206) istekleri desteklenir.
+    Önbellek temizliğinde silinmiş rapor yeniden üretilir (sayfa yanıtındaki file_name yeni addır);
+    üretilemiyorsa 410 döner.
+    Sıkıştırılmış raporlar, istemci gzip kabul ediyorsa Content-Encoding: gzip ile olduğu gibi,
+    etmiyorsa akış halinde açılarak gönderilir; bunlarda Range yok sayılır (200, tam içerik).
+    """
     try:
-        html_content = get_diff_report_html_content(filename)
-        return html_content, 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        filename = _available_report_name(filename)
+        if filename is None:
+            return jsonify({
+                "success": False,
+                "evicted": True,
+                "message": "Fark raporu önbellek temizliğinde silinmiş; dosyalar veya filtre kuralları değiştiği "
+                           "için yeniden üretilemiyor. Dosyaları yeniden karşılaştırın."
+            }), 410
+
+        if 'offset' in request.args or 'limit' in request.args:
+            page = get_diff_report_page(
+                filename,
+                offset=request.args.get('offset', 0, type=int),
+                limit=request.args.get('limit', REPORT_PAGE_SIZE, type=int)
+            )
+            return jsonify({"success": True, "data": page}), 200
+
+        report_path = get_diff_report_path(filename)
+        if not is_compressed(report_path):
+            return send_file(report_path, mimetype='text/plain', conditional=True)
+
+        # Sıkıştırılmış raporda Range desteklenmez: bayt aralıkları gzip akışına değil açılmış metne ait
+        # olmalıydı. Her gösterim (gzip / açılmış) kendi ETag'ini taşır; koşullu istekler (304) desteklenir.
+        stat = os.stat(report_path)
+        if request.accept_encodings['gzip']:
+            # Diskteki gzip akışı olduğu gibi gönderilir; yeniden sıkıştırma yapılmaz
+            response = send_file(report_path, mimetype='text/plain', conditional=False, etag=False)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(_report_etag(stat, 'gzip'))
+        else:
+            response = Response(iter_report_bytes(report_path), mimetype='text/plain')
+            response.set_etag(_report_etag(stat, 'identity'))
+            response.last_modified = stat.st_mtime
+        response.vary.add('Accept-Encoding')
+        response.headers['Accept-Ranges'] = 'none'
+        return response.make_conditional(request, accept_ranges=False)
     except FileNotFoundError:
         return jsonify({"success": False, "message": "Fark raporu bulunamadı."}), 404
     except Exception as e:
         return jsonify({"success": False, "message": f"Rapor çekilirken bir hata oluştu: {str(e)}"}), 500
 
 
+def _report_etag(stat, encoding):
+    """
+    Rapor dosyasının değişimine ve gönderim biçimine (gzip / identity) bağlı ETag.
+    """
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding}"
+
+
+def _available_report_name(filename):
+    """
+    Rapor diskteyse adını, silinmişse yeniden üretilen raporun adını döndürür; üretilemiyorsa None.
+    """
+    try:
+        get_diff_report_path(filename)
+        return filename
+    except FileNotFoundError:
+        return restore_evicted_report(filename)
+
+
+# -------------------- FILTER RULES --------------------
+@apiDiff.route('/filter-rules', methods=['GET'])
+@jwt_required()
+def list_filter_rules():
+    project = request.args.get('project')
+    try:
+        return jsonify({"success": True, "data": get_filter_rules(project)}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Kurallar okunurken hata oluştu: {str(e)}"}), 500
+
+
+@apiDiff.route('/filter-rules', methods=['POST'])
+@jwt_required()
+def create_filter_rule():
+    data = request.get_json() or {}
+    try:
+        rule = add_filter_rule(
+            kind=(data.get('kind') or '').strip(),
+            pattern=data.get('pattern') or '',
+            project=data.get('project'),
+            description=data.get('description')
+        )
+        return jsonify({"success": True, "data": rule.to_dict()}), 201
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Kural eklenirken hata oluştu: {str(e)}"}), 500
+
+
+@apiDiff.route('/filter-rules/<int:rule_id>', methods=['DELETE'])
+@jwt_required()
+def delete_filter_rule(rule_id):
+    if DiffFilterRule.delete_by_id(rule_id):
+        return jsonify({"success": True}), 200
+    return jsonify({"success": False, "message": "Kural bulunamadı."}), 404
+
+
+# -------------------- CACHE STATS --------------------
+@apiDiff.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def diff_cache_stats():
+    try:
+        return jsonify({"success": True, "data": get_diff_cache_stats()}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 # -------------------- LIST --------------------
 @apiDiff.route('/', methods=['GET'])
 @jwt_required()
@@ -68,7 +272,10 @@ def list_diff_reports():
             "id": r.id,
             "file_name": r.diffReport_name,
             "file_path": r.diffReport_path,
-            "created_at": r.created_at.isoformat() if r.created_at else None
+            "created_at": r.created_at.isoformat() if r.created_at else None,
+            "stats": r.stats_dict(),
+            # Önbellek temizliğinde silinmiş rapor görüntülenince yeniden üretilir
+            "report_available": os.path.exists(r.diffReport_path)
         }
         for r in rows
     ]
@@ -80,7 +287,7 @@ def list_diff_reports():
 @jwt_required()
 def resync_diff_reports():
     try:
-        result = Diff.resync_reports()  # {"removed": X, "skipped": Y}
+        result = Diff.resync_reports()  # {"removed": X, "skipped": Y, "evicted": Z}
         return jsonify({"success": True, "data": result}), 200
     except IntegrityError:
         # Her ihtimale karşı FK ihlalinde 409 dön
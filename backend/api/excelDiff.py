@@ -1,18 +1,26 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import jwt_required
 from flask_cors import CORS
+import json
 import os
 
+from services.excel_compare import has_changes
 from services.excel_service import (
+    STREAM_CHUNK_ROWS,
     compare_excel_files_by_id,
     save_uploaded_excels,
-    scan_and_sync_excel_files
+    scan_and_sync_excel_files,
+    stream_excel_comparison
 )
 from codesys_doc_tracker.models.excel_model import ExcelFile
 
 apiExcelDiff = Blueprint('apiExcelDiff', __name__, url_prefix='/api/excel')
 CORS(apiExcelDiff)
 
+# Anahtarlı karşılaştırmada her fark listesi için varsayılan ve azami sayfa boyutu
+COMPARE_PAGE_SIZE = 500
+COMPARE_MAX_PAGE_SIZE = 5000
+
 
 # ---------- LİSTELEME ----------
 
@@ -55,14 +63,32 @@ def upload_excel_files():
 @apiExcelDiff.route('/compare', methods=['POST'])
 @jwt_required()
 def compare_excel_files():
+    """
+    İsteğe bağlı "key_column": satırlar bu sütuna göre hizalanır ve eklenen/silinen/değişen satırlar hücre
+    düzeyinde döner. "offset"/"limit" her fark listesinin sayfasını seçer (varsayılan limit COMPARE_PAGE_SIZE).
+    """
     data = request.get_json()
     file1_id = data.get('file1_id')
     file2_id = data.get('file2_id')
+    key_column = data.get('key_column')
 
     if not file1_id or not file2_id:
         return jsonify({"success": False, "message": "Her iki dosya ID'si de gerekli."}), 400
 
     try:
+        if key_column:
+            try:
+                offset = int(data.get('offset', 0))
+                limit = min(int(data.get('limit', COMPARE_PAGE_SIZE)), COMPARE_MAX_PAGE_SIZE)
+            except (TypeError, ValueError):
+                return jsonify({"success": False, "message": "offset ve limit tam sayı olmalı."}), 400
+
+            result = compare_excel_files_by_id(file1_id, file2_id, key_column=str(key_column),
+                                               offset=offset, limit=limit)
+            message = ("Farklılıklar başarıyla listelendi." if has_changes(result)
+                       else "Dosyalar arasında bir fark bulunamadı.")
+            return jsonify({"success": True, "message": message, "data": result}), 200
+
         diff_report = compare_excel_files_by_id(file1_id, file2_id)
 
         if not diff_report:
@@ -88,6 +114,53 @@ def compare_excel_files():
         return jsonify({"success": False, "message": f"Bir hata oluştu: {str(e)}"}), 500
 
 
+@apiExcelDiff.route('/compare/stream', methods=['POST'])
+@jwt_required()
+def compare_excel_files_stream():
+    """
+    Tüm sayfaları karşılaştırır ve sonucu NDJSON olarak akıtır: önce özet satırı (sayfa başına sayılar),
+    sonra sayfa sayfa fark satırı parçaları, en son {"type": "end"}.
+    İsteğe bağlı: "key_column" (tüm sayfalar için ad veya {sayfa: sütun}; yoksa satırlar sırayla eşlenir),
+    "sheets" (yalnızca bu sayfalar), "offset"/"limit" (her sayfanın her listesi için), "chunk_size".
+    """
+    data = request.get_json()
+    file1_id = data.get('file1_id')
+    file2_id = data.get('file2_id')
+    key_column = data.get('key_column') or None
+    sheets = data.get('sheets')
+
+    if not file1_id or not file2_id:
+        return jsonify({"success": False, "message": "Her iki dosya ID'si de gerekli."}), 400
+    if key_column is not None and not isinstance(key_column, (str, dict)):
+        return jsonify({"success": False, "message": "key_column metin veya {sayfa: sütun} olmalı."}), 400
+    if sheets is not None and not isinstance(sheets, list):
+        return jsonify({"success": False, "message": "sheets bir liste olmalı."}), 400
+    try:
+        offset = int(data.get('offset', 0))
+        limit = int(data['limit']) if data.get('limit') is not None else None
+        chunk_size = min(int(data.get('chunk_size', STREAM_CHUNK_ROWS)), COMPARE_MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "offset, limit ve chunk_size tam sayı olmalı."}), 400
+
+    try:
+        parts = stream_excel_comparison(file1_id, file2_id, key_column=key_column, sheets=sheets,
+                                        offset=offset, limit=limit, chunk_size=chunk_size)
+    except FileNotFoundError as e:
+        return jsonify({"success": False, "message": f"Dosya bulunamadı hatası: {str(e)}"}), 404
+    except ValueError as e:
+        return jsonify({"success": False, "message": f"Dosya işleme hatası: {str(e)}"}), 400
+
+    def generate():
+        try:
+            for part in parts:
+                yield json.dumps(part, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            # Başlıklar gönderildikten sonra durum kodu değiştirilemez; hata akışın son satırı olarak bildirilir
+            yield json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+
 # ---------- DİSKTEN SİLMEYLE SENKRONİZE ETME ----------
 @apiExcelDiff.route('/resync', methods=['POST'])
 @jwt_required()
@@ -1,14 +1,21 @@
 from flask import Blueprint, jsonify, request, send_file
 from flask_jwt_extended import jwt_required
 from flask_cors import CORS
-import os
 import re
+from datetime import datetime
 
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
 from services.filter_service import (
+    EXPORT_FORMAT_XLSX,
+    EXPORT_FORMATS,
+    crosscheck_signals_with_excel,
     extract_filtered_signals,
-    export_signals_to_excel
+    export_signals_to_excel,
+    search_signals,
+    get_signal_history
 )
+from services.signal_crosscheck import JOIN_MODES, JOIN_NAME
+from services.signal_parser import MATCH_EXACT, MATCH_MODES
 
 # Blueprint'i tanımla
 apiFilters = Blueprint("apiFilters", __name__, url_prefix="/api/filters")
@@ -19,15 +26,19 @@ CORS(apiFilters)
 def filter_xml_file():
     """
     Kullanıcıdan gelen dosya ID'si ve anahtar kelimelere göre filtreleme yapar.
+    İsteğe bağlı "match": exact (varsayılan) | prefix | glob ('S_ER_*' gibi desenler)
     """
     data = request.get_json()
     file_id = data.get("file_id")
     keywords = data.get("keywords", [])
+    match = (data.get("match") or MATCH_EXACT).strip().lower()
 
     if not file_id or not keywords:
         return jsonify({"success": False, "message": "Dosya ID'si ve anahtar kelimeler gerekli."}), 400
+    if match not in MATCH_MODES:
+        return jsonify({"success": False, "message": f"Geçersiz eşleştirme modu: {match}"}), 400
 
-    results, message = extract_filtered_signals(file_id, keywords)
+    results, message = extract_filtered_signals(file_id, keywords, match)
 
     if results is False:
         return jsonify({"success": False, "message": message}), 500
@@ -37,21 +48,100 @@ def filter_xml_file():
 
     return jsonify({"success": True, "results": results}), 200
 
+@apiFilters.route("/signals/search", methods=["GET"])
+@jwt_required()
+def search_signals_route():
+    """
+    Sinyal adını tüm kayıtlı XML dosyalarında arar.
+    Parametreler: q, mode (exact | prefix | substring), limit, offset (dosya bazında sayfalama)
+    """
+    try:
+        data = search_signals(
+            request.args.get("q", ""),
+            mode=(request.args.get("mode") or "exact").strip().lower(),
+            limit=max(1, min(request.args.get("limit", 50, type=int), 500)),
+            offset=max(0, request.args.get("offset", 0, type=int)),
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "data": data}), 200
+
+@apiFilters.route("/signals/history", methods=["GET"])
+@jwt_required()
+def signal_history_route():
+    """
+    Bir sinyalin değerlerinin export sürümleri boyunca değişimini döndürür. Parametre: name (tam ad)
+    """
+    try:
+        data = get_signal_history(request.args.get("name", ""))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "data": data}), 200
+
 @apiFilters.route("/export-signal-table", methods=["POST"])
 @jwt_required()
 def export_signal_table():
     """
-    Tüm sinyal tablolarını Excel'e aktarır ve indirilmek üzere sunar.
+    Tüm sinyal tablolarını dışa aktarır ve indirilmek üzere sunar.
+    İsteğe bağlı "format": xlsx (varsayılan) | csv | parquet
+    Aynı içerikli dosyanın önceki dışa aktarımı varsa diskten sunulur.
     """
     data = request.get_json()
     file_id = data.get("file_id")
-    
+    fmt = (data.get("format") or EXPORT_FORMAT_XLSX).strip().lower()
+
     if not file_id:
         return jsonify({"success": False, "message": "Dosya ID'si gerekli."}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"success": False,
+                        "message": f"Geçersiz biçim. Geçerli değerler: {', '.join(EXPORT_FORMATS)}"}), 400
 
-    success, message_or_path = export_signals_to_excel(file_id)
+    success, message_or_path = export_signals_to_excel(file_id, fmt)
 
     if not success:
         return jsonify({"success": False, "message": message_or_path}), 500
 
-    return send_file(message_or_path, as_attachment=True, download_name=os.path.basename(message_or_path))
\ No newline at end of file
+    # Önbellek dosyası içerik özetiyle adlandırılır; indirme adı eskisi gibi dosya id'si ve zaman damgasıyla
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return send_file(message_or_path, as_attachment=True, download_name=f"signal_table_{file_id}_{timestamp}.{fmt}")
+
+@apiFilters.route("/crosscheck", methods=["POST"])
+@jwt_required()
+def crosscheck_excel():
+    """
+    Bir Excel sinyal tablosunu XML dosyasındaki SIGNAL tablosuyla karşılaştırır ve değeri farklı olan sinyalleri
+    döndürür. Gövde: xml_file_id, excel_file_id; isteğe bağlı "sheet" (ad veya sıra, varsayılan ilk sayfa),
+    "join" (name | id_name), "columns" (Excel sütun adları: {"name": "Signal Name", "Def": "Default", ...}),
+    "offset"/"limit" (her liste için).
+    """
+    data = request.get_json()
+    xml_file_id = data.get("xml_file_id")
+    excel_file_id = data.get("excel_file_id")
+    join = data.get("join") or JOIN_NAME
+    columns = data.get("columns")
+
+    if not xml_file_id or not excel_file_id:
+        return jsonify({"success": False, "message": "XML ve Excel dosya ID'leri gerekli."}), 400
+    if not isinstance(join, str):
+        return jsonify({"success": False, "message": "join bir metin olmalı."}), 400
+    join = join.strip().lower()
+    if join not in JOIN_MODES:
+        return jsonify({"success": False, "message": f"Geçersiz birleştirme: {join}"}), 400
+    if columns is not None and not isinstance(columns, dict):
+        return jsonify({"success": False, "message": "columns bir sözlük olmalı."}), 400
+    try:
+        offset = int(data.get("offset", 0))
+        limit = int(data.get("limit", 500))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "offset ve limit tam sayı olmalı."}), 400
+
+    try:
+        result, message = crosscheck_signals_with_excel(xml_file_id, excel_file_id, sheet=data.get("sheet", 0),
+                                                        join=join, columns=columns, offset=offset,
+                                                        limit=max(1, min(limit, 5000)))
+    except FileNotFoundError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+    if result is None:
+        return jsonify({"success": False, "message": message}), 400
+    return jsonify({"success": True, "data": result}), 200
+
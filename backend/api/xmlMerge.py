@@ -4,7 +4,7 @@ from flask_cors import CORS
 import io
 import os
 
-from services.xml_merge_service import merge_xml_and_get_content
+from services.xml_merge_service import get_merge_output, merge_xml_and_get_content, merge_xml_batch
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
 
 apiXMLMerge = Blueprint('apiXMLMerge', __name__, url_prefix='/api/xml/merge')
@@ -61,4 +61,87 @@ def download_merged_xml():
         mimetype='application/xml',
         as_attachment=True,
         download_name=file_name
-    )
\ No newline at end of file
+    )
+
+
+def _batch_items(data: dict):
+    """
+    İstek gövdesinden (file_id, [kod blokları]) listesi. İki biçim kabul edilir:
+      - "items": [{"file_id": 1, "code_blocks": ["...", "..."]}, {"file_id": 2, "code_block": "..."}]
+      - "file_ids": [1, 2] ve "code_blocks": ["...", "..."]  (her blok her dosyaya eklenir)
+    Geçersiz gövdede ValueError yükselir.
+    """
+    items = []
+    for item in data.get('items') or []:
+        if not isinstance(item, dict):
+            raise ValueError("items öğeleri nesne olmalıdır.")
+        blocks = item.get('code_blocks')
+        if blocks is None:
+            blocks = [item.get('code_block')]
+        items.append((item.get('file_id'), blocks))
+
+    file_ids = data.get('file_ids') or []
+    code_blocks = data.get('code_blocks') or []
+    if file_ids or code_blocks:
+        if not isinstance(file_ids, list) or not isinstance(code_blocks, list):
+            raise ValueError("file_ids ve code_blocks liste olmalıdır.")
+        items.extend((file_id, code_blocks) for file_id in file_ids)
+
+    result = []
+    for file_id, blocks in items:
+        if not isinstance(blocks, list) or not all(block is None or isinstance(block, str) for block in blocks):
+            raise ValueError("Kod blokları metin listesi olmalıdır.")
+        try:
+            file_id = int(file_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Geçersiz dosya ID'si: {file_id}")
+        result.append((file_id, blocks))
+    return result
+
+
+@apiXMLMerge.route('/batch', methods=['POST'])
+@jwt_required()
+def merge_xml_batch_files():
+    """
+    Birden fazla kod bloğunu birden fazla XML dosyasına tek işte ekler. Birleştirilmiş içerik yanıtta
+    dönmez; çıktı sunucuda akış halinde yazılır ve "token" ile GET /download/<token> üzerinden indirilir
+    (tek dosya için XML, birden fazla dosya için zip).
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        items = _batch_items(data)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    if not items:
+        return jsonify({"success": False, "message": "Dosya ID ve kod bloğu gereklidir."}), 400
+
+    result, error = merge_xml_batch(items)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    return jsonify({
+        "success": True,
+        "message": f"{len(result['files'])} XML dosyası başarıyla birleştirildi.",
+        "token": result["token"],
+        "file_name": result["file_name"],
+        "download_url": f"{apiXMLMerge.url_prefix}/download/{result['token']}",
+        "files": result["files"],
+        "failed": result["failed"]
+    }), 200
+
+
+@apiXMLMerge.route('/download/<token>', methods=['GET'])
+@jwt_required()
+def download_merged_output(token):
+    output_path = get_merge_output(token)
+    if not output_path:
+        return jsonify({"success": False, "message": "Birleştirilmiş dosya bulunamadı veya süresi doldu."}), 404
+
+    is_zip = output_path.endswith('.zip')
+    return send_file(
+        output_path,
+        mimetype='application/zip' if is_zip else 'application/xml',
+        as_attachment=True,
+        download_name=os.path.basename(output_path),
+        conditional=True
+    )
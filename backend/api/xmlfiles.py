@@ -4,9 +4,13 @@ from flask_jwt_extended import jwt_required
 from flask_cors import CORS
 
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
+from werkzeug.http import parse_options_header
+
 from services.xmlfile_service import (
     save_uploaded_xmls,
+    save_uploaded_xml_stream,
     delete_xml_file,
+    get_document_cache_stats,
 )
 
 apiXMLFiles = Blueprint("apiXMLFiles", __name__, url_prefix="/api/xmlfiles")
@@ -28,6 +32,7 @@ def list_xml_files():
                 "file_name": os.path.basename(r.file_path),
                 "upload_date": r.upload_date.isoformat() if r.upload_date else None,
                 "timestamp": r.timestamp.isoformat() if r.timestamp else None,
+                "content_hash": r.content_hash,
             })
         return jsonify({"success": True, "files": data}), 200
     except Exception as e:
@@ -54,6 +59,37 @@ def upload_xml_files():
         return jsonify({"success": False, "message": f"Yükleme hatası: {e}"}), 500
 
 
+# ---------- AKIŞLI YÜKLEME ----------
+@apiXMLFiles.route("/upload/stream", methods=["POST"])
+@jwt_required()
+def upload_xml_files_stream():
+    """
+    multipart/form-data, field adı 'files' (çoklu destekli).
+    Gövde belleğe/geçici dosyaya alınmadan işlenir; yanıtta yalnızca bu istekteki dosyalar döner.
+    İstemci büyük yüklemeleri birkaç isteğe bölüp paralel gönderebilir.
+    """
+    mimetype, options = parse_options_header(request.content_type or "")
+    boundary = options.get("boundary")
+    if mimetype != "multipart/form-data" or not boundary:
+        return jsonify({"success": False, "message": "multipart/form-data bekleniyor."}), 400
+
+    try:
+        result = save_uploaded_xml_stream(request.stream, boundary.encode("latin-1"))
+        return jsonify({"success": True, "data": result}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Yükleme hatası: {e}"}), 500
+
+
+# ---------- BELGE ÖNBELLEĞİ ----------
+@apiXMLFiles.route("/cache/stats", methods=["GET"])
+@jwt_required()
+def document_cache_stats():
+    try:
+        return jsonify({"success": True, "data": get_document_cache_stats()}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 # ---------- SİLME ----------
 @apiXMLFiles.route("/<int:file_id>", methods=["DELETE"])
 @jwt_required()
@@ -96,6 +132,7 @@ def get_xml_file_details(file_id: int):
                 "file_new_name": os.path.basename(diff.new_file.file_path) if diff.new_file else None,
                 "diff_content": diff.diffReport_name, # diff_content alanını diffReport_name olarak güncelledik
                 "timestamp": diff.created_at.isoformat() if diff.created_at else None, # created_at kullanıyoruz
+                "stats": diff.stats_dict(),
                 "notes": notes_data
             }
             diffs_data.append(diff_dict)
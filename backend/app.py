@@ -23,7 +23,11 @@ from api.notifications import apiNotifications
 # APP AND DB CREATION ---------------------------------------------------------
 app = createApp()
 CORS(app)
-createDB()
+# Diff ve Excel işlem havuzları 'spawn' ile başlar ve işçiler bu modülü '__mp_main__' adıyla yeniden
+# içe aktarır. Veritabanı kurulumu, XML taraması ve dosya izleyici yalnızca sunucu işleminde çalışmalı;
+# aksi halde her işçi kendi taramasını/izleyicisini başlatır ve aynı tablolar üzerinde yarışır.
+if __name__ != "__mp_main__":
+    createDB()
 # -----------------------------------------------------------------------------
 
 
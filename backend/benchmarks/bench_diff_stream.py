@@ -0,0 +1,96 @@
+"""
+Akış tabanlı diff motorunun bellek sınırını ölçen benchmark.
+
+Sentetik PLCopen benzeri iki XML dosyası üretir (yalnızca birkaç ST satırı farklı),
+ardından klasik (tam okuma + difflib.unified_diff) ve streaming yolunu farklı dosya boyutlarında çalıştırır.
+Streaming modunun tepe belleği dosya boyutu büyüdükçe sabit kalmalı; klasik modunki doğrusal artmalıdır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_diff_stream.py --lines 100000 400000
+"""
+import argparse
+import difflib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.diff_stream import iter_streaming_diff  # noqa: E402
+
+
+def _write_synthetic_pair(dir_path: str, n_lines: int, n_changes: int = 20):
+    old_path = os.path.join(dir_path, f"old_{n_lines}.xml")
+    new_path = os.path.join(dir_path, f"new_{n_lines}.xml")
+    change_every = max(n_lines // (n_changes + 1), 1)
+    with open(old_path, "w", encoding="utf-8") as old_f, open(new_path, "w", encoding="utf-8") as new_f:
+        header = '<?xml version="1.0" encoding="utf-8"?>\n<project xmlns="http://www.plcopen.org/xml/tc6_0200">\n'
+        old_f.write(header)
+        new_f.write(header)
+        for i in range(n_lines):
+            line = f"GVL.IOVD.S_Signal_{i}.v\t\t:= GVL.SY.S_ECU_Rdy AND NOT GVL.IOVD.S_Signal_{i}.e;\n"
+            old_f.write(line)
+            if i and i % change_every == 0:
+                new_f.write(f"GVL.IOVD.S_Signal_{i}.v\t\t:= FALSE; // değişti\n")
+            else:
+                new_f.write(line)
+        old_f.write("</project>\n")
+        new_f.write("</project>\n")
+    return old_path, new_path
+
+
+def _run_classic(old_path: str, new_path: str, out_path: str) -> int:
+    with open(old_path, encoding="utf-8") as f:
+        text1 = f.read()
+    with open(new_path, encoding="utf-8") as f:
+        text2 = f.read()
+    lines = list(difflib.unified_diff(text1.splitlines(keepends=True), text2.splitlines(keepends=True), lineterm=""))
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write("".join(lines))
+    return len(lines)
+
+
+def _run_streaming(old_path: str, new_path: str, out_path: str) -> int:
+    written = 0
+    with open(old_path, encoding="utf-8") as old_f, open(new_path, encoding="utf-8") as new_f, \
+            open(out_path, "w", encoding="utf-8") as out:
+        for line in iter_streaming_diff(old_f, new_f):
+            out.write(line)
+            written += 1
+    return written
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[100_000, 400_000])
+    parser.add_argument("--skip-classic", action="store_true", help="Klasik modu çalıştırma (çok büyük dosyalar için)")
+    args = parser.parse_args()
+
+    print(f"{'satır':>10} {'dosya MB':>9} {'mod':>10} {'süre s':>8} {'tepe MB':>9} {'diff satırı':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_lines in args.lines:
+            old_path, new_path = _write_synthetic_pair(tmp, n_lines)
+            size_mb = os.path.getsize(old_path) / 1e6
+            out_path = os.path.join(tmp, "report.txt")
+            modes = [("streaming", _run_streaming)]
+            if not args.skip_classic:
+                modes.insert(0, ("classic", _run_classic))
+            for name, func in modes:
+                count, elapsed, peak = _measure(func, old_path, new_path, out_path)
+                print(f"{n_lines:>10} {size_mb:>9.1f} {name:>10} {elapsed:>8.2f} {peak / 1e6:>9.2f} {count:>12}")
+
+
+if __name__ == "__main__":
+    main()
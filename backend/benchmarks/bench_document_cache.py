@@ -0,0 +1,92 @@
+"""
+Belge önbelleği benchmark'ı: aynı dosya üzerinde art arda filtreleme ve birleştirme istekleri.
+
+Geçici bir dizinde N sinyal satırlı bir ST bloğu içeren PLCopen benzeri bir XML dosyası ve geçici bir SQLite
+veritabanı oluşturur. extract_filtered_signals ve merge_xml_and_get_content önce önbellek kapalıyken
+(her istekte dosya okunur ve ayrıştırılır), sonra açıkken çalıştırılır; istek başına süre ve önbellek
+sayaçları yazdırılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_document_cache.py --signals 50000 --requests 20
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+from services import document_cache  # noqa: E402
+from services.filter_service import extract_filtered_signals  # noqa: E402
+from services.xml_merge_service import INSERTION_END_MARKER, merge_xml_and_get_content  # noqa: E402
+
+
+def _write_document(path: str, n_signals: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<project><ST><xhtml xmlns="http://www.w3.org/1999/xhtml">')
+        f.write(INSERTION_END_MARKER + "\n")
+        for i in range(n_signals):
+            if i % 16 == 0:
+                f.write(f"// ID:{i:X}\n")
+            f.write(f"//--- SIGNAL -> SIG_{i} Max : 100 Min : 0 Def : 0 Resolution : 0.1 Offset : 0\n")
+        f.write("</xhtml></ST></project>\n")
+
+
+def _run(label: str, file_id: int, requests: int) -> None:
+    document_cache.clear()
+    document_cache.reset_stats()
+    keywords = ["SIG_1", "SIG_500", "SIG_9999"]
+    started = time.perf_counter()
+    for _ in range(requests):
+        results, error = extract_filtered_signals(file_id, keywords)
+        assert error is None, error
+        assert merge_xml_and_get_content(file_id, "// yeni blok") is not None
+    elapsed = time.perf_counter() - started
+    stats = document_cache.get_stats()
+    print(f"{label:>14}: {elapsed / requests * 1000:8.2f} ms/istek  isabet {stats['hits']}, ıska {stats['misses']}, "
+          f"bellekte {stats['resident_bytes'] / 1024 / 1024:.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_doc_cache_")
+    export_dir = os.path.join(work_dir, "CodesysXML_Export")
+    os.makedirs(export_dir)
+    app = Flask("bench_document_cache")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    cwd = os.getcwd()
+    os.environ["CODESYS_XML_EXPORT_DIR"] = export_dir
+    try:
+        os.chdir(work_dir)  # DB'deki yollar çalışma dizinine göredir
+        _write_document(os.path.join(export_dir, "doc.xml"), args.signals)
+        with app.app_context():
+            db.create_all()
+            file_id = XMLFile.create("CodesysXML_Export/doc.xml").id
+            print(f"{args.signals} sinyal, {os.path.getsize('CodesysXML_Export/doc.xml') / 1024 / 1024:.1f} MB")
+
+            budget = document_cache.DOC_CACHE_MAX_BYTES
+            document_cache.DOC_CACHE_MAX_BYTES = 0
+            try:
+                _run("önbellek kapalı", file_id, args.requests)
+            finally:
+                document_cache.DOC_CACHE_MAX_BYTES = budget
+            _run("önbellek açık", file_id, args.requests)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Excel karşılaştırma benchmark'ı: tüm sütunlar üzerinde dış birleştirme (pd.merge) ile anahtar sütununa göre
+hizalanmış vektörel karşılaştırma (excel_compare.compare_frames).
+
+Bellekte N satırlı, sinyal tablosuna benzer iki DataFrame üretir: yeni tabloda satırların bir kısmının bir
+hücresi değiştirilir, bir kısmı silinir ve yeni satırlar eklenir, satır sırası karıştırılır. Excel okuma süresi
+ölçüme dahil değildir; yalnızca karşılaştırma süresi ve bulunan fark sayıları yazdırılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_excel_compare.py --rows 500000 --columns 10
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from services.excel_compare import compare_frames  # noqa: E402
+
+
+def _frames(rows: int, columns: int, change_ratio: float, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    data = {"ID": np.arange(rows), "Signal Name": [f"SIG_{i}" for i in range(rows)]}
+    for c in range(columns - 2):
+        if c % 2:
+            data[f"V{c}"] = rng.integers(0, 1000, rows).astype("float64")
+        else:
+            data[f"V{c}"] = rng.choice(["0", "0.1", "1", "100", "255"], rows).astype(object)
+    old = pd.DataFrame(data)
+
+    new = old.copy()
+    changed = rng.choice(rows, int(rows * change_ratio), replace=False)
+    new.loc[changed, "V1" if columns > 3 else "Signal Name"] = -1.0 if columns > 3 else "CHANGED"
+    dropped = rng.choice(rows, int(rows * change_ratio / 2), replace=False)
+    new = new.drop(index=dropped)
+    extra = old.iloc[:int(rows * change_ratio / 2)].copy()
+    extra["ID"] = np.arange(rows, rows + len(extra))
+    new = pd.concat([new, extra], ignore_index=True)
+    new = new.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return old, new
+
+
+def _legacy(old: pd.DataFrame, new: pd.DataFrame):
+    merged = pd.merge(old, new, on=list(old.columns), how="outer", indicator=True)
+    diff = merged[merged["_merge"] != "both"]
+    return (diff["_merge"] == "left_only").sum(), (diff["_merge"] == "right_only").sum()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--change-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    old, new = _frames(args.rows, args.columns, args.change_ratio)
+    print(f"{len(old)} / {len(new)} satır, {args.columns} sütun")
+
+    started = time.perf_counter()
+    left_only, right_only = _legacy(old, new)
+    print(f"{'pd.merge (tüm sütunlar)':>28}: {(time.perf_counter() - started) * 1000:8.1f} ms  "
+          f"yalnız eskide {left_only}, yalnız yenide {right_only} satır")
+
+    started = time.perf_counter()
+    result = compare_frames(old, new, "ID", limit=500)
+    summary = result["summary"]
+    print(f"{'anahtarlı vektörel':>28}: {(time.perf_counter() - started) * 1000:8.1f} ms  "
+          f"eklenen {summary['added']}, silinen {summary['removed']}, değişen {summary['modified']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Excel sidecar benchmark'ı: pd.read_excel ile sütunsal sidecar'dan okuma karşılaştırması.
+
+Geçici bir dizinde N satırlı, sinyal tablosuna benzer bir .xlsx dosyası üretir (openpyxl write_only).
+Ölçülenler: pd.read_excel (her karşılaştırma isteğinin eski maliyeti), sidecar'ın bir kez oluşturulması
+(yükleme/tarama sırasında) ve sidecar'dan okuma (sonraki her istek). Okunan tabloların eşitliği doğrulanır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_excel_sidecar.py --rows 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+
+from services import excel_sidecar  # noqa: E402
+
+
+def _write_workbook(path: str, rows: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default", "Comment"])
+    for i in range(rows):
+        sheet.append([i, f"SIG_{i}", 0.1, 0, 0, 100 + i % 7, 0, "açıklama" if i % 3 else None])
+    workbook.save(path)
+
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:>24}: {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_excel_sidecar_")
+    sidecar_dir = excel_sidecar.EXCEL_SIDECAR_DIR
+    excel_sidecar.EXCEL_SIDECAR_DIR = os.path.join(work_dir, "ExcelSidecars")
+    try:
+        path = os.path.join(work_dir, "table.xlsx")
+        _write_workbook(path, args.rows)
+        print(f"{args.rows} satır, {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+        expected = _timed("pd.read_excel", lambda: pd.read_excel(path))
+        _timed("sidecar oluşturma", lambda: excel_sidecar.build(path))
+        frame = _timed("sidecar'dan okuma", lambda: excel_sidecar.read_frame(path))
+        pd.testing.assert_frame_equal(expected, frame)
+    finally:
+        excel_sidecar.EXCEL_SIDECAR_DIR = sidecar_dir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Çok sayfalı Excel karşılaştırma benchmark'ı: eski yol ile sidecar + işlem havuzu + NDJSON akışı.
+
+Geçici bir dizinde S sayfalı, sayfa başına N satırlı iki .xlsx dosyası üretir (ikincisinde her sayfada satırların
+bir kısmı değiştirilir, silinir ve eklenir) ve geçici bir SQLite veritabanına kaydeder. Ölçülenler:
+  - eski yol: her sayfa pd.read_excel ile okunur, tüm sütunlarda pd.merge, sonuç to_dict('records')
+  - akış: stream_excel_comparison; özet satırına kadar geçen süre ve tüm NDJSON'un üretilme süresi,
+    havuzsuz (EXCEL_COMPARE_WORKERS=1) ve havuzlu olarak. Sidecar'lar ölçümden önce bir kez oluşturulur
+    (yükleme sırasında olduğu gibi); havuzun ilk açılışı ısınma turunda yapılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_excel_stream.py --sheets 8 --rows 10000 --workers 4
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from flask import Flask  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.excel_model import ExcelFile  # noqa: E402
+from services import excel_service, excel_sidecar  # noqa: E402
+
+
+def _write_workbook(path: str, sheets: int, rows: int, changed: bool) -> None:
+    rng = np.random.default_rng(1)
+    workbook = Workbook(write_only=True)
+    for s in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet{s}")
+        sheet.append(["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default"])
+        modified = set(rng.choice(rows, rows // 50, replace=False).tolist()) if changed else set()
+        for i in range(rows + (rows // 100 if changed else 0)):
+            if changed and i % 97 == 0:
+                continue  # silinen satır
+            sheet.append([i, f"SIG_{s}_{i}", 0.1, 0, 0, 100 + (1 if i in modified else 0), 0])
+    workbook.save(path)
+
+
+def _legacy(path1: str, path2: str) -> int:
+    frames1 = pd.read_excel(path1, sheet_name=None)
+    frames2 = pd.read_excel(path2, sheet_name=None)
+    rows = 0
+    for name, df1 in frames1.items():
+        merged = pd.merge(df1, frames2[name], on=list(df1.columns), how="outer", indicator=True)
+        diff = merged[merged["_merge"] != "both"].drop(columns=["_merge"])
+        rows += len(diff.to_dict("records"))
+    return rows
+
+
+def _stream(file1_id: int, file2_id: int, workers: int):
+    excel_service.EXCEL_COMPARE_WORKERS = workers
+    started = time.perf_counter()
+    first = None
+    size = 0
+    for part in excel_service.stream_excel_comparison(file1_id, file2_id, key_column="ID"):
+        size += len(json.dumps(part, ensure_ascii=False, default=str)) + 1
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sheets", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_excel_stream_")
+    upload_dir = os.path.join(work_dir, "ExcelExports")
+    os.makedirs(upload_dir)
+    app = Flask("bench_excel_stream")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    cwd = os.getcwd()
+    sidecar_dir = excel_sidecar.EXCEL_SIDECAR_DIR
+    excel_sidecar.EXCEL_SIDECAR_DIR = os.path.join(work_dir, "ExcelSidecars")
+    os.environ["EXCEL_UPLOAD_DIR"] = upload_dir
+    try:
+        os.chdir(work_dir)
+        path1, path2 = os.path.join(upload_dir, "old.xlsx"), os.path.join(upload_dir, "new.xlsx")
+        _write_workbook(path1, args.sheets, args.rows, changed=False)
+        _write_workbook(path2, args.sheets, args.rows, changed=True)
+        print(f"{args.sheets} sayfa x {args.rows} satır, {os.path.getsize(path1) / 1024 / 1024:.1f} MB")
+
+        started = time.perf_counter()
+        rows = _legacy(path1, path2)
+        print(f"{'eski yol':>22}: {(time.perf_counter() - started) * 1000:9.1f} ms toplam ({rows} satır)")
+
+        with app.app_context():
+            db.create_all()
+            file1_id = ExcelFile.create("ExcelExports/old.xlsx").id
+            file2_id = ExcelFile.create("ExcelExports/new.xlsx").id
+            started = time.perf_counter()
+            excel_sidecar.ensure_sidecars([path1, path2])
+            print(f"{'sidecar oluşturma':>22}: {(time.perf_counter() - started) * 1000:9.1f} ms (bir kez)")
+
+            for label, workers in (("akış, havuzsuz", 1), (f"akış, {args.workers} işçi", args.workers)):
+                if workers > 1:
+                    _stream(file1_id, file2_id, workers)  # havuzun açılışı (ısınma)
+                first, total, size = _stream(file1_id, file2_id, workers)
+                print(f"{label:>22}: özet {first * 1000:7.1f} ms, toplam {total * 1000:7.1f} ms "
+                      f"({size / 1024:.0f} KB NDJSON)")
+    finally:
+        excel_sidecar.EXCEL_SIDECAR_DIR = sidecar_dir
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+XML dosya silme zincirinin (dosya -> diff -> not -> ilişki/görünürlük/bildirim) sorgu sayısı benchmark'ı.
+
+Geçici bir SQLite veritabanında N dosyalık bir sürüm serisi oluşturur: ardışık her çift için bir diff,
+her diff'e birkaç not, her nota ilişki, görünürlük ve bildirim kaydı. Ardından dosyaların yarısı
+"diskten kaybolmuş" sayılarak delete_missing_files ve tek dosya için delete_by_id_with_diffs çalıştırılır.
+Eski satır satır döngü ile set tabanlı silme aynı veri üzerinde karşılaştırılır; veritabanına giden
+ifade sayısı ve süre yazdırılır, iki yöntemin aynı kayıtları bıraktığı (ve yetim kayıt kalmadığı) doğrulanır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_file_delete.py --files 2000 --notes 2
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import event, func, insert, or_, select  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.diff_model import Diff  # noqa: E402
+from codesys_doc_tracker.models.note_model import Note  # noqa: E402
+from codesys_doc_tracker.models.note_visibility_model import NoteVisibility  # noqa: E402
+from codesys_doc_tracker.models.notification_model import Notification  # noqa: E402
+from codesys_doc_tracker.models.relation_model import Relation  # noqa: E402
+from codesys_doc_tracker.models.user_model import User  # noqa: E402
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+
+BASE_NAME = "CodesysXML_Export"
+_TABLES = (XMLFile, Diff, Note, Relation, NoteVisibility, Notification)
+
+
+def _legacy_delete_missing_files(valid_paths: set, base_name: str) -> int:
+    # Eski XMLFile.delete_missing_files döngüsünün birebir kopyası
+    removed = 0
+    for row in XMLFile.query.all():
+        row_path = os.path.normpath(row.file_path).replace("\\", "/")
+        if not row_path.startswith(base_name + "/"):
+            continue
+        if row_path not in valid_paths:
+            diffs_to_delete = Diff.query.filter(or_(
+                Diff.xmlfile_old_id == row.id,
+                Diff.xmlfile_new_id == row.id
+            )).all()
+            for diff_to_delete in diffs_to_delete:
+                Note.query.filter_by(diff_id=diff_to_delete.id).delete(synchronize_session=False)
+            for diff_to_delete in diffs_to_delete:
+                db.session.delete(diff_to_delete)
+            db.session.delete(row)
+            removed += 1
+    db.session.commit()
+    return removed
+
+
+def _legacy_delete_by_id_with_diffs(file_id: int) -> bool:
+    # Eski XMLFile.delete_by_id_with_diffs (disk işlemi hariç)
+    row = XMLFile.query.get(file_id)
+    diffs_to_delete = Diff.query.filter(or_(
+        Diff.xmlfile_old_id == row.id,
+        Diff.xmlfile_new_id == row.id
+    )).all()
+    for diff_to_delete in diffs_to_delete:
+        Note.query.filter_by(diff_id=diff_to_delete.id).delete(synchronize_session=False)
+    for diff_to_delete in diffs_to_delete:
+        db.session.delete(diff_to_delete)
+    db.session.delete(row)
+    db.session.commit()
+    return True
+
+
+def _seed(n_files: int, notes_per_diff: int) -> None:
+    db.session.execute(insert(User), [{"username": "bench", "password": "x"}])
+    user_id = db.session.execute(select(User.id)).scalar_one()
+    db.session.execute(insert(XMLFile), [{"file_path": f"{BASE_NAME}/v{i:05d}.xml"} for i in range(n_files)])
+    file_ids = [row_id for (row_id,) in db.session.execute(select(XMLFile.id).order_by(XMLFile.id))]
+    db.session.execute(insert(Diff), [
+        {"xmlfile_old_id": old, "xmlfile_new_id": new, "diffReport_name": f"d{old}.txt",
+         "diffReport_path": f"__bench_missing__/d{old}.txt"}
+        for old, new in zip(file_ids, file_ids[1:])
+    ])
+    diff_ids = [row_id for (row_id,) in db.session.execute(select(Diff.id))]
+    db.session.execute(insert(Note), [{"diff_id": d, "user_id": user_id, "content": "not"}
+                                      for d in diff_ids for _ in range(notes_per_diff)])
+    note_ids = [row_id for (row_id,) in db.session.execute(select(Note.id))]
+    db.session.execute(insert(Relation), [{"note_id": n, "relation_type": t, "relation_value": "x"}
+                                          for n in note_ids for t in ("signal", "pou")])
+    db.session.execute(insert(NoteVisibility), [{"note_id": n, "user_id": user_id} for n in note_ids])
+    db.session.execute(insert(Notification), [{"user_id": user_id, "actor_id": user_id, "note_id": n,
+                                               "message": "m"} for n in note_ids])
+    db.session.commit()
+
+
+def _counts() -> dict:
+    return {model.__tablename__: db.session.execute(select(func.count()).select_from(model)).scalar()
+            for model in _TABLES}
+
+
+def _orphans() -> int:
+    note_ids = select(Note.id)
+    return sum(db.session.execute(select(func.count()).select_from(model)
+                                  .where(model.note_id.not_in(note_ids))).scalar()
+               for model in (Relation, NoteVisibility, Notification))
+
+
+def _run(label: str, fn, n_files: int, notes_per_diff: int) -> dict:
+    work_dir = tempfile.mkdtemp(prefix="bench_delete_")
+    app = Flask("bench_file_delete")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    try:
+        with app.app_context():
+            db.create_all()
+            _seed(n_files, notes_per_diff)
+            valid = {f"{BASE_NAME}/v{i:05d}.xml" for i in range(0, n_files, 2)}  # tek sıradakiler kayıp
+
+            statements = [0]
+
+            def count(*_args):
+                statements[0] += 1
+
+            event.listen(db.engine, "before_cursor_execute", count)
+            try:
+                started = time.perf_counter()
+                removed = fn(valid)
+                elapsed = time.perf_counter() - started
+            finally:
+                event.remove(db.engine, "before_cursor_execute", count)
+
+            counts, orphans = _counts(), _orphans()
+            print(f"{label:>12}: {statements[0]:>8,} ifade  {elapsed:8.3f} sn  {int(removed)} dosya silindi, "
+                  f"yetim kayıt: {orphans}")
+            db.session.remove()
+            return counts
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _check(legacy: dict, current: dict) -> None:
+    # Eski döngü notların alt kayıtlarını yetim bırakır; dosya/diff/not sayıları yine aynı olmalı
+    for table in ("xmlfiles", "diffs", "notes"):
+        assert legacy[table] == current[table], f"{table}: {legacy[table]} != {current[table]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--notes", type=int, default=2, help="diff başına not sayısı")
+    args = parser.parse_args()
+
+    print(f"delete_missing_files ({args.files} dosya, yarısı kayıp):")
+    legacy = _run("eski", lambda valid: _legacy_delete_missing_files(valid, BASE_NAME), args.files, args.notes)
+    current = _run("set tabanlı", lambda valid: XMLFile.delete_missing_files(valid, BASE_NAME),
+                   args.files, args.notes)
+    _check(legacy, current)
+
+    print("delete_by_id_with_diffs (tek dosya):")
+    legacy = _run("eski", lambda valid: _legacy_delete_by_id_with_diffs(2), args.files, args.notes)
+    current = _run("set tabanlı", lambda valid: XMLFile.delete_by_id_with_diffs(2), args.files, args.notes)
+    _check(legacy, current)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+XML export dizini yeniden tarama benchmark'ı.
+
+Geçici bir dizinde N adet küçük XML dosyası ve geçici bir SQLite veritabanı oluşturur, ardından:
+  - ilk tarama (indeks boş, tüm dosyalar özetlenir ve eklenir),
+  - değişiklik olmadan yeniden tarama,
+  - birkaç dosya eklenip/değiştirilip/silindikten sonra yeniden tarama,
+  - karşılaştırma için eski yöntem (dosya başına get_by_path sorgusu + tüm satırları okuyan temizlik)
+sürelerini yazdırır. Hedef: 50 bin dosyada değişiklik yokken 1 saniyenin altında.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_rescan.py --files 50000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+from services.xmlfile_service import _path_for_db, scan_and_sync_xml_files  # noqa: E402
+
+
+def _write_files(export_dir: str, n_files: int, per_dir: int = 1000) -> None:
+    for i in range(n_files):
+        sub = os.path.join(export_dir, f"proj_{i // per_dir:03d}")
+        if i % per_dir == 0:
+            os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"export_{i:06d}.xml"), "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0" encoding="utf-8"?>\n<project><pou name="P_{i}"/></project>\n')
+
+
+def _legacy_scan(export_dir: str) -> dict:
+    # Eski scan_and_sync_xml_files döngüsünün (os.walk + dosya başına sorgu) birebir kopyası
+    base_name = os.path.basename(export_dir.rstrip("\\/"))
+    added = 0
+    fs_db_paths = set()
+    for root, _dirs, files in os.walk(export_dir):
+        for name in files:
+            if not name.lower().endswith(".xml"):
+                continue
+            db_path = _path_for_db(os.path.normpath(os.path.join(root, name)), export_dir)
+            fs_db_paths.add(db_path)
+            if not XMLFile.get_by_path(db_path):
+                XMLFile.create(file_path=db_path)
+                added += 1
+    removed = XMLFile.delete_missing_files(fs_db_paths, base_name)
+    return {"added": added, "removed": removed}
+
+
+def _timed(name: str, fn) -> None:
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>28}: {elapsed:8.3f} sn  {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--touch", type=int, default=20, help="ikinci taramadan önce eklenen/değiştirilen dosya sayısı")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_rescan_")
+    export_dir = os.path.join(work_dir, "CodesysXML_Export")
+    app = Flask("bench_rescan")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+
+    try:
+        _write_files(export_dir, args.files)
+        with app.app_context():
+            db.create_all()
+            _timed("ilk tarama", lambda: scan_and_sync_xml_files(export_dir))
+            _timed("değişiklik yok", lambda: scan_and_sync_xml_files(export_dir))
+
+            extra_dir = os.path.join(export_dir, "proj_new")
+            os.makedirs(extra_dir)
+            for i in range(args.touch):
+                with open(os.path.join(extra_dir, f"new_{i}.xml"), "w", encoding="utf-8") as f:
+                    f.write("<project/>\n")
+                with open(os.path.join(export_dir, "proj_000", f"export_{i:06d}.xml"), "a", encoding="utf-8") as f:
+                    f.write("<!-- changed -->\n")
+            os.remove(os.path.join(export_dir, "proj_000", f"export_{args.touch:06d}.xml"))
+            _timed(f"{args.touch} yeni/{args.touch} değişmiş/1 silinmiş",
+                   lambda: scan_and_sync_xml_files(export_dir))
+
+            if not args.skip_legacy:
+                _timed("eski yöntem, değişiklik yok", lambda: _legacy_scan(export_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
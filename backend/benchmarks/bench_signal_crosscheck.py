@@ -0,0 +1,101 @@
+"""
+Excel-XML sinyal çapraz kontrolü benchmark'ı: ilk çalıştırma ile önbellekli tekrar karşılaştırması.
+
+Geçici bir dizinde N sinyal satırlı bir ST bloğu içeren XML dosyası ve aynı sinyallerin bir kısmının
+değerleri değiştirilmiş bir .xlsx sinyal tablosu üretir. Ölçülenler: soğuk çalıştırma (XML'in ayrıştırılması,
+Excel'in pd.read_excel ile okunması ve sidecar'ının oluşturulması dahil) ve filter_service'in yaptığı gibi iki
+tarafın önbellekten (belge önbelleği + sidecar) okunduğu tekrar çalıştırmalar. Bulunan farkların sayısı doğrulanır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_signal_crosscheck.py --signals 10000 [--repeat 5]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from openpyxl import Workbook  # noqa: E402
+
+from services import document_cache, excel_sidecar  # noqa: E402
+from services.signal_crosscheck import crosscheck, xml_signal_frame  # noqa: E402
+from services.signal_parser import extract_st_text, parse_signal_rows  # noqa: E402
+
+_CHANGE_EVERY = 50  # her 50. sinyalin Max değeri Excel'de farklı yazılır
+
+
+def _write_document(path: str, n_signals: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<project><ST><xhtml xmlns="http://www.w3.org/1999/xhtml">')
+        for i in range(n_signals):
+            if i % 16 == 0:
+                f.write(f"// ID:{i:X}\n")
+            f.write(f"//--- SIGNAL -> SIG_{i} Max : 100 Min : 0 Def : 0 Resolution : 0.1 Offset : 0\n")
+        f.write("</xhtml></ST></project>\n")
+
+
+def _write_workbook(path: str, n_signals: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default"])
+    for i in range(n_signals):
+        max_value = 200 if i % _CHANGE_EVERY == 0 else 100
+        sheet.append([f"{i - i % 16:X}", f"SIG_{i}", 0.1, 0, 0, max_value, 0])
+    workbook.save(path)
+
+
+def _load_xml_frame(path: str):
+    def load():
+        with open(path, "r", encoding="utf-8") as f:
+            return xml_signal_frame(parse_signal_rows(extract_st_text(f.read())))
+    return document_cache.get(1, path, document_cache.KIND_SIGNAL_FRAME, load)
+
+
+def _run(xml_path: str, excel_path: str) -> dict:
+    return crosscheck(_load_xml_frame(xml_path), excel_sidecar.read_frame(excel_path), limit=500)
+
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:>26}: {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_signal_crosscheck_")
+    sidecar_dir = excel_sidecar.EXCEL_SIDECAR_DIR
+    excel_sidecar.EXCEL_SIDECAR_DIR = os.path.join(work_dir, "ExcelSidecars")
+    try:
+        xml_path = os.path.join(work_dir, "signals.xml")
+        excel_path = os.path.join(work_dir, "signals.xlsx")
+        _write_document(xml_path, args.signals)
+        _write_workbook(excel_path, args.signals)
+        print(f"{args.signals} sinyal")
+
+        document_cache.clear()
+        result = _timed("ilk çalıştırma", lambda: _run(xml_path, excel_path))
+        expected = (args.signals + _CHANGE_EVERY - 1) // _CHANGE_EVERY
+        assert result["summary"]["mismatched"] == expected, result["summary"]
+        assert result["summary"]["matched"] == args.signals, result["summary"]
+        for i in range(args.repeat):
+            _timed(f"önbellekli tekrar #{i + 1}", lambda: _run(xml_path, excel_path))
+        result = _timed("ID + ad ile birleştirme", lambda: crosscheck(
+            _load_xml_frame(xml_path), excel_sidecar.read_frame(excel_path), join="id_name", limit=500))
+        assert result["summary"]["matched"] == args.signals, result["summary"]
+    finally:
+        excel_sidecar.EXCEL_SIDECAR_DIR = sidecar_dir
+        document_cache.clear()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
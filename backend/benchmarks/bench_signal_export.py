@@ -0,0 +1,113 @@
+"""
+Sinyal tablosu dışa aktarma benchmark'ı: pandas DataFrame + to_excel ile akışlı yazım karşılaştırması.
+
+Geçici bir dizinde N sinyal satırlı bir ST bloğu içeren XML dosyası ve geçici bir SQLite veritabanı oluşturur.
+Eski yol (tüm tablo listeye, oradan DataFrame'e ve df.to_excel ile diske) ile export_signals_to_excel'in
+akışlı xlsx/csv yazımı karşılaştırılır ve süreler yazdırılır. Son satır aynı içeriğin tekrar dışa aktarımıdır
+(diskteki önbellekten). --memory verilirse her adım tracemalloc altında bir kez daha çalıştırılıp en yüksek
+Python bellek kullanımı da yazdırılır (izleme adımları belirgin biçimde yavaşlatır).
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_signal_export.py --signals 200000 [--memory]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+from services import document_cache, filter_service  # noqa: E402
+from services.signal_parser import extract_st_text, parse_signal_rows  # noqa: E402
+
+
+def _write_document(path: str, n_signals: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<project><ST><xhtml xmlns="http://www.w3.org/1999/xhtml">')
+        for i in range(n_signals):
+            if i % 16 == 0:
+                f.write(f"// ID:{i:X}\n")
+            f.write(f"//--- SIGNAL -> SIG_{i} Max : 100 Min : 0 Def : 0 Resolution : 0.1 Offset : 0\n")
+        f.write("</xhtml></ST></project>\n")
+
+
+def _legacy_export(path: str, out_path: str) -> None:
+    import pandas as pd
+
+    with open(path, "r", encoding="utf-8") as f:
+        rows = parse_signal_rows(extract_st_text(f.read()))
+    data = [[signal_id, name, resolution, offset, min_value, max_value, default]
+            for signal_id, name, max_value, min_value, default, resolution, offset in rows]
+    df = pd.DataFrame(data, columns=["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default"])
+    df.to_excel(out_path, index=False)
+
+
+def _measure(label: str, func, memory: bool) -> None:
+    document_cache.clear()
+    started = time.perf_counter()
+    func()
+    line = f"{label:>22}: {(time.perf_counter() - started) * 1000:9.1f} ms"
+    if memory:
+        document_cache.clear()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  en yüksek bellek {peak / 1024 / 1024:7.1f} MB"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=200_000)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_signal_export_")
+    export_dir = os.path.join(work_dir, "CodesysXML_Export")
+    os.makedirs(export_dir)
+    app = Flask("bench_signal_export")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    cwd = os.getcwd()
+    cache_dir = filter_service.SIGNAL_EXPORT_DIR
+    filter_service.SIGNAL_EXPORT_DIR = os.path.join(work_dir, "SignalExports")
+    os.makedirs(filter_service.SIGNAL_EXPORT_DIR)
+    try:
+        os.chdir(work_dir)  # DB'deki yollar çalışma dizinine göredir
+        doc_path = "CodesysXML_Export/doc.xml"
+        _write_document(doc_path, args.signals)
+        with app.app_context():
+            db.create_all()
+            file_id = XMLFile.create(doc_path).id
+            print(f"{args.signals} sinyal, {os.path.getsize(doc_path) / 1024 / 1024:.1f} MB")
+
+            def export(fmt, fresh=True):
+                if fresh:  # önbellekteki dosya silinir, her ölçüm dosyayı yeniden üretir
+                    for name in os.listdir(filter_service.SIGNAL_EXPORT_DIR):
+                        os.remove(os.path.join(filter_service.SIGNAL_EXPORT_DIR, name))
+                ok, result = filter_service.export_signals_to_excel(file_id, fmt)
+                assert ok, result
+
+            legacy_path = os.path.join(work_dir, "legacy.xlsx")
+            _measure("pandas + to_excel", lambda: _legacy_export(doc_path, legacy_path), args.memory)
+            _measure("akışlı xlsx", lambda: export(filter_service.EXPORT_FORMAT_XLSX), args.memory)
+            _measure("akışlı csv", lambda: export(filter_service.EXPORT_FORMAT_CSV), args.memory)
+            export(filter_service.EXPORT_FORMAT_XLSX)
+            _measure("xlsx (önbellekten)", lambda: export(filter_service.EXPORT_FORMAT_XLSX, fresh=False), args.memory)
+    finally:
+        filter_service.SIGNAL_EXPORT_DIR = cache_dir
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
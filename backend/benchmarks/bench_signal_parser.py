@@ -0,0 +1,117 @@
+"""
+Sinyal ayrıştırıcısı benchmark'ı (büyük ST bloğu).
+
+Bellekte N satırlık bir ST metni üretir (kod satırları, her 16 sinyalde bir 'ID:' satırı ve 'SIGNAL ->'
+satırları) ve şunları karşılaştırır:
+  - eski döngü: her satırda re.search ile desen çözümleme + any() ile anahtar kelime karşılaştırması
+  - iter_signal_rows: tüm sinyaller, birebir küme eşleştirmesi, önek trie'si ve glob desenleri
+Eski döngü ile birebir eşleştirmenin aynı satırları döndürdüğü doğrulanır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_signal_parser.py --lines 500000 --keywords 50
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.signal_parser import (  # noqa: E402
+    MATCH_EXACT,
+    MATCH_GLOB,
+    MATCH_PREFIX,
+    SignalMatcher,
+    iter_lines,
+    parse_signal_rows,
+)
+
+_CODE_LINES = (
+    "    IF bEnable AND NOT bFault THEN",
+    "        nCounter := nCounter + 1;",
+    "    END_IF;",
+    "    (* durum makinesi *)",
+    "    CASE eState OF",
+)
+
+
+def _st_text(n_lines: int, rng: random.Random) -> tuple:
+    lines = []
+    names = []
+    for i in range(n_lines):
+        r = i % 4
+        if r == 0 and i % 64 == 0:
+            lines.append(f"// ID:{i:X} -------------------------------")
+        elif r == 1:
+            name = f"S_{rng.choice(('ESS', 'ER', 'VCU', 'BMS'))}_{rng.choice(('Mn', 'Com', 'Tmp'))}_{i:06d}"
+            names.append(name)
+            lines.append(f"//--- SIGNAL -> {name} Max: 100 Min: 0 Def: 0 Resolution: 0.1 Offset: 0")
+        else:
+            lines.append(rng.choice(_CODE_LINES))
+    return "\n".join(lines), names
+
+
+def _legacy(st_content: str, keywords: list) -> list:
+    # Eski extract_filtered_signals döngüsünün birebir kopyası
+    results = []
+    current_id = ""
+    for line in st_content.split('\n'):
+        id_match = re.search(r'ID:([0-9a-fA-F]+)', line)
+        if id_match:
+            current_id = id_match.group(1)
+        signal_match = re.search(
+            r'//-*\s*SIGNAL\s*->\s*(?P<signal_name>\S+)\s*'
+            r'Max\s*:\s*(?P<max>.*?)\s*'
+            r'Min\s*:\s*(?P<min>.*?)\s*'
+            r'Def\s*:\s*(?P<def>.*?)\s*'
+            r'Resolution\s*:\s*(?P<res>.*?)\s*'
+            r'Offset\s*:\s*(?P<off>.*?)\s*$',
+            line
+        )
+        if signal_match:
+            signal_name = signal_match.group('signal_name')
+            if any(keyword.strip() == signal_name.strip() for keyword in keywords):
+                results.append((current_id, signal_name, signal_match.group('max').strip(),
+                                signal_match.group('min').strip(), signal_match.group('def').strip(),
+                                signal_match.group('res').strip(), signal_match.group('off').strip()))
+    return results
+
+
+def _timed(label: str, n_lines: int, fn) -> list:
+    started = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>28}: {elapsed:7.3f} sn  {n_lines / elapsed / 1e6:5.2f} M satır/sn  {len(rows):>7} sinyal")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--keywords", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(19)
+    st_content, names = _st_text(args.lines, rng)
+    keywords = rng.sample(names, min(args.keywords, len(names)))
+    prefixes = [name[:-2] for name in keywords]
+    globs = [f"{name[:6]}*{name[-4:]}" for name in keywords]
+    print(f"{args.lines} satır, {len(names)} sinyal satırı, {len(keywords)} anahtar kelime")
+
+    legacy = _timed("eski döngü", args.lines, lambda: _legacy(st_content, keywords))
+    _timed("tüm sinyaller", args.lines, lambda: parse_signal_rows(st_content))
+    exact = _timed("birebir (küme)", args.lines,
+                   lambda: parse_signal_rows(st_content, SignalMatcher(keywords, MATCH_EXACT)))
+    _timed("önek (trie)", args.lines,
+           lambda: parse_signal_rows(st_content, SignalMatcher(prefixes, MATCH_PREFIX)))
+    _timed("glob (trie + fnmatch)", args.lines,
+           lambda: parse_signal_rows(st_content, SignalMatcher(globs, MATCH_GLOB)))
+    _timed("satır üretimi (iter_lines)", args.lines, lambda: [None for _ in iter_lines(st_content)])
+
+    assert legacy == exact, "eski döngü ile birebir eşleştirme farklı sonuç verdi"
+
+
+if __name__ == "__main__":
+    main()
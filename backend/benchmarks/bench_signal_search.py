@@ -0,0 +1,103 @@
+"""
+Dosyalar arası sinyal arama gecikmesi benchmark'ı.
+
+Geçici bir SQLite veritabanında N XML dosyası kaydı ve her birine M sinyal satırı oluşturur (ad havuzu
+dosyalar arasında ortaktır; sürüm serilerinde olduğu gibi aynı sinyal birçok dosyada geçer). Ardından
+exact / prefix / substring modlarında rastgele sorgularla search_signals çağrılır ve her mod için
+p50 / p95 / en kötü gecikme yazdırılır. Hedef: 1000 dosyada p95 < 100 ms.
+Aynı veri üzerinde sinyal zaman çizelgesi (get_signal_history) gecikmesi de ölçülür.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_signal_search.py --files 1000 --signals 200 --names 5000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.signal_model import Signal  # noqa: E402
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+from services.filter_service import get_signal_history, search_signals  # noqa: E402
+
+_PREFIXES = ("S_ESS", "S_ER", "S_VCU", "S_BMS", "S_INV", "C_MCU", "C_DCDC", "S_HVAC")
+
+
+def _seed(n_files: int, per_file: int, n_names: int, rng: random.Random) -> list:
+    names = [f"{rng.choice(_PREFIXES)}_{rng.choice(('Mn', 'Aux', 'Com', 'Tmp'))}_{i:05d}" for i in range(n_names)]
+    db.session.execute(insert(XMLFile), [{"file_path": f"CodesysXML_Export/proj_{i:04d}.xml"}
+                                         for i in range(n_files)])
+    db.session.commit()
+    for file_id in range(1, n_files + 1):
+        rows = [(f"{pos:X}", name, "100", "0", "0", "1", "0")
+                for pos, name in enumerate(rng.sample(names, per_file))]
+        Signal.replace_for_files({file_id: rows})
+    db.session.commit()
+    return names
+
+
+def _queries(mode: str, names: list, rng: random.Random, count: int) -> list:
+    picks = [rng.choice(names) for _ in range(count)]
+    if mode == "exact":
+        return picks
+    if mode == "prefix":
+        return [name[:rng.randint(4, len(name) - 2)] for name in picks]
+    return [name[rng.randint(2, 6):][:rng.randint(3, 6)] for name in picks]
+
+
+def _report(label: str, calls: list) -> None:
+    timings = []
+    hits = 0
+    for call in calls:
+        started = time.perf_counter()
+        hits += call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:>10}: p50 {p50:6.1f} ms  p95 {p95:6.1f} ms  en kötü {timings[-1]:6.1f} ms  "
+          f"ort. {hits / len(timings):.0f} eşleşme")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--signals", type=int, default=200, help="dosya başına sinyal sayısı")
+    parser.add_argument("--names", type=int, default=5000, help="farklı sinyal adı sayısı")
+    parser.add_argument("--queries", type=int, default=200, help="mod başına sorgu sayısı")
+    parser.add_argument("--limit", type=int, default=50, help="sayfa başına dosya")
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    work_dir = tempfile.mkdtemp(prefix="bench_signal_search_")
+    app = Flask("bench_signal_search")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            names = _seed(args.files, args.signals, args.names, rng)
+            print(f"{args.files} dosya x {args.signals} sinyal ({args.names} farklı ad) "
+                  f"{time.perf_counter() - started:.1f} sn'de yüklendi")
+
+            for mode in ("exact", "prefix", "substring"):
+                _report(mode, [lambda q=query: search_signals(q, mode, limit=args.limit)["total_hits"]
+                               for query in _queries(mode, names, rng, args.queries)])
+            _report("history", [lambda q=query: get_signal_history(q)["total_versions"]
+                                for query in _queries("exact", names, rng, args.queries)])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+XML birleştirme benchmark'ı: dosya/blok başına tek istek ile toplu, akışlı birleştirme karşılaştırması.
+
+Geçici bir dizinde birleştirme işaretçisi içeren N adet PLCopen benzeri XML dosyası ve geçici bir SQLite
+veritabanı oluşturur. Eski yol: her (dosya, blok) çifti için merge_xml_and_get_content, ardından içeriğin
+JSON yanıtına konması ve /download isteğinde geri gönderilip kodlanması. Yeni yol: tüm bloklar ve dosyalar
+için tek merge_xml_batch işi (çıktı diske akış halinde yazılır, tek dosyada XML, çok dosyada zip).
+Eski yolda birden fazla blok için istemci her seferinde bir önceki birleştirilmiş içeriği gönderemez;
+burada yalnızca son bloğun çıktısı sayılır, yani eski yolun maliyeti iyimser ölçülür. --memory verilirse
+her yol tracemalloc altında bir kez daha çalıştırılıp en yüksek Python bellek kullanımı da yazdırılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_xml_merge.py --files 8 --size-mb 20 --blocks 4 [--memory]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask  # noqa: E402
+
+from codesys_doc_tracker import db  # noqa: E402
+import codesys_doc_tracker.initialize_db  # noqa: E402,F401  (tüm modellerin kaydı için)
+from codesys_doc_tracker.models.xmlfile_model import XMLFile  # noqa: E402
+from services import document_cache, xml_merge_service  # noqa: E402
+from services.xml_merge_service import INSERTION_END_MARKER, merge_xml_and_get_content, merge_xml_batch  # noqa: E402
+
+_LINE = "//--- SIGNAL -> SIG_{0} Max : 100 Min : 0 Def : 0 Resolution : 0.1 Offset : 0\n"
+
+
+def _write_document(path: str, size_mb: int) -> None:
+    target = size_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<project><ST><xhtml xmlns="http://www.w3.org/1999/xhtml">')
+        written = i = 0
+        while written < target // 2:
+            written += f.write(_LINE.format(i))
+            i += 1
+        f.write(INSERTION_END_MARKER + "\n")
+        while written < target:
+            written += f.write(_LINE.format(i))
+            i += 1
+        f.write("</xhtml></ST></project>\n")
+
+
+def _legacy(file_ids, blocks) -> None:
+    for file_id in file_ids:
+        for block in blocks:
+            content = merge_xml_and_get_content(file_id, block)
+            assert content is not None
+            # Yanıt JSON'u ve indirme isteğinde içeriğin geri gönderilmesi
+            body = json.dumps({"content": content})
+            json.loads(body)["content"].encode("utf-8")
+
+
+def _batch(file_ids, blocks) -> None:
+    result, error = merge_xml_batch([(file_id, blocks) for file_id in file_ids])
+    assert error is None and not result["failed"], error or result["failed"]
+
+
+def _measure(label: str, func, memory: bool) -> None:
+    document_cache.clear()
+    started = time.perf_counter()
+    func()
+    line = f"{label:>26}: {(time.perf_counter() - started) * 1000:9.1f} ms"
+    if memory:
+        document_cache.clear()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  en yüksek bellek {peak / 1024 / 1024:7.1f} MB"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--blocks", type=int, default=4)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_xml_merge_")
+    export_dir = os.path.join(work_dir, "CodesysXML_Export")
+    os.makedirs(export_dir)
+    app = Flask("bench_xml_merge")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(work_dir, "bench.db")
+    db.init_app(app)
+    cwd = os.getcwd()
+    output_dir = xml_merge_service.MERGE_OUTPUT_DIR
+    xml_merge_service.MERGE_OUTPUT_DIR = os.path.join(work_dir, "MergedXML")
+    os.environ["CODESYS_XML_EXPORT_DIR"] = export_dir
+    try:
+        os.chdir(work_dir)  # DB'deki yollar çalışma dizinine göredir
+        with app.app_context():
+            db.create_all()
+            file_ids = []
+            for i in range(args.files):
+                _write_document(os.path.join(export_dir, f"doc_{i}.xml"), args.size_mb)
+                file_ids.append(XMLFile.create(f"CodesysXML_Export/doc_{i}.xml").id)
+            blocks = [f"// yeni blok {i}\n" + "x := x + 1;\n" * 50 for i in range(args.blocks)]
+            print(f"{args.files} dosya x {args.size_mb} MB, {args.blocks} blok")
+
+            _measure("istek başına birleştirme", lambda: _legacy(file_ids, blocks), args.memory)
+            _measure("toplu, tek dosya", lambda: _batch(file_ids[:1], blocks), args.memory)
+            _measure("toplu, zip", lambda: _batch(file_ids, blocks), args.memory)
+    finally:
+        xml_merge_service.MERGE_OUTPUT_DIR = output_dir
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
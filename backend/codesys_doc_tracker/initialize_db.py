@@ -1,5 +1,9 @@
+from sqlalchemy import inspect, text
+
 from codesys_doc_tracker import createApp, db
 from services.xmlfile_service import scan_and_register_xml_files
+from services.fs_watch_service import start_fs_watcher
+from services.diff_job_service import fail_stale_jobs
 from codesys_doc_tracker.models.user_model import User
 from codesys_doc_tracker.models.diff_model import Diff
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
@@ -9,12 +13,51 @@ from codesys_doc_tracker.models.excel_model import ExcelFile
 from codesys_doc_tracker.models.note_visibility_model import NoteVisibility
 from codesys_doc_tracker.models.glossary_model import Glossary
 from codesys_doc_tracker.models.notification_model import Notification
+from codesys_doc_tracker.models.diff_filter_rule_model import DiffFilterRule
+from codesys_doc_tracker.models.diff_job_model import DiffJob
+from codesys_doc_tracker.models.file_index_model import FileIndex
+from codesys_doc_tracker.models.signal_model import Signal, SignalName
+
+
+def _add_missing_columns():
+    """
+    db.create_all() mevcut tablolara yeni sütun eklemez. Modellere sonradan eklenen
+    (nullable) sütunları ve bu sütunların indekslerini mevcut veritabanına ekler.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_cols = {c["name"] for c in inspector.get_columns(table.name)}
+        added = False
+        for column in table.columns:
+            if column.name in existing_cols or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=db.engine.dialect)
+            db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+            added = True
+        if added:
+            db.session.commit()
+
+        existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=db.engine)
+
 
 def createDB():
     app = createApp()
     with app.app_context():
         db.create_all()
-        scan_and_register_xml_files()
+        _add_missing_columns()
+        SignalName.backfill()
+        # Kapanmış süreçlerden kalan bitmemiş diff işleri yeniden başlatılmaz; ilerleme sonsuza dek sorgulanmasın.
+        # Çalışan diğer sunucu işlemlerinin işleri kalp atışıyla yenilendiği için kapatılmaz.
+        fail_stale_jobs()
+        # İzleyici açıksa ilk senkronizasyonu o yapar; sonrasında tam tarama gerekmez
+        if not start_fs_watcher(app):
+            scan_and_register_xml_files()
         print("Database created successfully.")
-
-
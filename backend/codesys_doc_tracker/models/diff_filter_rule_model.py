@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+from codesys_doc_tracker import db
+
+
+class DiffFilterRule(db.Model):
+    """
+    Projelere özel diff gürültü kuralları. Varsayılan kurallar config/diff_filter_rules.json'dadır;
+    buradaki kurallar onlara eklenir. project boş ise kural tüm projelere uygulanır.
+    """
+    __tablename__ = "diff_filter_rules"
+
+    id = db.Column(db.Integer, primary_key=True)
+    project = db.Column(db.String(64), nullable=True, index=True)
+    kind = db.Column(db.String(16), nullable=False)
+    pattern = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "project": self.project,
+            "kind": self.kind,
+            "pattern": self.pattern,
+            "description": self.description,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    @classmethod
+    def create(cls, kind: str, pattern: str, project: Optional[str] = None, description: Optional[str] = None):
+        rule = cls(
+            kind=kind,
+            pattern=pattern,
+            project=(project or "").strip() or None,
+            description=(description or "").strip() or None,
+        )
+        db.session.add(rule)
+        db.session.commit()
+        return rule
+
+    @classmethod
+    def list_for_project(cls, project: Optional[str] = None) -> List["DiffFilterRule"]:
+        """
+        Genel kuralları ve (verildiyse) projeye özel kuralları ekleniş sırasına göre döndürür.
+        """
+        query = cls.query
+        if project:
+            query = query.filter(db.or_(cls.project.is_(None), cls.project == project))
+        else:
+            query = query.filter(cls.project.is_(None))
+        return query.order_by(cls.id.asc()).all()
+
+    @classmethod
+    def list_projects(cls) -> List[str]:
+        """
+        Projeye özel kuralı bulunan projelerin adları.
+        """
+        rows = db.session.query(cls.project).filter(cls.project.isnot(None)).distinct().all()
+        return [row[0] for row in rows]
+
+    @classmethod
+    def delete_by_id(cls, rule_id: int) -> bool:
+        rule = cls.query.get(rule_id)
+        if not rule:
+            return False
+        db.session.delete(rule)
+        db.session.commit()
+        return True
+
+    def __repr__(self):
+        return f"<DiffFilterRule {self.id} {self.kind}:{self.pattern}>"
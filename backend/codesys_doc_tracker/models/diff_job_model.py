@@ -0,0 +1,151 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+from codesys_doc_tracker import db
+
+
+class DiffJob(db.Model):
+    """
+    Arka planda (işlem havuzunda) çalışan diff işleri. Kuyruk harici bir aracı gerektirmez;
+    durum ve ilerleme bu tabloda tutulur, istemci /api/diffs/jobs/<id> ile sorgular.
+    """
+    __tablename__ = "diff_jobs"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    file1_id = db.Column(db.Integer, nullable=False)
+    file2_id = db.Column(db.Integer, nullable=False)
+    mode = db.Column(db.String(16), nullable=False)
+    project = db.Column(db.String(64), nullable=True)
+    status = db.Column(db.String(16), nullable=False, default=STATUS_QUEUED, index=True)
+    lines_processed = db.Column(db.BigInteger, nullable=False, default=0)
+    percent = db.Column(db.Float, nullable=False, default=0.0)
+    diff_id = db.Column(db.Integer, db.ForeignKey("diffs.id", ondelete="SET NULL"), nullable=True)
+    cached = db.Column(db.Boolean, nullable=True)
+    message = db.Column(db.Text, nullable=True)
+    # İşi oluşturan sunucu işlemi (host:pid:token); bu işlem bitmemiş işlerinin updated_at'ini düzenli yeniler
+    owner = db.Column(db.String(128), nullable=True, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "file1_id": self.file1_id,
+            "file2_id": self.file2_id,
+            "mode": self.mode,
+            "project": self.project,
+            "status": self.status,
+            "lines_processed": self.lines_processed,
+            "percent": round(self.percent or 0.0, 1),
+            "diff_id": self.diff_id,
+            "cached": self.cached,
+            "message": self.message,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    @classmethod
+    def create(cls, file1_id: int, file2_id: int, mode: str, project: Optional[str] = None,
+               owner: Optional[str] = None):
+        job = cls(
+            file1_id=file1_id,
+            file2_id=file2_id,
+            mode=mode,
+            project=(project or "").strip() or None,
+            status=cls.STATUS_QUEUED,
+            owner=owner,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @classmethod
+    def create_many(cls, pairs: List[Tuple[int, int]], mode: str, project: Optional[str] = None,
+                    owner: Optional[str] = None):
+        """
+        Toplu karşılaştırma için her dosya çifti adına bir iş kaydı oluşturur (tek commit).
+        """
+        project = (project or "").strip() or None
+        jobs = [cls(file1_id=f1, file2_id=f2, mode=mode, project=project, status=cls.STATUS_QUEUED, owner=owner)
+                for f1, f2 in pairs]
+        db.session.add_all(jobs)
+        db.session.commit()
+        return jobs
+
+    @classmethod
+    def get_by_id(cls, job_id: str):
+        return cls.query.get(job_id)
+
+    @classmethod
+    def get_by_ids(cls, job_ids: List[str]) -> List["DiffJob"]:
+        """
+        İş kayıtlarını verilen sırayla döndürür.
+        """
+        by_id = {job.id: job for job in cls.query.filter(cls.id.in_(job_ids)).all()}
+        return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+
+    @classmethod
+    def fail_unfinished(cls, job_ids: List[str], message: str) -> None:
+        """
+        Henüz bitmemiş (queued/running) işleri başarısız olarak işaretler.
+        """
+        cls.query.filter(
+            cls.id.in_(job_ids),
+            cls.status.in_([cls.STATUS_QUEUED, cls.STATUS_RUNNING]),
+        ).update({"status": cls.STATUS_FAILED, "message": message, "updated_at": datetime.utcnow()},
+                 synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def touch_owned(cls, owner: str) -> None:
+        """
+        Bu işlemin bitmemiş işlerinin updated_at'ini yeniler (kalp atışı): kuyrukta bekleyen işler de
+        sahibi yaşadığı sürece eskimiş sayılmaz.
+        """
+        cls.query.filter(
+            cls.owner == owner,
+            cls.status.in_([cls.STATUS_QUEUED, cls.STATUS_RUNNING]),
+        ).update({"updated_at": datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def fail_stale(cls, message: str, stale_before: datetime, job_ids: Optional[List[str]] = None) -> int:
+        """
+        updated_at'i stale_before'dan eski bitmemiş (queued/running) işleri başarısız olarak işaretler.
+        Sahibi çalışan işlemin işleri kalp atışıyla yenilendiği için dokunulmaz; yalnızca sahibi ölmüş
+        (sunucu kapanmış/çökmüş) işler kapanır. job_ids verilirse yalnızca bu işlere bakılır.
+        Güncellenen iş sayısını döndürür.
+        """
+        query = cls.query.filter(
+            cls.status.in_([cls.STATUS_QUEUED, cls.STATUS_RUNNING]),
+            cls.updated_at < stale_before,
+        )
+        if job_ids is not None:
+            query = query.filter(cls.id.in_(job_ids))
+        count = query.update({"status": cls.STATUS_FAILED, "message": message, "updated_at": datetime.utcnow()},
+                             synchronize_session=False)
+        db.session.commit()
+        return count
+
+    @classmethod
+    def update_progress(cls, job_id: str, lines_processed: int, percent: float) -> None:
+        cls.query.filter_by(id=job_id).update({
+            "lines_processed": lines_processed,
+            "percent": percent,
+            "updated_at": datetime.utcnow(),
+        })
+        db.session.commit()
+
+    @classmethod
+    def set_status(cls, job_id: str, status: str, **fields) -> None:
+        fields.update(status=status, updated_at=datetime.utcnow())
+        cls.query.filter_by(id=job_id).update(fields)
+        db.session.commit()
+
+    def __repr__(self):
+        return f"<DiffJob {self.id} {self.status} {self.percent:.0f}%>"
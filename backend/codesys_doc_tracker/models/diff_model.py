@@ -1,7 +1,13 @@
 from datetime import datetime
+from typing import List
+from sqlalchemy import delete, or_, select, update
 from codesys_doc_tracker import db
 import os
 from codesys_doc_tracker.models.note_model import Note
+from services.diff_report_store import remove_report
+
+# Tek sorguda IN (...) içine konacak azami değer sayısı (SQLite değişken sınırı için)
+_IN_CHUNK = 500
 
 class Diff(db.Model):
     __tablename__ = 'diffs'
@@ -12,6 +18,22 @@ class Diff(db.Model):
     diffReport_path = db.Column(db.String(500), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Diff önbelleği anahtarı: (eski içerik sha256, yeni içerik sha256, filtre/mod versiyonu)
+    old_content_hash = db.Column(db.String(64), nullable=True)
+    new_content_hash = db.Column(db.String(64), nullable=True)
+    filter_version = db.Column(db.String(64), nullable=True)
+
+    # Diff motorunun rapor yazarken çıkardığı özet istatistikler (eski kayıtlarda boş)
+    added_lines = db.Column(db.Integer, nullable=True)
+    removed_lines = db.Column(db.Integer, nullable=True)
+    changed_lines = db.Column(db.Integer, nullable=True)
+    pou_changes = db.Column(db.JSON, nullable=True)      # {"P_IOVD_A": 12, ...}
+    changed_signals = db.Column(db.JSON, nullable=True)  # ["S_ESS_Mn_Ct", ...]
+
+    __table_args__ = (
+        db.Index("ix_diffs_cache_key", "old_content_hash", "new_content_hash", "filter_version"),
+    )
+
     old_file = db.relationship('XMLFile', foreign_keys=[xmlfile_old_id], backref='old_diffs', lazy=True)
     new_file = db.relationship('XMLFile', foreign_keys=[xmlfile_new_id], backref='new_diffs', lazy=True)
 
@@ -19,25 +41,145 @@ class Diff(db.Model):
         return f'<Diff {self.id} | {self.diffReport_name}>'
 
     @classmethod
-    def create(cls, old_id: int, new_id: int, diff_name: str, diff_path: str):
+    def create(cls, old_id: int, new_id: int, diff_name: str, diff_path: str,
+               old_hash: str = None, new_hash: str = None, filter_version: str = None, stats: dict = None):
+        stats = stats or {}
         new_diff = cls(
             xmlfile_old_id=old_id,
             xmlfile_new_id=new_id,
             diffReport_name=diff_name,
-            diffReport_path=diff_path
+            diffReport_path=diff_path,
+            old_content_hash=old_hash,
+            new_content_hash=new_hash,
+            filter_version=filter_version,
+            added_lines=stats.get("added_lines"),
+            removed_lines=stats.get("removed_lines"),
+            changed_lines=stats.get("changed_lines"),
+            pou_changes=stats.get("pou_changes"),
+            changed_signals=stats.get("changed_signals")
         )
         db.session.add(new_diff)
         db.session.commit()
         return new_diff
 
+    def stats_dict(self):
+        """
+        Listelemelerde rapor dosyası okunmadan gösterilecek değişiklik özeti; hesaplanmamışsa None.
+        """
+        if self.added_lines is None:
+            return None
+        return {
+            "added_lines": self.added_lines,
+            "removed_lines": self.removed_lines,
+            "changed_lines": self.changed_lines,
+            "pou_changes": self.pou_changes or {},
+            "changed_signals": self.changed_signals or [],
+        }
+
     @classmethod
     def get_by_id(cls, diff_id: int):
         return cls.query.get(diff_id)
 
+    @classmethod
+    def get_by_report_name(cls, diff_name: str):
+        """
+        Raporu bu adla kaydedilmiş en yeni diff kaydı (aynı rapor birden çok dosya çiftince paylaşılabilir).
+        """
+        return cls.query.filter_by(diffReport_name=diff_name).order_by(cls.created_at.desc()).first()
+
+    def is_regenerable(self) -> bool:
+        """
+        Önbellek anahtarı (içerik özetleri + filtre versiyonu) kayıtlıysa rapor silinse de yeniden üretilebilir.
+        """
+        return bool(self.old_content_hash and self.new_content_hash and self.filter_version)
+
     @classmethod
     def get_by_file_ids(cls, old_id: int, new_id: int):
         return cls.query.filter_by(xmlfile_old_id=old_id, xmlfile_new_id=new_id).first()
 
+    @classmethod
+    def get_by_content_hashes(cls, old_hash: str, new_hash: str, filter_version: str):
+        """
+        Aynı içerik çifti ve filtre versiyonu için üretilmiş, rapor dosyası diskte duran en yeni diff kaydını döndürür.
+        """
+        rows = cls.query.filter_by(
+            old_content_hash=old_hash,
+            new_content_hash=new_hash,
+            filter_version=filter_version
+        ).order_by(cls.created_at.desc()).all()
+        for row in rows:
+            if row.diffReport_path and os.path.exists(row.diffReport_path):
+                return row
+        return None
+
+    @classmethod
+    def get_for_files(cls, old_id: int, new_id: int, old_hash: str, new_hash: str, filter_version: str):
+        """
+        Aynı dosya çifti, aynı içerikler ve filtre versiyonu için en yeni diff kaydı (raporu diskte olmasa da).
+        Önbellek anahtarı yalnızca içeriktir; kayıt ise dosya çiftine aittir (notlar, ilişkiler, dosya ayrıntısı).
+        """
+        return cls.query.filter_by(
+            xmlfile_old_id=old_id,
+            xmlfile_new_id=new_id,
+            old_content_hash=old_hash,
+            new_content_hash=new_hash,
+            filter_version=filter_version
+        ).order_by(cls.created_at.desc()).first()
+
+    @classmethod
+    def unreferenced_paths(cls, report_paths: List[str]) -> List[str]:
+        """
+        Hiçbir diff kaydının kullanmadığı rapor yolları. Aynı içerik çiftinin kayıtları tek raporu paylaşabilir;
+        bir kayıt silinince rapor ancak başka kayıt kullanmıyorsa silinir.
+        """
+        paths = list(dict.fromkeys(path for path in report_paths if path))
+        used = set()
+        for i in range(0, len(paths), _IN_CHUNK):
+            chunk = paths[i:i + _IN_CHUNK]
+            used.update(path for (path,) in db.session.execute(
+                select(cls.__table__.c.diffReport_path).where(cls.__table__.c.diffReport_path.in_(chunk))
+            ))
+        return [path for path in paths if path not in used]
+
+    def replace_report(self, diff_name: str, diff_path: str, stats: dict = None) -> None:
+        """
+        Kaydı yeniden üretilmiş rapora bağlar; id, notlar ve oluşturulma zamanı korunur.
+        """
+        stats = stats or {}
+        self.diffReport_name = diff_name
+        self.diffReport_path = diff_path
+        self.added_lines = stats.get("added_lines")
+        self.removed_lines = stats.get("removed_lines")
+        self.changed_lines = stats.get("changed_lines")
+        self.pou_changes = stats.get("pou_changes")
+        self.changed_signals = stats.get("changed_signals")
+        db.session.commit()
+
+    @classmethod
+    def delete_for_files(cls, file_ids) -> List[str]:
+        """
+        Verilen XML dosyalarına (id listesi veya alt sorgu) ait diff'leri; notları, notların ilişki/görünürlük/
+        bildirim kayıtları ve diff işlerindeki bağlantılarla birlikte set tabanlı ifadelerle siler.
+        Satır satır yükleme yapılmaz. Rapor dosyaları silinmez; yolları döndürülür (commit sonrası silinsin diye).
+        Commit çağırana aittir.
+        """
+        from codesys_doc_tracker.models.diff_job_model import DiffJob
+
+        diffs = cls.__table__
+        diff_ids = select(diffs.c.id).where(or_(diffs.c.xmlfile_old_id.in_(file_ids),
+                                                 diffs.c.xmlfile_new_id.in_(file_ids)))
+        report_paths = [path for (path,) in db.session.execute(
+            select(diffs.c.diffReport_path).where(diffs.c.id.in_(diff_ids))
+        )]
+        if not report_paths:
+            return []  # bağlı diff yok; diğer ifadelere gerek kalmaz
+
+        Note.delete_for_diffs(diff_ids)
+        jobs = DiffJob.__table__
+        db.session.execute(update(jobs).where(jobs.c.diff_id.in_(diff_ids)).values(diff_id=None))
+        db.session.execute(delete(diffs).where(diffs.c.id.in_(diff_ids)))
+        return [path for path in report_paths if path]
+
     @classmethod
     def delete_by_id(cls, diff_id: int):
         diff = cls.query.get(diff_id)
@@ -49,37 +191,45 @@ class Diff(db.Model):
         if has_notes:
             return False, "Bu Diff raporuna bağlı notlar ve ilişkiler mevcut, silinemez."
 
-        # 2. Diff raporu dosyasını sil (eğer varsa)
-        try:
-            if diff.diffReport_path and os.path.exists(diff.diffReport_path):
-                os.remove(diff.diffReport_path)
-        except Exception as e:
-            # Dosya silinemese bile DB kaydını silmeyi deneyebiliriz
-            print("Diff rapor dosyası silinemedi:", e)
-
-        # 3. Diff kaydını veritabanından sil
+        # 2. Diff kaydını veritabanından sil
+        report_path = diff.diffReport_path
         try:
             db.session.delete(diff)
             db.session.commit()
-            return True, None
         except Exception as e:
             db.session.rollback()
             return False, f"Veritabanından silinirken hata oluştu: {e}"
 
+        # 3. Diff raporu dosyasını ve satır indeksini sil (eğer varsa ve başka kayıt kullanmıyorsa)
+        try:
+            for path in cls.unreferenced_paths([report_path]):
+                if os.path.exists(path):
+                    remove_report(path)
+        except Exception as e:
+            print("Diff rapor dosyası silinemedi:", e)
+        return True, None
+
     @classmethod
     def resync_reports(cls):
         """
-        Diskte olmayan diff kayıtlarını DB'den temizler.
+        Raporu diskte olmayan diff kayıtlarını DB'den temizler.
         NOT: Diff'e bağlı not varsa SİLMEZ, atlar (skip).
-        Sonuç: {"removed": X, "skipped": Y}
+        İçerik özetleri bilinen kayıtlar da silinmez (evicted): raporları önbellek temizliğinde silinmiştir
+        ve görüntülenmek istendiğinde yeniden üretilebilir.
+        Sonuç: {"removed": X, "skipped": Y, "evicted": Z}
         """
         removed = 0
         skipped = 0
+        evicted = 0
 
         for d in cls.query.all():
             if os.path.exists(d.diffReport_path):
                 continue  # dosya duruyor, dokunma
 
+            if d.is_regenerable():
+                evicted += 1
+                continue
+
             # Bağlı not var mı?
             has_notes = db.session.query(Note.id).filter_by(diff_id=d.id).first() is not None
             if has_notes:
@@ -94,4 +244,4 @@ class Diff(db.Model):
         if removed or skipped:
             db.session.commit()
 
-        return {"removed": removed, "skipped": skipped}
+        return {"removed": removed, "skipped": skipped, "evicted": evicted}
@@ -1,7 +1,12 @@
 from datetime import datetime
 import os
+from typing import Iterable, Set
+from sqlalchemy import delete, insert, select
 from codesys_doc_tracker import db
 
+# Tek sorguda IN (...) içine konacak azami değer sayısı (SQLite değişken sınırı için)
+_IN_CHUNK = 500
+
 
 class ExcelFile(db.Model):
     __tablename__ = 'excelfiles'
@@ -25,6 +30,43 @@ class ExcelFile(db.Model):
     def get_by_path(cls, file_path: str):
         return cls.query.filter_by(file_path=file_path).first()
 
+    @classmethod
+    def create_many(cls, file_paths: Iterable[str]) -> int:
+        """
+        Yeni dosya kayıtlarını tek bir toplu INSERT ile ekler.
+        """
+        rows = [{"file_path": path} for path in file_paths]
+        if rows:
+            db.session.execute(insert(cls), rows)
+        db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def paths_under(cls, base_name: str) -> Set[str]:
+        """
+        base_name dizini altındaki kayıtlı dosya yollarını (normalize edilmiş) tek sorguda döndürür.
+        """
+        paths = set()
+        for (file_path,) in db.session.connection().execute(select(cls.__table__.c.file_path)).all():
+            row_path = os.path.normpath(file_path).replace("\\", "/")
+            if row_path.startswith(base_name + "/"):
+                paths.add(row_path)
+        return paths
+
+    @classmethod
+    def registered_paths(cls, file_paths: Iterable[str]) -> Set[str]:
+        """
+        Verilen yollardan veritabanında kayıtlı olanları tek sorguda (parça parça IN) döndürür.
+        """
+        file_paths = list(file_paths)
+        found = set()
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            rows = db.session.connection().execute(
+                select(cls.__table__.c.file_path).where(cls.__table__.c.file_path.in_(file_paths[i:i + _IN_CHUNK]))
+            ).all()
+            found.update(file_path for (file_path,) in rows)
+        return found
+
     @classmethod
     def list_all(cls):
         return cls.query.order_by(cls.upload_date.desc()).all()
@@ -49,13 +91,26 @@ class ExcelFile(db.Model):
     
     @classmethod
     def delete_missing_files(cls, valid_paths: set, base_name: str) -> int:
+        table = cls.__table__
+        missing_ids = []
+        for row_id, file_path in db.session.connection().execute(select(table.c.id, table.c.file_path)).all():
+            row_path = os.path.normpath(file_path).replace("\\", "/")
+            if row_path.startswith(base_name + "/") and row_path not in valid_paths:
+                missing_ids.append(row_id)
+        for i in range(0, len(missing_ids), _IN_CHUNK):
+            db.session.execute(delete(table).where(table.c.id.in_(missing_ids[i:i + _IN_CHUNK])))
+        db.session.commit()
+        return len(missing_ids)
+
+    @classmethod
+    def delete_by_paths(cls, file_paths: Iterable[str]) -> int:
+        """
+        Diskten kaybolan dosyaların kayıtlarını siler. Dosyalara dokunmaz.
+        """
+        file_paths = list(file_paths)
         removed = 0
-        for row in cls.query.all():
-            row_path = os.path.normpath(row.file_path).replace("\\", "/")
-            if not row_path.startswith(base_name + "/"):
-                continue
-            if row_path not in valid_paths:
-                db.session.delete(row)
-                removed += 1
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            removed += cls.query.filter(cls.file_path.in_(file_paths[i:i + _IN_CHUNK])).delete(
+                synchronize_session=False)
         db.session.commit()
-        return removed
\ No newline at end of file
+        return removed
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+from sqlalchemy import delete, insert, select, update
+from codesys_doc_tracker import db
+
+# Tek sorguda IN (...) içine konacak azami değer sayısı (SQLite değişken sınırı için)
+_IN_CHUNK = 500
+
+
+class FileIndex(db.Model):
+    """
+    Export dizinlerindeki dosyaların son görülen boyut / mtime / içerik özeti.
+    Yeniden taramada yalnızca stat bilgisi değişen dosyalar okunur (özeti yeniden hesaplanır).
+    """
+    __tablename__ = "file_index"
+
+    KIND_XML = "xml"
+    KIND_EXCEL = "excel"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(16), nullable=False, index=True)
+    path = db.Column(db.String(500), unique=True, nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    mtime_ns = db.Column(db.BigInteger, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<FileIndex {self.path}>"
+
+    @classmethod
+    def load(cls, kind: str, base_name: str) -> Dict[str, Tuple[int, int, int, str]]:
+        """
+        Dizine ait tüm kayıtları tek sorguda okur: {path: (id, size, mtime_ns, content_hash)}
+        Dizin adındaki "_" / "%" karakterleri LIKE joker karakteri sayılmaz (autoescape).
+        ORM katmanı atlanır (Core sorgusu); 50 bin satırda da hızlıdır.
+        """
+        table = cls.__table__
+        rows = db.session.connection().execute(
+            select(table.c.path, table.c.id, table.c.size, table.c.mtime_ns, table.c.content_hash)
+            .where(table.c.kind == kind, table.c.path.startswith(base_name + "/", autoescape=True))
+        ).all()
+        return {path: (row_id, size, mtime_ns, content_hash)
+                for path, row_id, size, mtime_ns, content_hash in rows}
+
+    @classmethod
+    def load_paths(cls, kind: str, paths: Iterable[str]) -> Dict[str, Tuple[int, int, int, str]]:
+        """
+        load() ile aynı biçimde, yalnızca verilen yolların kayıtlarını döndürür.
+        """
+        table = cls.__table__
+        paths = list(paths)
+        found = {}
+        for i in range(0, len(paths), _IN_CHUNK):
+            rows = db.session.connection().execute(
+                select(table.c.path, table.c.id, table.c.size, table.c.mtime_ns, table.c.content_hash)
+                .where(table.c.kind == kind, table.c.path.in_(paths[i:i + _IN_CHUNK]))
+            ).all()
+            found.update((path, (row_id, size, mtime_ns, content_hash))
+                         for path, row_id, size, mtime_ns, content_hash in rows)
+        return found
+
+    @classmethod
+    def content_hashes(cls, kind: str) -> Set[str]:
+        """
+        Bu türdeki indekslenmiş dosyaların farklı içerik özetleri (türetilmiş önbelleklerin temizliği için).
+        """
+        table = cls.__table__
+        rows = db.session.connection().execute(
+            select(table.c.content_hash).where(table.c.kind == kind, table.c.content_hash.is_not(None)).distinct()
+        ).all()
+        return {content_hash for (content_hash,) in rows}
+
+    @classmethod
+    def apply_changes(cls, kind: str, added: List[dict], changed: List[dict], removed: Iterable[str]) -> None:
+        """
+        Taramada bulunan farkları toplu INSERT / UPDATE / DELETE ile yazar.
+        added: {path, size, mtime_ns, content_hash}, changed: aynı alanlar + id. Commit çağırana aittir.
+        """
+        now = datetime.utcnow()
+        if added:
+            db.session.execute(insert(cls), [dict(row, kind=kind, indexed_at=now) for row in added])
+        if changed:
+            db.session.execute(update(cls), [dict(row, indexed_at=now) for row in changed])
+        removed = list(removed)
+        for i in range(0, len(removed), _IN_CHUNK):
+            db.session.execute(delete(cls).where(cls.path.in_(removed[i:i + _IN_CHUNK])))
+
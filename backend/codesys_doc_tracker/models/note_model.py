@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+from sqlalchemy import delete, select
 from codesys_doc_tracker import db
 
 class Note(db.Model):
@@ -70,6 +71,22 @@ class Note(db.Model):
         db.session.commit()
         return True
 
+    @classmethod
+    def delete_for_diffs(cls, diff_ids) -> None:
+        """
+        Verilen diff'lere (id listesi veya alt sorgu) bağlı notları; ilişki, görünürlük ve bildirim
+        kayıtlarıyla birlikte tablo başına tek DELETE ile siler. Commit çağırana aittir.
+        """
+        from codesys_doc_tracker.models.relation_model import Relation
+        from codesys_doc_tracker.models.note_visibility_model import NoteVisibility
+        from codesys_doc_tracker.models.notification_model import Notification
+
+        notes = cls.__table__
+        note_ids = select(notes.c.id).where(notes.c.diff_id.in_(diff_ids))
+        for child in (Relation.__table__, NoteVisibility.__table__, Notification.__table__):
+            db.session.execute(delete(child).where(child.c.note_id.in_(note_ids)))
+        db.session.execute(delete(notes).where(notes.c.diff_id.in_(diff_ids)))
+
     def to_dict(self):
         # username güvenli erişim
         username = self.user.username if getattr(self, "user", None) else None
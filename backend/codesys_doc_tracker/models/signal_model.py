@@ -0,0 +1,213 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy import Index, delete, func, insert, select
+from codesys_doc_tracker import db
+
+# Tek sorguda IN (...) içine konacak azami değer sayısı (SQLite değişken sınırı için)
+_IN_CHUNK = 500
+
+
+class Signal(db.Model):
+    """
+    XML dosyasının ST bloğundaki SIGNAL tablosunun bir satırı. Dosya kaydedilirken (tarama/yükleme) bir kez
+    çıkarılır; filtreleme istekleri dosyayı okumak yerine bu tablodan indeksli sorgu ile cevaplanır.
+    """
+    __tablename__ = "signals"
+
+    id = db.Column(db.Integer, primary_key=True)
+    xmlfile_id = db.Column(db.Integer, db.ForeignKey("xmlfiles.id"), nullable=False)
+    # Dosyadaki sıra (çıktılar belgedeki sırayla döner)
+    position = db.Column(db.Integer, nullable=False)
+    # Satırdan önce görülen en son 'ID:' değeri (onaltılık)
+    block_id = db.Column(db.Text, nullable=False, default="")
+    name = db.Column(db.Text, nullable=False)
+    max_value = db.Column(db.Text, nullable=False, default="")
+    min_value = db.Column(db.Text, nullable=False, default="")
+    default_value = db.Column(db.Text, nullable=False, default="")
+    resolution = db.Column(db.Text, nullable=False, default="")
+    offset_value = db.Column(db.Text, nullable=False, default="")
+
+    __table_args__ = (
+        Index("ix_signals_file_name", "xmlfile_id", "name"),
+        # Dosyalar arası aramada sayım ve dosya gruplaması tablo satırlarına inmeden bu indeksten yapılır
+        Index("ix_signals_name_file", "name", "xmlfile_id"),
+    )
+
+    def __repr__(self):
+        return f"<Signal {self.name}>"
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        # /api/filters/filter_xml'in döndürdüğü biçim
+        return {
+            "ID": row.block_id,
+            "keyword": row.name,
+            "Max": row.max_value,
+            "Min": row.min_value,
+            "Def": row.default_value,
+            "Resolution": row.resolution,
+            "Offset": row.offset_value,
+        }
+
+    @classmethod
+    def replace_for_files(cls, rows_by_file: Dict[int, Sequence[Sequence[str]]]) -> int:
+        """
+        Verilen dosyaların sinyal satırlarını siler ve yenilerini tek toplu INSERT ile ekler.
+        Satırlar (ID, ad, Max, Min, Def, Resolution, Offset) demetleridir. Commit çağırana aittir.
+        """
+        cls.delete_for_files(list(rows_by_file))
+        values = [
+            {"xmlfile_id": file_id, "position": position, "block_id": block_id, "name": name,
+             "max_value": max_value, "min_value": min_value, "default_value": default,
+             "resolution": resolution, "offset_value": offset}
+            for file_id, rows in rows_by_file.items()
+            for position, (block_id, name, max_value, min_value, default, resolution, offset) in enumerate(rows)
+        ]
+        if values:
+            db.session.execute(insert(cls), values)
+            SignalName.ensure(row["name"] for row in values)
+        return len(values)
+
+    @classmethod
+    def delete_for_files(cls, file_ids: List[int]) -> None:
+        """
+        Dosyalara ait sinyal satırlarını siler. Commit çağırana aittir.
+        """
+        table = cls.__table__
+        for i in range(0, len(file_ids), _IN_CHUNK):
+            db.session.execute(delete(table).where(table.c.xmlfile_id.in_(file_ids[i:i + _IN_CHUNK])))
+
+    @classmethod
+    def search(cls, file_id: int, names: Iterable[str]) -> List[dict]:
+        """
+        Dosyada adı verilen adlardan biriyle birebir eşleşen sinyalleri belgedeki sırayla döndürür.
+        (xmlfile_id, name) indeksi kullanılır.
+        """
+        table = cls.__table__
+        names = sorted(set(names))
+        rows = []
+        for i in range(0, len(names), _IN_CHUNK):
+            rows.extend(db.session.connection().execute(
+                select(table).where(table.c.xmlfile_id == file_id, table.c.name.in_(names[i:i + _IN_CHUNK]))
+            ).all())
+        rows.sort(key=lambda row: row.position)
+        return [cls._row_to_dict(row) for row in rows]
+
+    @classmethod
+    def count_for_file(cls, file_id: int) -> int:
+        return db.session.execute(
+            select(func.count()).select_from(cls.__table__).where(cls.__table__.c.xmlfile_id == file_id)
+        ).scalar()
+
+    @classmethod
+    def search_all(cls, query: str, mode: str = "exact", limit: int = 50,
+                   offset: int = 0) -> Tuple[List[Tuple[int, List[dict]]], int, int]:
+        """
+        Sinyal adını tüm kayıtlı dosyalarda arar (büyük/küçük harf duyarsız). mode: exact | prefix | substring.
+        Ad eşleştirmesi küçük sözlük tablosunda (signal_names) yapılır, satırlar ix_signals_name ile okunur;
+        dosyalar tek tek taranmaz. Sayfalama dosya bazındadır.
+        Dönüş: ([(xmlfile_id, [eşleşen sinyaller])], toplam dosya, toplam eşleşme)
+        """
+        table = cls.__table__
+        name_match = table.c.name.in_(SignalName.matching(query, mode))
+        conn = db.session.connection()
+
+        # Dosya başına eşleşme sayıları tek geçişte (ix_signals_name_file üzerinden); dosya sayısı kadar satır döner
+        per_file = conn.execute(
+            select(table.c.xmlfile_id, func.count()).where(name_match)
+            .group_by(table.c.xmlfile_id).order_by(table.c.xmlfile_id)
+        ).all()
+        total_files, total_hits = len(per_file), sum(count for _, count in per_file)
+        offset = max(0, offset)
+        file_ids = [file_id for file_id, _ in per_file[offset:offset + max(1, min(limit, 500))]]
+        if not file_ids:
+            return [], total_files, total_hits
+
+        hits: Dict[int, List[dict]] = {file_id: [] for file_id in file_ids}
+        for row in conn.execute(
+            select(table).where(name_match, table.c.xmlfile_id.in_(file_ids))
+            .order_by(table.c.xmlfile_id, table.c.position)
+        ).all():
+            hits[row.xmlfile_id].append(cls._row_to_dict(row))
+        return list(hits.items()), total_files, total_hits
+
+    @classmethod
+    def history(cls, name: str) -> List[Tuple[int, str, object, dict]]:
+        """
+        Sinyalin geçtiği tüm dosyalardaki satırları, dosyaların yüklenme tarihine göre sıralı tek sorguda döndürür:
+        [(xmlfile_id, file_path, upload_date, sinyal)]. Satırlar ix_signals_name_file ile bulunur.
+        """
+        from codesys_doc_tracker.models.xmlfile_model import XMLFile
+
+        table, files = cls.__table__, XMLFile.__table__
+        rows = db.session.connection().execute(
+            select(table, files.c.file_path, files.c.upload_date)
+            .join(files, files.c.id == table.c.xmlfile_id)
+            .where(table.c.name == name)
+            .order_by(files.c.upload_date, files.c.id, table.c.position)
+        ).all()
+        return [(row.xmlfile_id, row.file_path, row.upload_date, cls._row_to_dict(row)) for row in rows]
+
+
+class SignalName(db.Model):
+    """
+    signals tablosunda geçen farklı sinyal adlarının sözlüğü. Dosyalar arası aramada önek/alt dizi eşleştirmesi
+    yüz binlerce sinyal satırı yerine bu küçük tabloda yapılır. Dosyası silinen adlar kalabilir;
+    signals tablosunda karşılığı olmadığından sonuç üretmezler.
+    """
+    __tablename__ = "signal_names"
+
+    SEARCH_MODES = ("exact", "prefix", "substring")
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.Text, unique=True, nullable=False)
+    name_lower = db.Column(db.Text, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<SignalName {self.name}>"
+
+    @classmethod
+    def ensure(cls, names: Iterable[str]) -> None:
+        """
+        Sözlükte olmayan adları ekler. Commit çağırana aittir.
+        """
+        table = cls.__table__
+        names = sorted(set(names))
+        for i in range(0, len(names), _IN_CHUNK):
+            chunk = names[i:i + _IN_CHUNK]
+            known = {name for (name,) in db.session.connection().execute(
+                select(table.c.name).where(table.c.name.in_(chunk))
+            ).all()}
+            missing = [{"name": name, "name_lower": name.lower()} for name in chunk if name not in known]
+            if missing:
+                db.session.execute(insert(cls), missing)
+
+    @classmethod
+    def backfill(cls) -> None:
+        """
+        Sözlük boşsa, ondan önce doldurulmuş signals satırlarının adlarını sözlüğe ekler.
+        """
+        if db.session.execute(select(cls.__table__.c.id).limit(1)).first() is not None:
+            return
+        names = [name for (name,) in db.session.connection().execute(
+            select(Signal.__table__.c.name).distinct()
+        ).all()]
+        cls.ensure(names)
+        db.session.commit()
+
+    @classmethod
+    def matching(cls, query: str, mode: str):
+        """
+        Aramaya uyan adların alt sorgusu. Eşleştirme farklı adlar üzerinde yapılır (sinyal satırları üzerinde değil);
+        bulunan adların satırları signals tablosundan ix_signals_name ile okunur.
+        """
+        table = cls.__table__
+        needle = query.strip().lower()
+        if mode == "exact":
+            condition = table.c.name_lower == needle
+        elif mode == "prefix":
+            condition = table.c.name_lower.startswith(needle, autoescape=True)
+        elif mode == "substring":
+            condition = table.c.name_lower.contains(needle, autoescape=True)
+        else:
+            raise ValueError(f"Geçersiz arama modu: {mode}")
+        return select(table.c.name).where(condition)
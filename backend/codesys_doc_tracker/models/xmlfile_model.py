@@ -1,7 +1,13 @@
 from datetime import datetime
 import os
-from sqlalchemy import or_
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, insert, or_, select, update
 from codesys_doc_tracker import db
+from services import document_cache
+from services.diff_report_store import remove_report
+
+# Tek sorguda IN (...) içine konacak azami değer sayısı (SQLite değişken sınırı için)
+_IN_CHUNK = 500
 
 
 class XMLFile(db.Model):
@@ -11,6 +17,10 @@ class XMLFile(db.Model):
     file_path = db.Column(db.String(500), unique=True, nullable=False)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    # İçeriğin sha256 özeti (dosya indeksinden kopyalanır); aynı içerikli yüklemeleri tanımak için
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    # Sinyal tablosunun (signals) çıkarıldığı içeriğin özeti; content_hash'ten farklıysa tablo eskimiştir
+    signals_hash = db.Column(db.String(64), nullable=True)
 
     def __repr__(self):
         return f'<XMLFile {os.path.basename(self.file_path)}>'
@@ -26,33 +36,120 @@ class XMLFile(db.Model):
     def get_by_path(cls, file_path: str):
         return cls.query.filter_by(file_path=file_path).first()
 
+    @classmethod
+    def get_by_paths(cls, file_paths: List[str]) -> List["XMLFile"]:
+        rows = []
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            rows.extend(cls.query.filter(cls.file_path.in_(file_paths[i:i + _IN_CHUNK])).all())
+        return rows
+
+    @classmethod
+    def get_by_content_hash(cls, content_hash: str):
+        """
+        Aynı içeriğe sahip, dosyası diskte duran ilk kaydı döndürür.
+        """
+        for row in cls.query.filter_by(content_hash=content_hash).order_by(cls.id).all():
+            if os.path.exists(os.path.normpath(row.file_path)):
+                return row
+        return None
+
+    @classmethod
+    def refresh_content_hashes(cls, changed_paths: Iterable[str] = ()) -> None:
+        """
+        Dosya indeksindeki özetleri content_hash sütununa tek UPDATE ile kopyalar:
+        özeti boş olan (yeni eklenen) kayıtlar ve içeriği değiştiği bilinen yollar için.
+        """
+        from codesys_doc_tracker.models.file_index_model import FileIndex
+
+        table, index = cls.__table__, FileIndex.__table__
+        indexed_hash = select(index.c.content_hash).where(
+            index.c.kind == FileIndex.KIND_XML, index.c.path == table.c.file_path
+        ).scalar_subquery()
+        changed_paths = list(changed_paths)
+        conditions = [table.c.content_hash.is_(None)]
+        conditions.extend(table.c.file_path.in_(changed_paths[i:i + _IN_CHUNK])
+                          for i in range(0, len(changed_paths), _IN_CHUNK))
+        db.session.execute(update(table).where(or_(*conditions)).values(content_hash=indexed_hash))
+        db.session.commit()
+
+    @classmethod
+    def signal_index_pending(cls, file_ids: Optional[List[int]] = None) -> List[Tuple[int, str, str]]:
+        """
+        Sinyal tablosu hiç çıkarılmamış veya içeriği o zamandan beri değişmiş kayıtlar:
+        [(id, file_path, content_hash)]. file_ids verilirse yalnızca bu kayıtlara bakılır.
+        """
+        table = cls.__table__
+        query = select(table.c.id, table.c.file_path, table.c.content_hash).where(
+            table.c.content_hash.is_not(None),
+            or_(table.c.signals_hash.is_(None), table.c.signals_hash != table.c.content_hash),
+        )
+        if file_ids is None:
+            return [tuple(row) for row in db.session.connection().execute(query.order_by(table.c.id)).all()]
+        pending = []
+        for i in range(0, len(file_ids), _IN_CHUNK):
+            pending.extend(tuple(row) for row in db.session.connection().execute(
+                query.where(table.c.id.in_(file_ids[i:i + _IN_CHUNK]))
+            ).all())
+        return pending
+
+    @classmethod
+    def mark_signals_indexed(cls, hashes: Dict[int, str]) -> None:
+        """
+        {id: content_hash} - sinyal tablosunun hangi içerikten çıkarıldığını kaydeder. Commit çağırana aittir.
+        """
+        if hashes:
+            db.session.execute(update(cls), [{"id": file_id, "signals_hash": content_hash}
+                                             for file_id, content_hash in hashes.items()])
+
+    @classmethod
+    def create_many(cls, file_paths: Iterable[str]) -> int:
+        """
+        Yeni dosya kayıtlarını tek bir toplu INSERT ile ekler.
+        """
+        rows = [{"file_path": path} for path in file_paths]
+        if rows:
+            db.session.execute(insert(cls), rows)
+        db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def paths_under(cls, base_name: str) -> Set[str]:
+        """
+        base_name dizini altındaki kayıtlı dosya yollarını (normalize edilmiş) tek sorguda döndürür.
+        """
+        paths = set()
+        for (file_path,) in db.session.connection().execute(select(cls.__table__.c.file_path)).all():
+            row_path = os.path.normpath(file_path).replace("\\", "/")
+            if row_path.startswith(base_name + "/"):
+                paths.add(row_path)
+        return paths
+
+    @classmethod
+    def registered_paths(cls, file_paths: Iterable[str]) -> Set[str]:
+        """
+        Verilen yollardan veritabanında kayıtlı olanları tek sorguda (parça parça IN) döndürür.
+        """
+        file_paths = list(file_paths)
+        found = set()
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            rows = db.session.connection().execute(
+                select(cls.__table__.c.file_path).where(cls.__table__.c.file_path.in_(file_paths[i:i + _IN_CHUNK]))
+            ).all()
+            found.update(file_path for (file_path,) in rows)
+        return found
+
     @classmethod
     def list_all(cls):
         return cls.query.order_by(cls.upload_date.desc()).all()
 
     @classmethod
     def delete_by_id_with_diffs(cls, file_id: int) -> bool:
-        from codesys_doc_tracker.models.diff_model import Diff
-        from codesys_doc_tracker.models.note_model import Note 
+        from codesys_doc_tracker.models.file_index_model import FileIndex
 
         row = cls.query.get(file_id)
         if not row:
             return False
 
-        # Find all diffs related to this xmlfile
-        diffs_to_delete = Diff.query.filter(or_(
-            Diff.xmlfile_old_id == row.id,
-            Diff.xmlfile_new_id == row.id
-        )).all()
-
-        # Delete associated notes first
-        for diff_to_delete in diffs_to_delete:
-            Note.query.filter_by(diff_id=diff_to_delete.id).delete(synchronize_session=False)
-
-        # Then delete the diff records
-        for diff_to_delete in diffs_to_delete:
-            db.session.delete(diff_to_delete)
-        
         # Dosyayı diskte sil
         try:
             abs_path = os.path.normpath(row.file_path)
@@ -61,36 +158,56 @@ class XMLFile(db.Model):
         except Exception as e:
             print(f"XML dosyası silinemedi: {row.file_path} - {e}")
 
-        db.session.delete(row)
-        db.session.commit()
+        FileIndex.apply_changes(FileIndex.KIND_XML, [], [], [row.file_path])
+        cls._delete_ids_with_diffs([row.id])
         return True
 
     @classmethod
     def delete_missing_files(cls, valid_paths: set, base_name: str) -> int:
+        table = cls.__table__
+        missing_ids = []
+        for row_id, file_path in db.session.connection().execute(select(table.c.id, table.c.file_path)).all():
+            row_path = os.path.normpath(file_path).replace("\\", "/")
+            if row_path.startswith(base_name + "/") and row_path not in valid_paths:
+                missing_ids.append(row_id)
+        return cls._delete_ids_with_diffs(missing_ids)
+
+    @classmethod
+    def delete_by_paths(cls, file_paths: Iterable[str]) -> int:
+        """
+        Diskten kaybolan dosyaların kayıtlarını (diff ve notlarıyla) siler. Dosyalara dokunmaz.
+        """
+        table = cls.__table__
+        file_paths = list(file_paths)
+        ids = []
+        for i in range(0, len(file_paths), _IN_CHUNK):
+            ids.extend(row_id for (row_id,) in db.session.connection().execute(
+                select(table.c.id).where(table.c.file_path.in_(file_paths[i:i + _IN_CHUNK]))
+            ).all())
+        return cls._delete_ids_with_diffs(ids)
+
+    @classmethod
+    def _delete_ids_with_diffs(cls, file_ids: List[int]) -> int:
+        """
+        Dosya kayıtlarını sinyal satırları ve bağlı diff, not, ilişki, görünürlük ve bildirimleriyle birlikte siler.
+        Her _IN_CHUNK dosya için sabit sayıda ifade çalışır (dosya veya diff sayısından bağımsız);
+        tek commit sonrası başka kaydın kullanmadığı diff rapor dosyaları diskten, dosyaların çözülmüş içerikleri belge önbelleğinden kaldırılır.
+        """
         from codesys_doc_tracker.models.diff_model import Diff
-        from codesys_doc_tracker.models.note_model import Note # Import Note model
-        
-        removed = 0
-        for row in cls.query.all():
-            row_path = os.path.normpath(row.file_path).replace("\\", "/")
-            if not row_path.startswith(base_name + "/"):
-                continue
-            if row_path not in valid_paths:
-                # Find all diffs related to this xmlfile
-                diffs_to_delete = Diff.query.filter(or_(
-                    Diff.xmlfile_old_id == row.id,
-                    Diff.xmlfile_new_id == row.id
-                )).all()
-
-                # Delete associated notes first
-                for diff_to_delete in diffs_to_delete:
-                    Note.query.filter_by(diff_id=diff_to_delete.id).delete(synchronize_session=False)
-
-                # Then delete the diff records
-                for diff_to_delete in diffs_to_delete:
-                    db.session.delete(diff_to_delete)
-
-                db.session.delete(row)
-                removed += 1
-        db.session.commit() # Commit once after all deletions
-        return removed
\ No newline at end of file
+        from codesys_doc_tracker.models.signal_model import Signal
+
+        if not file_ids:
+            return 0
+        table = cls.__table__
+        report_paths = []
+        for i in range(0, len(file_ids), _IN_CHUNK):
+            chunk = file_ids[i:i + _IN_CHUNK]
+            report_paths.extend(Diff.delete_for_files(chunk))
+            Signal.delete_for_files(chunk)
+            db.session.execute(delete(table).where(table.c.id.in_(chunk)))
+        db.session.commit()
+        document_cache.invalidate(file_ids)
+
+        for report_path in Diff.unreferenced_paths(report_paths):
+            remove_report(report_path)
+        return len(file_ids)
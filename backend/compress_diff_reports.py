@@ -0,0 +1,37 @@
+# backend/compress_diff_reports.py
+"""
+Mevcut düz metin diff raporlarını gzip olarak yeniden yazar ve kazanılan disk alanını raporlar.
+Kullanım (backend dizininden):
+    python compress_diff_reports.py
+"""
+
+# Uygulama ve DB
+try:
+    # app.py içinde "app = Flask(__name__)" varsa:
+    from app import app
+except ImportError:
+    # Eğer dosyayı wsgi.py olarak yeniden adlandırdıysan:
+    from wsgi import app
+
+from services.diff_service import DIFF_REPORTS_DIR, compress_existing_reports
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+def migrate() -> None:
+    with app.app_context():
+        result = compress_existing_reports()
+
+    if not result["files"]:
+        print(f"{DIFF_REPORTS_DIR} altında sıkıştırılacak düz metin rapor bulunamadı.")
+        return
+    print(f"{result['files']} rapor sıkıştırıldı.")
+    print(f"Önce : {_mb(result['bytes_before'])}")
+    print(f"Sonra: {_mb(result['bytes_after'])}")
+    print(f"Kazanç: {_mb(result['saved_bytes'])} (%{result['saved_percent']})")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,153 @@
+import os
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from codesys_doc_tracker import db
+from codesys_doc_tracker.models.diff_model import Diff
+from codesys_doc_tracker.models.note_model import Note
+from services.diff_report_store import INDEX_SUFFIX, is_sidecar, remove_report
+
+# Rapor dosyalarının toplam boyut sınırı (byte). 0 verilirse boyut tabanlı temizlik yapılmaz.
+DIFF_CACHE_MAX_BYTES = int(os.environ.get("DIFF_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_lock = threading.Lock()
+_hash_memo: Dict[str, Tuple[int, int, str]] = {}
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+# ---------- İçerik özeti ----------
+
+def file_sha256(path: str) -> str:
+    """
+    Dosyanın sha256 özetini döndürür. Boyut ve mtime değişmediği sürece özet bellekten verilir.
+    """
+    st = os.stat(path)
+    with _lock:
+        memo = _hash_memo.get(path)
+    if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+        return memo[2]
+
+    value = sha256_of_file(path)
+    remember_sha256(path, st.st_size, st.st_mtime_ns, value)
+    return value
+
+
+def sha256_of_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remember_sha256(path: str, size: int, mtime_ns: int, value: str) -> None:
+    """
+    Başka yerde hesaplanmış (ör. dosya indeksindeki) özeti belleğe alır; file_sha256 dosyayı yeniden okumaz.
+    """
+    with _lock:
+        _hash_memo[path] = (size, mtime_ns, value)
+
+
+def remember_sha256_many(entries: Dict[str, Tuple[int, int, str]]) -> None:
+    """
+    remember_sha256'nın toplu hali: {yol: (boyut, mtime_ns, özet)}
+    """
+    with _lock:
+        _hash_memo.update(entries)
+
+
+# ---------- Önbellek ----------
+
+def lookup(old_hash: str, new_hash: str, filter_version: str) -> Optional[Diff]:
+    """
+    Aynı içerik çifti için daha önce üretilmiş bir diff varsa döndürür ve isabet/ıska sayaçlarını günceller.
+    """
+    row = Diff.get_by_content_hashes(old_hash, new_hash, filter_version)
+    with _lock:
+        _stats["hits" if row else "misses"] += 1
+
+    if row:
+        # Boyut tabanlı temizlikte en son kullanılan raporlar en sona kalsın
+        try:
+            os.utime(row.diffReport_path, None)
+        except OSError:
+            pass
+    return row
+
+
+def _report_files(reports_dir: str):
+    """
+    (mtime_ns, boyut, yol) listesi. Sidecar indeks dosyaları ayrı rapor sayılmaz; boyutları raporuna eklenir.
+    """
+    reports = {}
+    sidecar_sizes = {}
+    with os.scandir(reports_dir) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+            if is_sidecar(entry.path):
+                sidecar_sizes[entry.path[:-len(INDEX_SUFFIX)]] = st.st_size
+            else:
+                reports[entry.path] = (st.st_mtime_ns, st.st_size)
+    return [(mtime, size + sidecar_sizes.get(path, 0), path) for path, (mtime, size) in reports.items()]
+
+
+def evict_reports(reports_dir: str, max_bytes: int = DIFF_CACHE_MAX_BYTES, keep: Optional[str] = None) -> int:
+    """
+    Rapor dizininin toplam boyutu max_bytes'ı aşarsa en uzun süredir kullanılmayan raporları siler.
+    Yalnızca rapor dosyaları silinir; diff kayıtları (geçmiş, istatistikler) korunur ve raporu silinmiş
+    kayıt bir sonraki aynı karşılaştırmada önbellek ıskası sayılıp yeniden üretilir.
+    Notu olan diff'lerin raporlarına dokunulmaz. Silinen rapor dosyası sayısını döndürür.
+    """
+    if max_bytes <= 0 or not os.path.isdir(reports_dir):
+        return 0
+
+    entries = _report_files(reports_dir)
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+
+    rows_by_path: Dict[str, list] = {}
+    for row in Diff.query.all():
+        rows_by_path.setdefault(os.path.normpath(row.diffReport_path), []).append(row)
+
+    keep_norm = os.path.normpath(keep) if keep else None
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        norm = os.path.normpath(path)
+        if norm == keep_norm:
+            continue
+
+        rows = rows_by_path.get(norm, [])
+        row_ids = [r.id for r in rows]
+        if row_ids and db.session.query(Note.id).filter(Note.diff_id.in_(row_ids)).first() is not None:
+            continue  # notlu raporlar korunur
+
+        if not remove_report(path):
+            continue
+
+        total -= size
+        evicted += 1
+
+    with _lock:
+        _stats["evictions"] += evicted
+    return evicted
+
+
+def get_cache_stats(reports_dir: str) -> Dict[str, int]:
+    """
+    İsabet/ıska/temizlik sayaçlarını ve rapor dizininin güncel boyutunu döndürür.
+    """
+    entries = _report_files(reports_dir) if os.path.isdir(reports_dir) else []
+    with _lock:
+        stats = dict(_stats)
+    stats["report_files"] = len(entries)
+    stats["report_bytes"] = sum(size for _, size, _ in entries)
+    stats["max_bytes"] = DIFF_CACHE_MAX_BYTES
+    return stats
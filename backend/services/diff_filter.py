@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Varsayılan gürültü kurallarının bulunduğu yapılandırma dosyası
+DEFAULT_RULES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "config", "diff_filter_rules.json"))
+RULES_PATH = os.environ.get("DIFF_FILTER_RULES_PATH", DEFAULT_RULES_PATH)
+
+# Desteklenen kural tipleri:
+#  - prefix   : satır bu metinle başlıyorsa atlanır
+#  - contains : satırın herhangi bir yerinde geçiyorsa atlanır
+#  - regex    : düzenli ifade satırın herhangi bir yerinde eşleşiyorsa atlanır
+RULE_KINDS = ("prefix", "contains", "regex")
+
+
+def load_config_rules(path: str = RULES_PATH) -> Dict:
+    """
+    Yapılandırma dosyasındaki versiyonlu kural setini okur: {"version": int, "rules": [...]}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config.setdefault("version", 1)
+    config.setdefault("rules", [])
+    return config
+
+
+def validate_rule(kind: str, pattern: str) -> None:
+    """
+    Kural tipini ve deseni doğrular; geçersizse ValueError fırlatır.
+    """
+    if kind not in RULE_KINDS:
+        raise ValueError(f"Geçersiz kural tipi: {kind}. Desteklenenler: {', '.join(RULE_KINDS)}")
+    if not pattern:
+        raise ValueError("Kural deseni boş olamaz.")
+    if kind == "regex":
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Geçersiz düzenli ifade: {e}")
+        # NoiseFilter düzenli ifadeleri (?:...) içine alıp tek bir alternatifte birleştirir; tek başına geçerli
+        # olup orada bozulan desenler burada reddedilir
+        try:
+            re.compile(f"(?:{pattern})")
+        except re.error:
+            raise ValueError("Satır içi genel bayraklar (ör. '(?i)') desteklenmez; "
+                             "kapsamlı biçimi kullanın (ör. '(?i:timestamp)').")
+        reference = _numbered_group_reference(pattern)
+        if reference:
+            raise ValueError(f"Numaralı grup başvuruları ('{reference}') desteklenmez; kurallar birleştirildiğinde "
+                             "grup numaraları kayar. Adlı grup kullanın (ör. '(?P<x>...)(?P=x)').")
+
+
+def _numbered_group_reference(pattern: str) -> Optional[str]:
+    """
+    Desendeki ilk numaralı grup başvurusu ('\\1' veya '(?(1)...)'); yoksa None.
+    """
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            following = pattern[i + 1:i + 2]
+            if following.isdigit() and following != "0":
+                return pattern[i:i + 2]
+            i += 2
+            continue
+        if pattern.startswith("(?(", i) and pattern[i + 3:i + 4].isdigit():
+            return pattern[i:i + 4]
+        i += 1
+    return None
+
+
+def rules_version(config_version, rules: Iterable[Dict]) -> str:
+    """
+    Kural setinin içeriğinden türetilen kısa versiyon dizgesi. Kurallar değişince diff önbelleği geçersizleşir.
+    """
+    canonical = json.dumps(
+        [[r["kind"], r["pattern"]] for r in rules],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+    return f"{config_version}-{digest}"
+
+
+class NoiseFilter:
+    """
+    Kural listesini tek bir eşleştiriciye derler.
+    Önek kuralları tek bir str.startswith(tuple) çağrısına, diğerleri tek bir birleşik düzenli ifadeye dönüşür;
+    böylece her diff satırı için Python döngüsünde kural kural dolaşılmaz.
+    """
+
+    def __init__(self, rules: Iterable[Dict], version: str = ""):
+        prefixes: List[str] = []
+        patterns: List[str] = []
+        for rule in rules:
+            kind, pattern = rule["kind"], rule["pattern"]
+            if kind == "prefix":
+                prefixes.append(pattern)
+            elif kind == "contains":
+                patterns.append(re.escape(pattern))
+            elif kind == "regex":
+                patterns.append(f"(?:{pattern})")
+
+        self.version = version
+        self._prefixes = tuple(prefixes)
+        self._search = re.compile("|".join(patterns)).search if patterns else None
+
+    def __call__(self, line: str) -> bool:
+        if self._prefixes and line.startswith(self._prefixes):
+            return True
+        return self._search is not None and self._search(line) is not None
+
+    def filter_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Gürültü olmayan satırları akış halinde üretir. Satır başına metot çağrısı yapılmadığı için
+        büyük diff'lerde __call__'dan belirgin şekilde hızlıdır.
+        """
+        prefixes = self._prefixes
+        search = self._search
+        if not prefixes:
+            if search is None:
+                yield from lines
+                return
+            for line in lines:
+                if not search(line):
+                    yield line
+            return
+        for line in lines:
+            if line.startswith(prefixes) or (search is not None and search(line)):
+                continue
+            yield line
@@ -0,0 +1,270 @@
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from flask import Flask, current_app
+
+from codesys_doc_tracker import db
+from codesys_doc_tracker.models.diff_job_model import DiffJob
+from codesys_doc_tracker.models.xmlfile_model import XMLFile
+from services.diff_service import DEFAULT_DIFF_MODE, DIFF_MODES, generate_and_save_filtered_diff
+
+# Diff işlerini çalıştıracak işlem sayısı (0 veya boş: çekirdek sayısı)
+DIFF_JOB_WORKERS = int(os.environ.get("DIFF_JOB_WORKERS", "0") or 0) or os.cpu_count() or 1
+
+# İlerlemenin veritabanına yazılma sıklığı (saniye); her satırda yazmak diff'i yavaşlatır
+_PROGRESS_INTERVAL = 0.5
+
+# Sunucu işlemi bitmemiş işlerinin updated_at'ini bu aralıkla (saniye) yeniler; bu sürenin katları kadar
+# yenilenmemiş iş, sahibi kapanmış/çökmüş sayılır ve başarısız olarak kapatılır
+DIFF_JOB_HEARTBEAT = float(os.environ.get("DIFF_JOB_HEARTBEAT", "30") or 30)
+DIFF_JOB_STALE_AFTER = float(os.environ.get("DIFF_JOB_STALE_AFTER", "0") or 0) or 4 * DIFF_JOB_HEARTBEAT
+STALE_JOB_MESSAGE = "Sunucu yeniden başlatıldı; iş tamamlanamadı."
+
+# Bu sunucu işleminin kimliği; oluşturduğu işler bununla etiketlenir (pid yeniden kullanılabilir, token ayırır)
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_heartbeat: Optional[threading.Thread] = None
+
+
+def _init_worker(app_config: dict) -> None:
+    """
+    Havuzdaki her işlem bir kez çalıştırır: ana uygulamanın veritabanı ayarlarıyla
+    hafif bir Flask uygulaması kurar ve uygulama bağlamını açık bırakır.
+    """
+    import codesys_doc_tracker.initialize_db  # noqa: F401  (tüm modellerin kaydı için)
+
+    app = Flask("diff_worker")
+    app.config.update(app_config)
+    db.init_app(app)
+    app.app_context().push()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Diff işlem havuzunu ilk kullanımda oluşturur. İşlemler 'spawn' ile başlatılır;
+    böylece ana işlemin açık veritabanı bağlantıları alt işlemlere kopyalanmaz.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            app_config = {k: v for k, v in current_app.config.items() if k.startswith("SQLALCHEMY_")}
+            _executor = ProcessPoolExecutor(
+                max_workers=DIFF_JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(app_config,),
+            )
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def _stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=DIFF_JOB_STALE_AFTER)
+
+
+def fail_stale_jobs(job_ids: Optional[List[str]] = None) -> int:
+    """
+    Sahibi olan sunucu işlemi kapandığı/çöktüğü için artık hiçbir işçinin tamamlamayacağı işleri kapatır.
+    Başka bir sunucu işleminin (ör. çok işlemli dağıtımda) hâlâ yürüttüğü işlere dokunulmaz.
+    """
+    return DiffJob.fail_stale(STALE_JOB_MESSAGE, _stale_before(), job_ids)
+
+
+def _heartbeat_loop(app: Flask) -> None:
+    while True:
+        time.sleep(DIFF_JOB_HEARTBEAT)
+        with app.app_context():
+            try:
+                DiffJob.touch_owned(PROCESS_OWNER)
+                fail_stale_jobs()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Diff işi kalp atışı yazılamadı: {e}")
+
+
+def _start_heartbeat(app: Flask) -> None:
+    """
+    İlk iş oluşturulurken bu işlem için kalp atışı iş parçacığını başlatır.
+    """
+    global _heartbeat
+    with _executor_lock:
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_heartbeat_loop, args=(app,), name="diff-job-heartbeat",
+                                          daemon=True)
+            _heartbeat.start()
+
+
+def _run_diff_job(job_id: str) -> None:
+    """
+    Havuz işleminde çalışır: işi 'running' yapar, diff'i üretir ve sonucu tabloya yazar.
+    """
+    job = DiffJob.get_by_id(job_id)
+    if job is None:
+        return
+    file1_id, file2_id, mode, project = job.file1_id, job.file2_id, job.mode, job.project
+    DiffJob.set_status(job_id, DiffJob.STATUS_RUNNING)
+
+    last_write = 0.0
+
+    def on_progress(lines_processed: int, percent: float) -> None:
+        nonlocal last_write
+        now = time.monotonic()
+        if percent < 100.0 and now - last_write < _PROGRESS_INTERVAL:
+            return
+        last_write = now
+        DiffJob.update_progress(job_id, lines_processed, percent)
+
+    try:
+        diff_row, summary, cached = generate_and_save_filtered_diff(
+            file1_id, file2_id, mode=mode, project=project, progress_callback=on_progress
+        )
+    except Exception as e:
+        db.session.rollback()
+        DiffJob.set_status(job_id, DiffJob.STATUS_FAILED, message=str(e))
+        return
+
+    DiffJob.set_status(job_id, DiffJob.STATUS_DONE, diff_id=diff_row.id, cached=cached,
+                       message=summary, percent=100.0)
+
+
+def _run_diff_chunk(job_ids: List[str]) -> None:
+    """
+    Havuz işleminde bir grup işi sırayla çalıştırır. Ardışık çiftler aynı işlemde kaldığı için
+    ortak dosyanın çözülmüş içeriği (satırlar / yaprak özetleri) bir sonraki çiftte yeniden kullanılır.
+    """
+    for job_id in job_ids:
+        _run_diff_job(job_id)
+
+
+def _on_jobs_finished(app: Flask, job_ids: List[str], future: Future) -> None:
+    """
+    Havuz işlemi çöker ya da iş iptal edilirse iş kayıtları 'queued'/'running' durumunda kalmasın.
+    """
+    if future.cancelled():
+        error = "İş iptal edildi."
+    else:
+        exc = future.exception()
+        if exc is None:
+            return
+        if isinstance(exc, BrokenProcessPool):
+            _reset_executor()
+        error = f"İş çalıştırılamadı: {exc}"
+
+    with app.app_context():
+        DiffJob.fail_unfinished(job_ids, error)
+
+
+def _submit(fn, arg) -> Future:
+    try:
+        return get_executor().submit(fn, arg)
+    except BrokenProcessPool:
+        _reset_executor()
+        return get_executor().submit(fn, arg)
+
+
+def _validate(pairs: List[Tuple[int, int]], mode: str) -> None:
+    if mode not in DIFF_MODES:
+        raise ValueError(f"Geçersiz diff modu: {mode}")
+    wanted = {file_id for pair in pairs for file_id in pair}
+    found = {row.id for row in XMLFile.query.filter(XMLFile.id.in_(wanted)).all()}
+    if wanted - found:
+        raise ValueError("Belirtilen dosyalardan biri veya ikisi bulunamadı.")
+
+
+def enqueue_diff_job(file1_id: int, file2_id: int, mode: str = DEFAULT_DIFF_MODE,
+                     project: Optional[str] = None) -> DiffJob:
+    """
+    Diff işini kaydeder ve işlem havuzuna gönderir; sonucu beklemeden iş kaydını döndürür.
+    """
+    _validate([(file1_id, file2_id)], mode)
+
+    job = DiffJob.create(file1_id, file2_id, mode, project, owner=PROCESS_OWNER)
+    app = current_app._get_current_object()
+    _start_heartbeat(app)
+
+    future = _submit(_run_diff_job, job.id)
+    future.add_done_callback(lambda f, job_ids=[job.id]: _on_jobs_finished(app, job_ids, f))
+    return job
+
+
+def series_to_pairs(file_ids: List[int]) -> List[Tuple[int, int]]:
+    """
+    Sıralı bir sürüm serisini ardışık çiftlere çevirir: [v1, v2, v3] -> [(v1, v2), (v2, v3)]
+    """
+    return list(zip(file_ids, file_ids[1:]))
+
+
+def _contiguous_chunks(items: list, n_chunks: int) -> List[list]:
+    size, extra = divmod(len(items), n_chunks)
+    chunks, start = [], 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def enqueue_diff_batch(pairs: List[Tuple[int, int]], mode: str = DEFAULT_DIFF_MODE,
+                       project: Optional[str] = None) -> Tuple[List[DiffJob], List[Future]]:
+    """
+    Her çift için bir iş kaydı oluşturur ve çiftleri verilen sırayı koruyarak havuzdaki işlem sayısı kadar
+    bitişik gruba böler. Böylece bir serideki v2 hem (v1, v2) hem (v2, v3) için aynı işlemde çözülür.
+    """
+    if not pairs:
+        raise ValueError("Karşılaştırılacak en az bir dosya çifti gerekli.")
+    _validate(pairs, mode)
+
+    jobs = DiffJob.create_many(pairs, mode, project, owner=PROCESS_OWNER)
+    app = current_app._get_current_object()
+    _start_heartbeat(app)
+
+    futures = []
+    job_ids = [job.id for job in jobs]
+    for chunk in _contiguous_chunks(job_ids, min(DIFF_JOB_WORKERS, len(job_ids))):
+        future = _submit(_run_diff_chunk, chunk)
+        future.add_done_callback(lambda f, chunk=chunk: _on_jobs_finished(app, chunk, f))
+        futures.append(future)
+    return jobs, futures
+
+
+def run_diff_batch(pairs: List[Tuple[int, int]], mode: str = DEFAULT_DIFF_MODE,
+                   project: Optional[str] = None) -> List[DiffJob]:
+    """
+    Toplu karşılaştırmayı havuzda çalıştırır ve tüm işler bitene kadar bekler.
+    İş kayıtlarını çiftlerin sırasıyla döndürür.
+    """
+    jobs, futures = enqueue_diff_batch(pairs, mode, project)
+    job_ids = [job.id for job in jobs]
+    wait(futures)
+    # done-callback'ler wait() döndükten sonra çalışabilir; çöken grupların işleri burada da kapatılır
+    errors = [f.exception() for f in futures if not f.cancelled() and f.exception() is not None]
+    if errors:
+        DiffJob.fail_unfinished(job_ids, f"İş çalıştırılamadı: {errors[0]}")
+    db.session.expire_all()
+    return DiffJob.get_by_ids(job_ids)
+
+
+def get_diff_job(job_id: str) -> Optional[DiffJob]:
+    """
+    İş kaydını veritabanından taze olarak okur (ilerleme alt işlemde güncellenir).
+    Sahibi kapanmış bitmemiş iş, sorgulandığında başarısız olarak kapatılır.
+    """
+    fail_stale_jobs([job_id])
+    db.session.expire_all()
+    return DiffJob.get_by_id(job_id)
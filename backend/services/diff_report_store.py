@@ -0,0 +1,294 @@
+import gzip
+import io
+import os
+import struct
+import zlib
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+# Her INDEX_STRIDE satırda bir, satırın rapor dosyasındaki byte konumu saklanır.
+# Sayfa okurken en yakın önceki konuma seek edilir ve en fazla INDEX_STRIDE - 1 satır atlanır.
+INDEX_STRIDE = 256
+
+INDEX_SUFFIX = ".idx"
+
+# Rapor sıkıştırma: "gzip" veya "none". Sıkıştırılmış raporlar diskte <rapor>.gz adıyla durur.
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+GZIP_SUFFIX = ".gz"
+REPORT_COMPRESSION = os.environ.get("DIFF_REPORT_COMPRESSION", COMPRESSION_GZIP)
+GZIP_LEVEL = int(os.environ.get("DIFF_REPORT_GZIP_LEVEL", "6"))
+
+# Sıkıştırılmış raporlarda her gzip üyesi (member) kaç satır içersin. Üyeler bağımsız açılabildiği için
+# sayfa okumada yalnızca ilgili üye çözülür; dosyanın tamamı yine geçerli tek bir gzip akışıdır.
+GZIP_MEMBER_LINES = 2048
+
+# Sidecar başlığı: sihirli değer, adım, toplam satır, raporun byte boyutu (eskimiş indeksi tanımak için)
+_INDEX_HEADER = struct.Struct("<4sIQQ")
+_INDEX_MAGIC = b"DRI1"
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def index_path(report_path: str) -> str:
+    return report_path + INDEX_SUFFIX
+
+
+def is_sidecar(path: str) -> bool:
+    return path.endswith(INDEX_SUFFIX)
+
+
+def is_compressed(report_path: str) -> bool:
+    return report_path.endswith(GZIP_SUFFIX)
+
+
+def storage_path(report_path: str, compression: str = REPORT_COMPRESSION) -> str:
+    """
+    Mantıksal rapor yolundan (…/X.txt) diskteki dosya yolunu üretir (sıkıştırmada …/X.txt.gz).
+    """
+    return report_path + GZIP_SUFFIX if compression == COMPRESSION_GZIP else report_path
+
+
+class _PlainSink:
+    def __init__(self, f):
+        self._f = f
+        self.pos = 0
+
+    def write(self, data: bytes) -> None:
+        self._f.write(data)
+        self.pos += len(data)
+
+    def mark(self) -> int:
+        return self.pos
+
+    def close(self) -> None:
+        pass
+
+
+class _GzipMemberSink:
+    """
+    Veriyi ardışık gzip üyeleri halinde yazar. mark() açık üyeyi kapatır; sonraki yazma yeni üye başlatır.
+    """
+
+    def __init__(self, f, level: int):
+        self._f = f
+        self._level = level
+        self._compressor = None
+        self.pos = 0
+
+    def write(self, data: bytes) -> None:
+        if self._compressor is None:
+            self._compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        out = self._compressor.compress(data)
+        if out:
+            self._f.write(out)
+            self.pos += len(out)
+
+    def mark(self) -> int:
+        if self._compressor is not None:
+            out = self._compressor.flush()
+            self._f.write(out)
+            self.pos += len(out)
+            self._compressor = None
+        return self.pos
+
+    def close(self) -> None:
+        self.mark()
+
+
+class ReportWriter:
+    """
+    Rapor dosyasını yazarken satır başlangıçlarının byte konumlarını toplar ve kapanışta
+    yanına satır-konum indeksini (<rapor>.idx) yazar. Dosyayı sonradan yeniden taramaya gerek kalmaz.
+    Yol .gz ile bitiyorsa rapor, her biri GZIP_MEMBER_LINES satırlık gzip üyeleri olarak yazılır
+    ve indeks bu üyelerin sıkıştırılmış dosyadaki başlangıçlarını tutar.
+    """
+
+    def __init__(self, report_path: str, stride: Optional[int] = None):
+        self.report_path = report_path
+        self.compressed = is_compressed(report_path)
+        self.stride = stride or (GZIP_MEMBER_LINES if self.compressed else INDEX_STRIDE)
+        self.lines = 0  # tamamlanmış ('\n' ile biten) satır sayısı
+        self.raw_bytes = 0  # sıkıştırılmamış içerik boyutu
+        self._last_byte = b""
+        self._offsets = array("Q", [0])
+        self._f = open(report_path, "wb")
+        self._sink = _GzipMemberSink(self._f, GZIP_LEVEL) if self.compressed else _PlainSink(self._f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(write_index=exc_type is None)
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        if not data:
+            return
+        newlines = data.count(b"\n")
+        cut = 0
+        if newlines and self.lines + newlines >= len(self._offsets) * self.stride:
+            line_no = self.lines
+            i = data.find(b"\n")
+            while i >= 0:
+                line_no += 1
+                if line_no % self.stride == 0:
+                    self._sink.write(data[cut:i + 1])
+                    self._offsets.append(self._sink.mark())
+                    cut = i + 1
+                i = data.find(b"\n", i + 1)
+        self.lines += newlines
+        if cut < len(data):
+            self._sink.write(data[cut:])
+        self.raw_bytes += len(data)
+        self._last_byte = data[-1:]
+
+    @property
+    def total_lines(self) -> int:
+        # Son satır '\n' ile bitmiyorsa o da bir satırdır
+        return self.lines + (1 if self._last_byte and self._last_byte != b"\n" else 0)
+
+    def close(self, write_index: bool = True) -> None:
+        if self._f.closed:
+            return
+        self._sink.close()
+        size = self._sink.pos
+        self._f.close()
+        if write_index:
+            _write_index(self.report_path, self.stride, self.total_lines, size, self._offsets)
+
+
+def _write_index(report_path: str, stride: int, total_lines: int, size: int, offsets: array) -> None:
+    tmp_path = index_path(report_path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stride, total_lines, size))
+        f.write(offsets.tobytes())
+    os.replace(tmp_path, index_path(report_path))
+
+
+def build_index(report_path: str, stride: int = INDEX_STRIDE) -> Tuple[int, int, array]:
+    """
+    İndeksi olmayan (eski) raporlar için dosyayı bir kez tarayıp sidecar indeksi oluşturur.
+    Sıkıştırılmış raporda üye sınırları bilinemediğinden yalnızca toplam satır sayısı kaydedilir;
+    sayfa okuma bu durumda dosya başından çözerek ilerler.
+    """
+    offsets = array("Q", [0])
+    lines = 0
+    last = b""
+    if is_compressed(report_path):
+        with gzip.open(report_path, "rb") as f:
+            for line in f:
+                lines += 1
+                last = line
+        lines -= 1 if last and not last.endswith(b"\n") else 0
+        stride = 0xFFFFFFFF
+    else:
+        with open(report_path, "rb") as f:
+            pos = 0
+            for line in f:
+                pos += len(line)
+                last = line
+                if line.endswith(b"\n"):
+                    lines += 1
+                    if lines % stride == 0:
+                        offsets.append(pos)
+    total_lines = lines + (1 if last and not last.endswith(b"\n") else 0)
+    _write_index(report_path, stride, total_lines, os.path.getsize(report_path), offsets)
+    return stride, total_lines, offsets
+
+
+def load_index(report_path: str) -> Tuple[int, int, array]:
+    """
+    (adım, toplam satır, konumlar) döndürür. Sidecar yoksa veya rapordan eskiyse yeniden oluşturur.
+    """
+    size = os.path.getsize(report_path)
+    try:
+        with open(index_path(report_path), "rb") as f:
+            magic, stride, total_lines, indexed_size = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+            if magic == _INDEX_MAGIC and indexed_size == size:
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+                return stride, total_lines, offsets
+    except (OSError, struct.error):
+        pass
+    return build_index(report_path)
+
+
+def read_report_lines(report_path: str, offset: int = 0, limit: int = 500) -> Tuple[List[str], int]:
+    """
+    Raporun [offset, offset + limit) satırlarını dosyada seek ederek okur.
+    Sıkıştırılmış raporda yalnızca ilgili gzip üyesinden itibaren çözme yapılır.
+    Dönüş: (satırlar - sonlarındaki '\\n' olmadan, toplam satır sayısı)
+    """
+    stride, total_lines, offsets = load_index(report_path)
+    if offset >= total_lines or limit <= 0:
+        return [], total_lines
+
+    mark = min(offset // stride, len(offsets) - 1)
+    skip = offset - mark * stride
+    lines: List[str] = []
+    with open(report_path, "rb") as raw:
+        raw.seek(offsets[mark])
+        f = gzip.GzipFile(fileobj=raw, mode="rb") if is_compressed(report_path) else raw
+        for _ in range(skip):
+            f.readline()
+        for _ in range(min(limit, total_lines - offset)):
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.rstrip(b"\r\n").decode("utf-8", errors="replace"))
+    return lines, total_lines
+
+
+def iter_report_bytes(report_path: str) -> Iterator[bytes]:
+    """
+    Raporun sıkıştırılmamış içeriğini parça parça üretir (gzip kabul etmeyen istemciler için).
+    """
+    opener = gzip.open if is_compressed(report_path) else open
+    with opener(report_path, "rb") as f:
+        while True:
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def open_report_text(report_path: str) -> io.TextIOBase:
+    """
+    Raporu (sıkıştırılmış olsun olmasın) metin olarak okumak için açar.
+    """
+    if is_compressed(report_path):
+        return gzip.open(report_path, "rt", encoding="utf-8")
+    return open(report_path, "r", encoding="utf-8")
+
+
+def compress_report(report_path: str) -> Tuple[str, int, int]:
+    """
+    Düz metin raporu gzip üyeleriyle yeniden yazar, düz dosyayı ve eski indeksini siler.
+    Değiştirilme zamanı korunur (boyut tabanlı temizlikte LRU sırası bozulmasın).
+    Dönüş: (yeni yol, eski boyut, yeni boyut)
+    """
+    new_path = storage_path(report_path, COMPRESSION_GZIP)
+    old_size = os.path.getsize(report_path)
+    st = os.stat(report_path)
+    with open(report_path, "r", encoding="utf-8", newline="") as src, ReportWriter(new_path) as out:
+        for line in src:
+            out.write(line)
+    os.utime(new_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    remove_report(report_path)
+    return new_path, old_size, os.path.getsize(new_path)
+
+
+def remove_report(report_path: str) -> bool:
+    """
+    Rapor dosyasını ve sidecar indeksini siler. Rapor silindiyse True döner.
+    """
+    try:
+        os.remove(index_path(report_path))
+    except OSError:
+        pass
+    try:
+        os.remove(report_path)
+    except OSError:
+        return False
+    return True
@@ -1,8 +1,30 @@
 import os
+import re
 import difflib
 import datetime
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import Callable, Optional
+from werkzeug.security import safe_join
+from codesys_doc_tracker import db
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
 from codesys_doc_tracker.models.diff_model import Diff  
+from codesys_doc_tracker.models.diff_filter_rule_model import DiffFilterRule
+from services import diff_cache, document_cache
+from services.diff_report_store import (
+    COMPRESSION_GZIP,
+    ReportWriter,
+    compress_report,
+    is_compressed,
+    is_sidecar,
+    open_report_text,
+    read_report_lines,
+    storage_path,
+)
+from services.diff_filter import NoiseFilter, load_config_rules, rules_version, validate_rule
+from services.diff_stats import DiffStatsCollector
+from services.diff_stream import DiffProgress, iter_streaming_diff
+from services.xml_structural_diff import LEAF_FORMAT_VERSION, iter_structural_diff
 
 # Configurable directory for saving diff reports
 DIFF_REPORTS_DIR = os.environ.get("DIFF_REPORTS_DIR", "DiffReports")
@@ -11,101 +33,445 @@ DIFF_REPORTS_DIR = os.environ.get("DIFF_REPORTS_DIR", "DiffReports")
 if not os.path.exists(DIFF_REPORTS_DIR):
     os.makedirs(DIFF_REPORTS_DIR)
 
-def generate_and_save_filtered_diff(file1_id: int, file2_id: int) -> tuple[str, str]:
+# Sayfalı rapor okumada varsayılan ve azami satır sayısı
+REPORT_PAGE_SIZE = 500
+REPORT_MAX_PAGE_SIZE = 5000
+
+# Diff modları:
+#  - classic   : iki dosyayı tamamen belleğe alıp difflib.unified_diff çalıştırır
+#  - streaming : dosyaları satır satır okur, filtrelenmiş blokları doğrudan rapor dosyasına yazar
+#  - structural: PLCopen belgelerini iterparse ile okur, POU/değişkenleri ada göre eşler,
+#                metin diff'ini yalnızca değişen yapraklarda (ST gövdesi vb.) çalıştırır
+DIFF_MODE_CLASSIC = "classic"
+DIFF_MODE_STREAMING = "streaming"
+DIFF_MODE_STRUCTURAL = "structural"
+DIFF_MODES = (DIFF_MODE_CLASSIC, DIFF_MODE_STREAMING, DIFF_MODE_STRUCTURAL)
+DEFAULT_DIFF_MODE = os.environ.get("DIFF_DEFAULT_MODE", DIFF_MODE_CLASSIC)
+
+# Derlenmiş gürültü filtreleri, kural seti versiyonuna göre saklanır
+_noise_filters: dict = {}
+
+# Sürüm serilerinde (v1→v2, v2→v3, ...) her dosya iki çiftte yer alır. Bir çiftin yeni tarafı için
+# çözülen içerik (klasik modda satır listesi, yapısal modda yaprak özetleri) belge önbelleğinde tutulur ve
+# bir sonraki çiftte eski taraf olarak yeniden kullanılır. Değişen dosya önbellekte eskimiş sayılır.
+
+def _read_lines(file_id: int, path: str) -> list:
+    return document_cache.get(file_id, path, document_cache.KIND_LINES,
+                              lambda: document_cache.read_text(file_id, path).splitlines(keepends=True))
+
+
+def _cache_version(mode: str, noise_filter: NoiseFilter) -> str:
+    if mode == DIFF_MODE_STRUCTURAL:
+        mode = f"{mode}.{LEAF_FORMAT_VERSION}"  # yaprak biçimi değişince eski yapısal raporlar kullanılmaz
+    return f"{mode}:{noise_filter.version}"
+
+
+def get_noise_filter(project: Optional[str] = None) -> NoiseFilter:
     """
-    Veritabanından iki XML dosyasını çeker, farkları oluşturur, gereksiz diff başlıklarını ve metadata'yı filtreleyerek kaydeder.
-    Ayrıca diff çıktısını veritabanına kaydeder.
+    Yapılandırma dosyasındaki varsayılan kurallar ile veritabanındaki (genel + projeye özel) kuralları
+    tek bir eşleştiriciye derler. Aynı kural seti için derleme yalnızca bir kez yapılır.
     """
-    file1 = XMLFile.query.get(file1_id)
-    file2 = XMLFile.query.get(file2_id)
+    config = load_config_rules()
+    rules = list(config["rules"]) + [r.to_dict() for r in DiffFilterRule.list_for_project(project)]
+    version = rules_version(config["version"], rules)
 
-    if not file1 or not file2:
-        raise ValueError("Belirtilen dosyalardan biri veya ikisi bulunamadı.")
+    noise_filter = _noise_filters.get(version)
+    if noise_filter is None:
+        noise_filter = NoiseFilter(rules, version)
+        _noise_filters[version] = noise_filter
+    return noise_filter
+
+
+def get_filter_rules(project: Optional[str] = None) -> dict:
+    """
+    Etkin kural setini (varsayılan + DB kuralları) ve versiyonunu döndürür.
+    """
+    config = load_config_rules()
+    db_rules = [r.to_dict() for r in DiffFilterRule.list_for_project(project)]
+    return {
+        "version": rules_version(config["version"], list(config["rules"]) + db_rules),
+        "config_version": config["version"],
+        "config_rules": config["rules"],
+        "project_rules": db_rules,
+    }
+
+
+def add_filter_rule(kind: str, pattern: str, project: Optional[str] = None,
+                    description: Optional[str] = None) -> DiffFilterRule:
+    """
+    Yeni bir gürültü kuralı ekler. Geçersiz tip/desen için ValueError fırlatır.
+    """
+    validate_rule(kind, pattern)
+    # Kural, uygulanacağı her kural setiyle birlikte tek eşleştiriciye derlenebilmeli (ör. aynı adlı gruplar
+    # çakışmamalı); aksi halde o projelerdeki her karşılaştırma hata verirdi. Genel kural tüm projelere eklenir.
+    project = (project or "").strip() or None
+    config_rules = list(load_config_rules()["rules"])
+    new_rule = {"kind": kind, "pattern": pattern}
+    for target in ([project] if project else [None] + DiffFilterRule.list_projects()):
+        rules = config_rules + [r.to_dict() for r in DiffFilterRule.list_for_project(target)] + [new_rule]
+        try:
+            NoiseFilter(rules)
+        except re.error as e:
+            raise ValueError(f"Kural mevcut kurallarla birlikte derlenemiyor: {e}")
+    return DiffFilterRule.create(kind=kind, pattern=pattern, project=project, description=description)
+
+
+def _write_filtered_lines(lines, report_path: str, noise_filter: NoiseFilter,
+                          stats: Optional[DiffStatsCollector] = None) -> int:
+    """
+    Diff satırlarını gürültü filtresinden geçirerek doğrudan rapor dosyasına yazar.
+    Boş olmayan yazılmış satır sayısını döndürür.
+    """
+    if stats:
+        lines = stats.observe(lines)
+    written = 0
+    with ReportWriter(report_path) as out:
+        for line in noise_filter.filter_lines(lines):
+            out.write(line)
+            if line.strip():
+                written += 1
+    return written
 
+
+def _write_streaming_diff(old_path: str, new_path: str, report_path: str, noise_filter: NoiseFilter,
+                          progress: Optional[DiffProgress] = None,
+                          stats: Optional[DiffStatsCollector] = None) -> int:
+    """
+    İki dosyayı akış halinde karşılaştırır ve filtrelenmiş satırları doğrudan rapor dosyasına yazar.
+    Yazılan satır sayısını döndürür; bellek kullanımı dosya boyutuna değil, değişiklik bloğu boyutuna bağlıdır.
+    """
+    with open(old_path, 'r', encoding='utf-8') as old_f, \
+            open(new_path, 'r', encoding='utf-8') as new_f:
+        old_lines, new_lines = old_f, new_f
+        if progress:
+            old_lines, new_lines = progress.lines_of(old_lines), progress.lines_of(new_lines)
+        on_hunk = None
+        if stats:
+            old_lines, new_lines = stats.old_pous.track(old_lines), stats.new_pous.track(new_lines)
+            on_hunk = stats.on_hunk
+        lines = iter_streaming_diff(old_lines, new_lines, on_hunk=on_hunk)
+        return _write_filtered_lines(lines, report_path, noise_filter, stats)
+
+
+def _write_structural_diff(old_file: XMLFile, new_file: XMLFile, report_path: str, noise_filter: NoiseFilter,
+                           progress: Optional[DiffProgress] = None,
+                           stats: Optional[DiffStatsCollector] = None) -> int:
+    """
+    İki PLCopen belgesini yapısal olarak karşılaştırır; her değişen yaprak için yolunu ve satır farklarını yazar.
+    """
+    def source(path):
+        # Eski belge iki kez okunduğu için her geçişte yeniden açılır; ilerleme için okunan byte'lar sayılır
+        if not progress:
+            return path
+        return lambda: progress.reader(open(path, 'rb'))
+
+    old_path, new_path = old_file.file_path, new_file.file_path
+    old_digests = document_cache.peek(old_file.id, old_path, document_cache.KIND_LEAVES)
+    # Yeni belgenin özetleri zaten biliniyorsa tekrar toplanmaz
+    collected = {} if document_cache.peek(new_file.id, new_path, document_cache.KIND_LEAVES) is None else None
+
+    try:
+        lines = iter_structural_diff(source(old_path), source(new_path),
+                                     old_digests=old_digests, new_digests=collected)
+        written = _write_filtered_lines(lines, report_path, noise_filter, stats)
+    except ET.ParseError as e:
+        raise ValueError(f"XML dosyası ayrıştırılamadı: {e}")
+
+    if collected is not None:
+        document_cache.put(new_file.id, new_path, document_cache.KIND_LEAVES, collected)
+    return written
+
+
+def _write_classic_diff(old_file: XMLFile, new_file: XMLFile, file1_name: str, file2_name: str, report_path: str,
+                        noise_filter: NoiseFilter, progress: Optional[DiffProgress] = None,
+                        stats: Optional[DiffStatsCollector] = None) -> bool:
+    """
+    İki dosyayı tamamen belleğe alıp difflib.unified_diff ile karşılaştırır ve filtrelenmiş raporu yazar.
+    Rapor boş değilse True döner.
+    """
     try:
-        with open(file1.file_path, 'r', encoding='utf-8') as f:
-            text1 = f.read()
-        with open(file2.file_path, 'r', encoding='utf-8') as f:
-            text2 = f.read()
+        lines1 = _read_lines(old_file.id, old_file.file_path)
+        lines2 = _read_lines(new_file.id, new_file.file_path)
     except Exception as e:
         raise Exception(f"Dosya okunurken hata oluştu: {e}")
 
-    file1_name = os.path.basename(file1.file_path)
-    file2_name = os.path.basename(file2.file_path)
+    if progress:
+        # Klasik modda ara ilerleme yoktur; okuma tamamlandığında dosyaların tamamı işlenmiş sayılır
+        progress.add(sum(map(len, lines1)) + sum(map(len, lines2)), len(lines1) + len(lines2))
 
     diff_lines = difflib.unified_diff(
-        text1.splitlines(keepends=True),
-        text2.splitlines(keepends=True),
+        lines1,
+        lines2,
         fromfile=f"OLD: {file1_name}",
         tofile=f"NEW: {file2_name}",
         lineterm=''
     )
+    if stats:
+        # POU sınırları bellekteki satır listelerinden çıkarılır; konumlar @@ başlıklarından okunur
+        deque(stats.old_pous.track(lines1), maxlen=0)
+        deque(stats.new_pous.track(lines2), maxlen=0)
+        diff_lines = stats.observe(diff_lines)
 
- 
-    filtered_lines = []
-    for line in diff_lines:
-        stripped = line.strip()
-    
-        if line.startswith('--- OLD') or line.startswith('+++ NEW'):
-            continue  # diff başlıklarını atla
-        if line.startswith('@@'):
-            continue  # @@ -1,7 +1,7 @@ gibi konum bilgilerini atla
-
-        # XML başlangıç ve özel içerikler
-        if stripped.startswith('<?xml') or '<?xml' in line:
-            continue  # XML bildirimi
-        if stripped.startswith('<project xmlns=') or '<project xmlns=' in line:
-            continue
-        if stripped.startswith('<fileHeader') or '<fileHeader' in line:
-            continue  # fileHeader'ı atla
-        if stripped.startswith('<contentHeader') or '<contentHeader' in line:
-            continue  # contentHeader'ı atla
-        if stripped.startswith('<coordinateInfo>') or '<coordinateInfo>' in line:
-            continue
-        if stripped.startswith('<fbd>') or '<fbd>' in line:
-            continue
-        if stripped.startswith('<scaling') or '<scaling' in line:
-            continue
+    text_diff = ''.join(noise_filter.filter_lines(diff_lines))
+
+    with ReportWriter(report_path) as out:
+        out.write(text_diff)
+
+    return bool(text_diff.strip())
+
+
+def generate_and_save_filtered_diff(file1_id: int, file2_id: int, mode: str = DEFAULT_DIFF_MODE,
+                                    project: Optional[str] = None,
+                                    progress_callback: Optional[Callable[[int, float], None]] = None
+                                    ) -> tuple[Diff, str, bool]:
+    """
+    Veritabanından iki XML dosyasını çeker, farkları oluşturur, gereksiz diff başlıklarını ve metadata'yı filtreleyerek kaydeder.
+    Ayrıca diff çıktısını veritabanına kaydeder.
+    mode="streaming" ile dosyalar belleğe alınmadan satır satır karşılaştırılır,
+    mode="structural" ile POU/değişken düzeyinde yapısal karşılaştırma yapılır.
+    project verilirse o projeye özel gürültü kuralları da uygulanır.
+    progress_callback verilirse (işlenen satır, yüzde) ile periyodik olarak çağrılır.
+    Aynı içerik çifti daha önce karşılaştırıldıysa rapor yeniden üretilmez; bu dosya çiftinin Diff kaydı
+    (yoksa mevcut rapora bağlı yeni bir kayıt) döndürülür.
+    Dönüş: (diff kaydı, özet mesajı, önbellekten mi geldi)
+    """
+    if mode not in DIFF_MODES:
+        raise ValueError(f"Geçersiz diff modu: {mode}")
 
-        filtered_lines.append(line)
+    file1 = XMLFile.query.get(file1_id)
+    file2 = XMLFile.query.get(file2_id)
+
+    if not file1 or not file2:
+        raise ValueError("Belirtilen dosyalardan biri veya ikisi bulunamadı.")
+
+    file1_name = os.path.basename(file1.file_path)
+    file2_name = os.path.basename(file2.file_path)
+
+    try:
+        old_hash = diff_cache.file_sha256(file1.file_path)
+        new_hash = diff_cache.file_sha256(file2.file_path)
+    except OSError as e:
+        raise Exception(f"Dosya okunurken hata oluştu: {e}")
+    noise_filter = get_noise_filter(project)
+    version = _cache_version(mode, noise_filter)
 
-    text_diff = ''.join(filtered_lines)
+    # Önbellek anahtarı içeriktir, kayıt ise dosya çiftine aittir: başka bir çiftin raporu paylaşılabilir,
+    # ama döndürülen (ve gerekirse raporu yenilenen) kayıt her zaman bu çiftin kaydıdır
+    own = Diff.get_for_files(file1_id, file2_id, old_hash, new_hash, version)
+    cached = diff_cache.lookup(old_hash, new_hash, version)
+    if cached:
+        try:
+            has_changes = os.path.getsize(cached.diffReport_path) > 0
+        except OSError:
+            pass  # rapor bu arada silindi (temizlik ya da elle): önbellek ıskası gibi yeniden üretilir
+        else:
+            if own is None:
+                own = Diff.create(
+                    old_id=file1_id,
+                    new_id=file2_id,
+                    diff_name=cached.diffReport_name,
+                    diff_path=cached.diffReport_path,
+                    old_hash=old_hash,
+                    new_hash=new_hash,
+                    filter_version=version,
+                    stats=cached.stats_dict()
+                )
+            elif own.diffReport_path != cached.diffReport_path and not os.path.exists(own.diffReport_path):
+                own.replace_report(cached.diffReport_name, cached.diffReport_path, cached.stats_dict())
+            return own, _summary(file1_name, file2_name, has_changes), True
 
     # Dosya adı karşılaştırılan XML adlarını içersin
     timestamp = datetime.datetime.now().strftime("%Y%m%d")
-    diff_filename = f"{file1_name}_VS_{file2_name}_{timestamp}.txt"
-    file_path = os.path.join(DIFF_REPORTS_DIR, diff_filename)
+    file_path, diff_filename = _unique_report_path(f"{file1_name}_VS_{file2_name}_{timestamp}.txt")
+
+    progress = None
+    if progress_callback:
+        total_bytes = os.path.getsize(file1.file_path) + os.path.getsize(file2.file_path)
+        if mode == DIFF_MODE_STRUCTURAL and \
+                document_cache.peek(file1.id, file1.file_path, document_cache.KIND_LEAVES) is None:
+            total_bytes += os.path.getsize(file1.file_path)  # eski belge ikinci kez okunur
+        progress = DiffProgress(progress_callback, total_bytes)
+
+    stats = DiffStatsCollector(noise_filter)
+    if mode in (DIFF_MODE_STREAMING, DIFF_MODE_STRUCTURAL):
+        try:
+            if mode == DIFF_MODE_STREAMING:
+                written = _write_streaming_diff(file1.file_path, file2.file_path, file_path, noise_filter,
+                                                progress, stats)
+            else:
+                written = _write_structural_diff(file1, file2, file_path, noise_filter, progress, stats)
+            has_changes = written > 0
+        except OSError as e:
+            raise Exception(f"Dosya okunurken hata oluştu: {e}")
+    else:
+        has_changes = _write_classic_diff(file1, file2, file1_name, file2_name, file_path,
+                                          noise_filter, progress, stats)
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(text_diff)
+    if progress:
+        progress.finish()
 
     # Diff çıktısını veritabanına kaydet
-    Diff.create(
-        old_id=file1_id,
-        new_id=file2_id,
-        diff_name=diff_filename,
-        diff_path=file_path
-    )
+    if own is not None:
+        # Raporu silinmiş kayıt için yeni kayıt açılmaz; yeniden üretilen rapor o kayda bağlanır
+        own.replace_report(diff_filename, file_path, stats.result())
+        diff_row = own
+    else:
+        diff_row = Diff.create(
+            old_id=file1_id,
+            new_id=file2_id,
+            diff_name=diff_filename,
+            diff_path=file_path,
+            old_hash=old_hash,
+            new_hash=new_hash,
+            filter_version=version,
+            stats=stats.result()
+        )
+
+    # Rapor dizini boyut sınırını aştıysa en eski raporları temizle (yeni rapor korunur)
+    diff_cache.evict_reports(DIFF_REPORTS_DIR, keep=file_path)
+
+    return diff_row, _summary(file1_name, file2_name, has_changes), False
+
+
+def _unique_report_path(file_name: str) -> tuple[str, str]:
+    """
+    Aynı gün aynı dosyalar farklı içerik/modla karşılaştırıldığında önbellekteki raporun
+    üzerine yazılmaması için rapor adının sonuna sayı ekler.
+    Dönüş: (diskteki yol - sıkıştırmada .gz uzantılı, API'de kullanılan rapor adı)
+    """
+    base, ext = os.path.splitext(file_name)
+    final = file_name
+    i = 1
+    while _report_exists(final):
+        final = f"{base}({i}){ext}"
+        i += 1
+    return storage_path(os.path.join(DIFF_REPORTS_DIR, final)), final
+
 
+def _report_exists(file_name: str) -> bool:
+    abs_path = os.path.join(DIFF_REPORTS_DIR, file_name)
+    if os.path.exists(abs_path) or os.path.exists(storage_path(abs_path, COMPRESSION_GZIP)):
+        return True
+    # Raporu temizlenmiş kaydın adı da dolu sayılır; yeniden üretilince başka bir raporun yerine geçmesin
+    return Diff.get_by_report_name(file_name) is not None
+
+
+def _summary(file1_name: str, file2_name: str, has_changes: bool) -> str:
     # Summary mesajı — eğer boşsa dosyalar aynı demektir
-    if not text_diff.strip():
-        summary = f"{file1_name} ile {file2_name} tamamen aynı görünüyor. Farklılık bulunamadı :("
-    else:
-        summary = f"{file1_name} ile {file2_name} arasındaki metin farkı başarıyla oluşturuldu :)"
+    if not has_changes:
+        return f"{file1_name} ile {file2_name} tamamen aynı görünüyor. Farklılık bulunamadı :("
+    return f"{file1_name} ile {file2_name} arasındaki metin farkı başarıyla oluşturuldu :)"
+
+
+def get_diff_cache_stats() -> dict:
+    """
+    Diff önbelleğinin isabet/ıska sayaçlarını ve rapor dizini boyutunu döndürür.
+    """
+    return diff_cache.get_cache_stats(DIFF_REPORTS_DIR)
 
 
-    return diff_filename, summary
+def get_diff_report_path(filename: str) -> str:
+    """
+    Rapor adını DIFF_REPORTS_DIR altındaki mutlak yola çevirir; dizin dışına çıkan adları reddeder.
+    Rapor sıkıştırılmış saklanıyorsa .gz uzantılı dosyanın yolu döner.
+    """
+    file_path = safe_join(os.path.abspath(DIFF_REPORTS_DIR), filename)
+    if file_path is None or is_sidecar(file_path):
+        raise FileNotFoundError(f"Diff rapor dosyası bulunamadı: {filename}")
+    for candidate in (file_path, storage_path(file_path, COMPRESSION_GZIP)):
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"Diff rapor dosyası bulunamadı: {filename}")
+
+
+def restore_evicted_report(filename: str) -> Optional[str]:
+    """
+    Önbellek temizliğinde raporu silinmiş bir diff'in raporunu, kaydın önbellek anahtarından (mod ve
+    filtre versiyonu) yeniden üretir ve yeni rapor adını döndürür.
+    Bu adla kayıt yoksa FileNotFoundError fırlatılır; dosyalar ya da filtre kuralları o zamandan beri
+    değiştiği için aynı rapor üretilemiyorsa None döner.
+    """
+    diff = Diff.get_by_report_name(filename)
+    if diff is None:
+        raise FileNotFoundError(f"Diff rapor dosyası bulunamadı: {filename}")
+    if not diff.is_regenerable():
+        return None
 
+    mode = diff.filter_version.split(":", 1)[0].split(".", 1)[0]
+    file1, file2 = diff.old_file, diff.new_file
+    try:
+        hashes_match = mode in DIFF_MODES and \
+            diff_cache.file_sha256(file1.file_path) == diff.old_content_hash and \
+            diff_cache.file_sha256(file2.file_path) == diff.new_content_hash
+    except OSError:
+        hashes_match = False
+    if hashes_match:
+        for project in [None] + DiffFilterRule.list_projects():
+            if _cache_version(mode, get_noise_filter(project)) == diff.filter_version:
+                diff_row, _, _ = generate_and_save_filtered_diff(file1.id, file2.id, mode=mode, project=project)
+                return diff_row.diffReport_name
+    return None
 
 
 def get_diff_report_html_content(filename: str) -> str:
     """
     Belirtilen diff rapor dosyasının içeriğini okur ve döndürür.
     """
-    file_path = os.path.join(DIFF_REPORTS_DIR, filename)
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Diff rapor dosyası bulunamadı: {file_path}")
+    file_path = get_diff_report_path(filename)
 
-    with open(file_path, "r", encoding="utf-8") as f:
+    with open_report_text(file_path) as f:
         content = f.read()
     return content
+
+
+def get_diff_report_page(filename: str, offset: int = 0, limit: int = REPORT_PAGE_SIZE) -> dict:
+    """
+    Raporun yalnızca istenen satır aralığını, satır-konum indeksi üzerinden seek ederek okur.
+    """
+    offset = max(offset, 0)
+    limit = max(1, min(limit, REPORT_MAX_PAGE_SIZE))
+    lines, total_lines = read_report_lines(get_diff_report_path(filename), offset, limit)
+    next_offset = offset + len(lines)
+    return {
+        "file_name": filename,
+        "offset": offset,
+        "limit": limit,
+        "total_lines": total_lines,
+        "next_offset": next_offset if next_offset < total_lines else None,
+        "lines": lines,
+    }
+
+
+def compress_existing_reports() -> dict:
+    """
+    DIFF_REPORTS_DIR altındaki düz metin raporları gzip üyeleriyle yeniden yazar ve
+    Diff kayıtlarının rapor yollarını günceller. Rapor adları (API'deki dosya adları) değişmez.
+    Dönüş: {"files": N, "bytes_before": X, "bytes_after": Y, "saved_bytes": X - Y, "saved_percent": ...}
+    """
+    rows_by_path: dict = {}
+    for row in Diff.query.all():
+        rows_by_path.setdefault(os.path.normpath(row.diffReport_path), []).append(row)
+
+    files = bytes_before = bytes_after = 0
+    with os.scandir(DIFF_REPORTS_DIR) as it:
+        paths = sorted(e.path for e in it if e.is_file())
+    for path in paths:
+        if is_sidecar(path) or is_compressed(path) or path.endswith(".tmp"):
+            continue
+        new_path, old_size, new_size = compress_report(path)
+        for row in rows_by_path.get(os.path.normpath(path), []):
+            row.diffReport_path = new_path
+        db.session.commit()  # her dosyadan sonra; yarıda kesilirse DB ile disk tutarlı kalır
+
+        files += 1
+        bytes_before += old_size
+        bytes_after += new_size
+
+    saved = bytes_before - bytes_after
+    return {
+        "files": files,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "saved_bytes": saved,
+        "saved_percent": round(100.0 * saved / bytes_before, 1) if bytes_before else 0.0,
+    }
@@ -0,0 +1,155 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from services.diff_filter import NoiseFilter
+
+# Kaynak XML'de POU sınırları
+_POU_OPEN_RE = re.compile(r'<pou\s+name="([^"]+)"')
+_POU_CLOSE = "</pou>"
+
+# Yapısal diff başlığındaki yol: ' ### project/types/pous/pou[P_IOVD_A]/body/ST/xhtml'
+_STRUCTURAL_HEADER = " ### "
+_STRUCTURAL_POU_RE = re.compile(r"(?:^|/)pou\[([^\]]+)\]")
+
+# Klasik diff hunk başlığı: '@@ -12,7 +12,8 @@'
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# ST içindeki sinyal tanımları (ham XML'de '->' kaçışlı olarak '-&gt;' görünür)
+_SIGNAL_RE = re.compile(r"//-*\s*SIGNAL\s*-(?:>|&gt;)\s*([^\s<&]+)")
+
+
+class PouTracker:
+    """
+    Kaynak satırlarını geçirirken POU açılış/kapanış satırlarının numaralarını kaydeder;
+    böylece diff'teki bir satır numarasının hangi POU'ya ait olduğu sonradan bulunabilir.
+    Satırlar bir kez okunur, ayrıca bir ön tarama gerekmez.
+    """
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._names: List[Optional[str]] = []
+
+    def track(self, lines: Iterable[str]) -> Iterator[str]:
+        for line_no, line in enumerate(lines):
+            if "<pou" in line:
+                match = _POU_OPEN_RE.search(line)
+                if match:
+                    self._starts.append(line_no)
+                    self._names.append(match.group(1))
+            elif _POU_CLOSE in line:
+                self._starts.append(line_no + 1)
+                self._names.append(None)
+            yield line
+
+    def pou_at(self, line_no: int) -> Optional[str]:
+        i = bisect_right(self._starts, line_no)
+        return self._names[i - 1] if i else None
+
+
+class DiffStatsCollector:
+    """
+    Rapora yazılan diff satırlarını akış halinde gözlemleyerek eklenen/silinen/değişen satır sayılarını,
+    POU başına değişiklik sayılarını ve değişen sinyal listesini çıkarır. Rapor dosyası tekrar okunmaz.
+
+    Bir -/+ bloğundaki eşleşen satırlar "değişen", fazlası "eklenen" veya "silinen" sayılır.
+    Gürültü filtresinin eleyeceği satırlar sayıma katılmaz.
+    """
+
+    def __init__(self, noise_filter: NoiseFilter):
+        self._is_noise = noise_filter
+        # Satır tabanlı modlarda kaynak dosyalar bu izleyicilerden geçirilir (yapısal modda başlıklar yeterli)
+        self.old_pous = PouTracker()
+        self.new_pous = PouTracker()
+        self._old_no = 0
+        self._new_no = 0
+        self._in_hunk = False
+        self._section_pou: Optional[str] = None
+        self._run_removed = 0
+        self._run_added = 0
+        self.added_lines = 0
+        self.removed_lines = 0
+        self.changed_lines = 0
+        self.pou_changes: Dict[str, int] = {}
+        self.changed_signals = set()
+
+    def on_hunk(self, old_start: int, new_start: int) -> None:
+        """
+        Bir sonraki satırın eski/yeni dosyadaki (0 tabanlı) satır numarası.
+        """
+        self._end_run()
+        self._old_no = old_start
+        self._new_no = new_start
+        self._in_hunk = True
+
+    def observe(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            self._observe(line)
+            yield line
+        self._end_run()
+
+    def _observe(self, line: str) -> None:
+        if line.startswith(_STRUCTURAL_HEADER):
+            self._end_run()
+            match = _STRUCTURAL_POU_RE.search(line)
+            self._section_pou = match.group(1) if match else None
+            self._in_hunk = True
+            return
+        if line.startswith("@@"):
+            match = _HUNK_RE.match(line)
+            if match:
+                old_start, old_len, new_start, new_len = match.groups()
+                self.on_hunk(int(old_start) - (old_len != "0"), int(new_start) - (new_len != "0"))
+            return
+        if not self._in_hunk:
+            return  # klasik diff'teki '--- OLD' / '+++ NEW' başlıkları
+
+        kind = line[:1]
+        if kind == "-":
+            pou = self._pou(self.old_pous, self._old_no)
+            self._old_no += 1
+            if self._is_noise(line):
+                return
+            self._run_removed += 1
+        elif kind == "+":
+            pou = self._pou(self.new_pous, self._new_no)
+            self._new_no += 1
+            if self._is_noise(line):
+                return
+            self._run_added += 1
+        else:
+            self._end_run()
+            self._old_no += 1
+            self._new_no += 1
+            return
+
+        if pou:
+            self.pou_changes[pou] = self.pou_changes.get(pou, 0) + 1
+        if "SIGNAL" in line:
+            match = _SIGNAL_RE.search(line)
+            if match:
+                self.changed_signals.add(match.group(1))
+
+    def _pou(self, tracker: PouTracker, line_no: int) -> Optional[str]:
+        if self._section_pou is not None:
+            return self._section_pou
+        return tracker.pou_at(line_no)
+
+    def _end_run(self) -> None:
+        if self._run_removed or self._run_added:
+            changed = min(self._run_removed, self._run_added)
+            self.changed_lines += changed
+            self.removed_lines += self._run_removed - changed
+            self.added_lines += self._run_added - changed
+            self._run_removed = self._run_added = 0
+
+    def result(self) -> Dict:
+        self._end_run()
+        return {
+            "added_lines": self.added_lines,
+            "removed_lines": self.removed_lines,
+            "changed_lines": self.changed_lines,
+            "pou_changes": dict(sorted(self.pou_changes.items(), key=lambda kv: (-kv[1], kv[0]))),
+            "changed_signals": sorted(self.changed_signals),
+        }
+
@@ -0,0 +1,243 @@
+import difflib
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Değişiklik bloklarının etrafında gösterilecek bağlam satırı sayısı (unified_diff varsayılanı ile aynı)
+DEFAULT_CONTEXT = 3
+
+# İki dosyanın yeniden hizalandığını kabul etmek için art arda eşleşmesi gereken satır sayısı
+DEFAULT_SYNC_LINES = 3
+
+# Tek bir değişiklik bloğu için bellekte tutulacak azami satır sayısı (iki taraf toplamı).
+# Bu sınır aşılırsa blok olduğu gibi (-/+) yazılır ve akış kaldığı yerden devam eder.
+DEFAULT_MAX_HUNK_LINES = 20000
+
+# Çok sık tekrarlanan satırlar (ör. "</variable>") için tutulacak azami konum sayısı
+_MAX_POSITIONS_PER_LINE = 32
+
+
+class _LineSource:
+    """
+    Satır iteratörünü sarar; okunmuş fakat henüz tüketilmemiş satırların geri itilmesine izin verir.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self._it = iter(lines)
+        self._pending: deque = deque()
+        self.exhausted = False
+        self.consumed = 0  # tüketilmiş satır sayısı (= bir sonraki satırın 0 tabanlı numarası)
+
+    def next(self) -> Optional[str]:
+        if self._pending:
+            self.consumed += 1
+            return self._pending.popleft()
+        if self.exhausted:
+            return None
+        line = next(self._it, None)
+        if line is None:
+            self.exhausted = True
+        else:
+            self.consumed += 1
+        return line
+
+    def push_back(self, lines: List[str]) -> None:
+        self._pending.extendleft(reversed(lines))
+        self.consumed -= len(lines)
+
+    @property
+    def at_eof(self) -> bool:
+        return self.exhausted and not self._pending
+
+
+def _diff_block(old_block: List[str], new_block: List[str]) -> Iterator[str]:
+    """
+    Hizalanmış tek bir değişiklik bloğunu difflib ile karşılaştırır ve ' ', '-', '+' önekli satırlar üretir.
+    """
+    matcher = difflib.SequenceMatcher(None, old_block, new_block, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for line in old_block[i1:i2]:
+                yield ' ' + line
+            continue
+        if tag in ('replace', 'delete'):
+            for line in old_block[i1:i2]:
+                yield '-' + line
+        if tag in ('replace', 'insert'):
+            for line in new_block[j1:j2]:
+                yield '+' + line
+
+
+def _resync(old: _LineSource, new: _LineSource, old_block: List[str], new_block: List[str],
+            sync_lines: int, max_hunk_lines: int) -> Tuple[int, int]:
+    """
+    Ayrışan iki akıştan satır okumaya devam ederek tekrar hizalandıkları noktayı arar.
+    Dönen (i, j) değeri; old_block[i:] ile new_block[j:]'nin eşit bir bölgeyle başladığını gösterir.
+    Hizalama bulunamazsa (dosya sonu veya blok sınırı) blokların tamamının uzunluğu döner.
+    """
+    old_index: dict = {}
+    new_index: dict = {}
+    candidates: List[Tuple[int, int]] = []
+
+    def register(line: str, pos: int, own_index: dict, other_index: dict, old_side: bool) -> None:
+        if not line.strip():
+            return  # boş satırlar hizalama noktası olarak güvenilir değil
+        for other_pos in other_index.get(line, ()):
+            candidates.append((pos, other_pos) if old_side else (other_pos, pos))
+        positions = own_index.setdefault(line, [])
+        if len(positions) < _MAX_POSITIONS_PER_LINE:
+            positions.append(pos)
+
+    def check(i: int, j: int) -> Optional[bool]:
+        remaining_old = len(old_block) - i
+        remaining_new = len(new_block) - j
+        span = sync_lines
+        if old.at_eof:
+            span = min(span, remaining_old)
+        if new.at_eof:
+            span = min(span, remaining_new)
+        if span == 0:
+            return False
+        if remaining_old < span or remaining_new < span:
+            return None  # karar için daha fazla satır gerekiyor
+        return old_block[i:i + span] == new_block[j:j + span]
+
+    for pos, line in enumerate(old_block):
+        register(line, pos, old_index, new_index, True)
+    for pos, line in enumerate(new_block):
+        register(line, pos, new_index, old_index, False)
+
+    while True:
+        best = None
+        undecided = []
+        for cand in candidates:
+            result = check(*cand)
+            if result is None:
+                undecided.append(cand)
+            elif result and (best is None or sum(cand) < sum(best)):
+                best = cand
+        candidates[:] = undecided
+
+        if best is not None and not any(sum(c) < sum(best) for c in undecided):
+            return best
+        if old.at_eof and new.at_eof:
+            return best if best is not None else (len(old_block), len(new_block))
+        if len(old_block) + len(new_block) >= max_hunk_lines:
+            return best if best is not None else (len(old_block), len(new_block))
+        if best is not None:
+            candidates.append(best)
+
+        line = old.next()
+        if line is not None:
+            old_block.append(line)
+            register(line, len(old_block) - 1, old_index, new_index, True)
+        line = new.next()
+        if line is not None:
+            new_block.append(line)
+            register(line, len(new_block) - 1, new_index, old_index, False)
+
+
+def iter_streaming_diff(old_lines: Iterable[str], new_lines: Iterable[str],
+                        context: int = DEFAULT_CONTEXT,
+                        sync_lines: int = DEFAULT_SYNC_LINES,
+                        max_hunk_lines: int = DEFAULT_MAX_HUNK_LINES,
+                        on_hunk: Optional[Callable[[int, int], None]] = None) -> Iterator[str]:
+    """
+    İki satır akışını aynı anda okuyarak unified diff gövdesi (' ', '-', '+' önekli satırlar) üretir.
+    Dosyalar hiçbir zaman tamamen belleğe alınmaz; bellek kullanımı en büyük değişiklik bloğu ile orantılıdır.
+    difflib yalnızca ayrışan bölgelerin içinde çalıştırılır.
+    on_hunk verilirse her blok yazılmadan önce, bloğun ilk satırının eski/yeni dosyadaki
+    0 tabanlı satır numaralarıyla çağrılır (unified diff'teki @@ başlığının karşılığı).
+    """
+    old = _LineSource(old_lines)
+    new = _LineSource(new_lines)
+    before: deque = deque(maxlen=context)
+    trailing = 0
+
+    while True:
+        a = old.next()
+        b = new.next()
+        if a is None and b is None:
+            return
+
+        if a is not None and a == b:
+            if trailing:
+                yield ' ' + a
+                trailing -= 1
+            else:
+                before.append(a)
+            continue
+
+        if on_hunk:
+            on_hunk(old.consumed - (a is not None) - len(before), new.consumed - (b is not None) - len(before))
+
+        old_block = [a] if a is not None else []
+        new_block = [b] if b is not None else []
+        i, j = _resync(old, new, old_block, new_block, sync_lines, max_hunk_lines)
+
+        while before:
+            yield ' ' + before.popleft()
+        yield from _diff_block(old_block[:i], new_block[:j])
+
+        old.push_back(old_block[i:])
+        new.push_back(new_block[j:])
+        trailing = context
+
+
+class DiffProgress:
+    """
+    Diff sırasında okunan satır/byte miktarını izler ve belirli aralıklarla geri çağrıyı tetikler.
+    Geri çağrı imzası: callback(lines_processed: int, percent: float)
+    """
+
+    def __init__(self, callback, total_bytes: int, interval_bytes: int = 4 * 1024 * 1024):
+        self.callback = callback
+        self.total_bytes = max(total_bytes, 1)
+        self.interval_bytes = interval_bytes
+        self.lines = 0
+        self.bytes = 0
+        self._next_report = interval_bytes
+
+    def add(self, n_bytes: int, n_lines: int) -> None:
+        self.lines += n_lines
+        self.bytes += n_bytes
+        if self.bytes >= self._next_report:
+            self._next_report = self.bytes + self.interval_bytes
+            self.callback(self.lines, min(99.0, 100.0 * self.bytes / self.total_bytes))
+
+    def lines_of(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Satır akışını geçirirken sayar (karakter sayısı byte sayısına yaklaşık olarak kullanılır).
+        """
+        for line in lines:
+            self.lines += 1
+            self.bytes += len(line)
+            if self.bytes >= self._next_report:
+                self._next_report = self.bytes + self.interval_bytes
+                self.callback(self.lines, min(99.0, 100.0 * self.bytes / self.total_bytes))
+            yield line
+
+    def reader(self, raw_file) -> "_CountingReader":
+        """
+        iterparse gibi read() ile okuyan tüketiciler için byte ve satır sayan sarmalayıcı döndürür.
+        """
+        return _CountingReader(raw_file, self)
+
+    def finish(self) -> None:
+        self.callback(self.lines, 100.0)
+
+
+class _CountingReader:
+    def __init__(self, raw_file, progress: DiffProgress):
+        self._f = raw_file
+        self._progress = progress
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+    def read(self, size: int = -1):
+        data = self._f.read(size)
+        self._progress.add(len(data), data.count(b"\n"))
+        return data
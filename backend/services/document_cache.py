@@ -0,0 +1,202 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Tuple
+
+# Önbellekte tutulabilecek toplam tahmini bellek (byte). 0 verilirse önbellek devre dışıdır.
+DOC_CACHE_MAX_BYTES = int(os.environ.get("DOC_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Türetilmiş içerik türleri
+KIND_TEXT = "text"              # dosyanın çözülmüş metni
+KIND_LINES = "lines"            # satır listesi (klasik diff)
+KIND_LEAVES = "leaves"          # yapısal diff yaprak özetleri
+KIND_ST_TEXT = "st_text"        # ST/xhtml bloğunun unescape edilmiş metni
+KIND_SIGNALS = "signals"        # sinyal tablosu satırları
+KIND_SIGNAL_FRAME = "signal_frame"  # sinyal tablosu DataFrame olarak (Excel çapraz kontrolü)
+KIND_MERGE_POINT = "merge_point"  # birleştirme işaretçisinin metin içindeki konumu
+KIND_MERGE_OFFSET = "merge_offset"  # birleştirme işaretçisinin dosyadaki byte konumu (akışlı birleştirme)
+
+# Bu süreçteki tüm servislerin paylaştığı önbellek. Anahtar (dosya id, tür); değer ile birlikte
+# dosyanın (mutlak yol, boyut, mtime) damgası saklanır, damga tutmazsa kayıt eskimiş sayılır.
+# Diff işleri ayrı süreçlerde çalıştığından her işçi sürecin kendi önbelleği vardır.
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple[int, str], Tuple[tuple, str, object, int]]" = OrderedDict()
+_resident_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "oversized": 0}
+
+
+def _stamp(path: str) -> tuple:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def estimate_size(value) -> int:
+    """
+    Değerin bellekteki yaklaşık boyutu; str/bytes, liste/demet ve sözlükler iç içe sayılır.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return size
+
+
+def _drop(key) -> None:
+    global _resident_bytes
+    entry = _entries.pop(key, None)
+    if entry is not None:
+        _resident_bytes -= entry[3]
+
+
+def _store(key, stamp: tuple, db_path: str, value) -> None:
+    global _resident_bytes
+    size = estimate_size(value)
+    if size > DOC_CACHE_MAX_BYTES:
+        _stats["oversized"] += 1  # bütçeden büyük değer saklanmaz, yalnızca döndürülür
+        return
+    _drop(key)
+    _entries[key] = (stamp, db_path, value, size)
+    _resident_bytes += size
+    while _resident_bytes > DOC_CACHE_MAX_BYTES:
+        _drop(next(iter(_entries)))
+        _stats["evictions"] += 1
+
+
+def get(file_id: int, path: str, kind: str, loader: Callable[[], object]):
+    """
+    Dosyanın (file_id, kind) için önbellekteki değerini döndürür. Kayıt yoksa veya dosyanın boyutu/mtime'ı
+    değiştiyse loader() çağrılır ve sonucu saklanır. Bütçe aşılırsa en uzun süredir kullanılmayan kayıtlar atılır.
+    Dosya okunamıyorsa os.stat'ın OSError'ı çağırana iletilir.
+    """
+    stamp = _stamp(path)
+    key = (file_id, kind)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[2]
+        _stats["misses"] += 1
+
+    value = loader()
+    if DOC_CACHE_MAX_BYTES > 0 and value is not None:
+        with _lock:
+            _store(key, stamp, path.replace("\\", "/"), value)
+    return value
+
+
+def peek(file_id: int, path: str, kind: str):
+    """
+    Geçerli bir kayıt varsa değerini döndürür, yoksa None; sayaçları ve LRU sırasını değiştirmez.
+    """
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return None
+    with _lock:
+        entry = _entries.get((file_id, kind))
+    return entry[2] if entry is not None and entry[0] == stamp else None
+
+
+def put(file_id: int, path: str, kind: str, value) -> None:
+    """
+    Başka bir işlem sırasında üretilmiş değeri (ör. diff'in topladığı yaprak özetleri) önbelleğe koyar.
+    """
+    if DOC_CACHE_MAX_BYTES <= 0 or value is None:
+        return
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return
+    with _lock:
+        _store((file_id, kind), stamp, path.replace("\\", "/"), value)
+
+
+def read_text(file_id: int, path: str) -> str:
+    """
+    Dosyanın UTF-8 çözülmüş metni (önbellekten).
+    """
+    def load():
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    return get(file_id, path, KIND_TEXT, load)
+
+
+def invalidate(file_ids: Iterable[int]) -> int:
+    """
+    Verilen dosyalara ait tüm kayıtları atar (silme sonrası). Atılan kayıt sayısını döndürür.
+    """
+    ids = set(file_ids)
+    if not ids:
+        return 0
+    with _lock:
+        keys = [key for key in _entries if key[0] in ids]
+        for key in keys:
+            _drop(key)
+        _stats["invalidations"] += len(keys)
+    return len(keys)
+
+
+def _matches_db_path(path: str, db_paths: set) -> bool:
+    # Kayıt mutlak yolla da açılmış olabilir; yolun her '/' sonrası son eki DB yoluyla karşılaştırılır
+    if path in db_paths:
+        return True
+    i = path.find("/")
+    while i != -1:
+        if path[i + 1:] in db_paths:
+            return True
+        i = path.find("/", i + 1)
+    return False
+
+
+def invalidate_paths(db_paths: Iterable[str]) -> int:
+    """
+    Yolları verilen dosyalara (ör. yeniden taramada değiştiği görülenler) ait kayıtları atar.
+    Yollar veritabanındaki biçimdedir ('<dizin adı>/<alt/yol>').
+    """
+    paths = set(db_paths)
+    if not paths:
+        return 0
+    with _lock:
+        keys = [key for key, entry in _entries.items() if _matches_db_path(entry[1], paths)]
+        for key in keys:
+            _drop(key)
+        _stats["invalidations"] += len(keys)
+    return len(keys)
+
+
+def clear() -> None:
+    global _resident_bytes
+    with _lock:
+        _stats["invalidations"] += len(_entries)
+        _entries.clear()
+        _resident_bytes = 0
+
+
+def get_stats() -> Dict[str, object]:
+    """
+    İsabet/ıska/atma sayaçları, kayıt sayısı ve bellekte tutulan tahmini byte miktarı (türe göre dağılımıyla).
+    """
+    with _lock:
+        stats = dict(_stats)
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for (_file_id, kind), entry in _entries.items():
+            bucket = by_kind.setdefault(kind, {"entries": 0, "bytes": 0})
+            bucket["entries"] += 1
+            bucket["bytes"] += entry[3]
+        stats["entries"] = len(_entries)
+        stats["resident_bytes"] = _resident_bytes
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    stats["max_bytes"] = DOC_CACHE_MAX_BYTES
+    stats["by_kind"] = by_kind
+    return stats
+
+
+def reset_stats() -> None:
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+
@@ -0,0 +1,244 @@
+import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _is_integral(series: pd.Series) -> bool:
+    # Excel tam sayıları boş hücre olan sütunlarda float okunur; tam sayı değerli ve boşsuz float'lar da tam sayıdır
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.isna().any():
+        return True
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        return not np.isnan(values).any() and bool((values == np.floor(values)).all())
+    return False
+
+
+def _key_values(old: pd.Series, new: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Anahtar sütunlarını birbiriyle karşılaştırılabilir hale getirir. İki tarafta da tam sayı ise int64 olarak
+    (metne çevirmeden) hizalanır; değilse metne çevrilir: tam sayı değerli float'lar '12.0' yerine '12',
+    boş anahtarlar '' olur.
+    """
+    if _is_integral(old) and _is_integral(new):
+        return old.astype("int64"), new.astype("int64")
+    return _key_text(old), _key_text(new)
+
+
+def _key_text(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.dropna()
+        if (values == np.floor(values)).all():
+            series = series.astype("Int64")
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+def _key_indexes(old_keys: pd.Series, new_keys: pd.Series) -> Tuple[pd.Index, pd.Index]:
+    """
+    İki tarafın hizalama indeksleri. Taraflardan birinde aynı anahtar birden fazla satırda geçiyorsa her iki
+    taraf da (anahtar, anahtar içindeki sıra) çiftleriyle indekslenir: ilk tekrar ilk tekrarla, ikinci
+    ikinciyle eşlenir; eşi olmayan fazlalar eklenmiş/silinmiş sayılır. (İndeks türleri iki tarafta aynı
+    olmalıdır; düz Index ile MultiIndex arasında get_indexer hiçbir satırı eşleştirmez.)
+    """
+    old_index = pd.Index(old_keys.to_numpy())
+    new_index = pd.Index(new_keys.to_numpy())
+    if old_index.is_unique and new_index.is_unique:
+        return old_index, new_index
+    return _occurrence_index(old_keys), _occurrence_index(new_keys)
+
+
+def _occurrence_index(keys: pd.Series) -> pd.MultiIndex:
+    occurrence = keys.groupby(keys, sort=False).cumcount()
+    return pd.MultiIndex.from_arrays([keys.to_numpy(), occurrence.to_numpy()])
+
+
+def json_value(value):
+    """
+    Hücre değerini JSON'a yazılabilir hale getirir (NaN -> None, numpy sayıları -> Python sayıları).
+    """
+    if value is None or (not isinstance(value, (list, tuple)) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def _row_dicts(df: pd.DataFrame, positions: np.ndarray) -> List[dict]:
+    columns = [str(c) for c in df.columns]
+    return [dict(zip(columns, map(json_value, row))) for row in df.iloc[positions].itertuples(index=False)]
+
+
+def _change_mask(old_df: pd.DataFrame, new_df: pd.DataFrame, columns: List,
+                 old_pos: np.ndarray, new_pos: np.ndarray) -> np.ndarray:
+    """
+    Hizalanmış satırlar için (satır x sütun) değişiklik maskesi. İki tarafta da sayısal olan sütunlar tek bir
+    float64 bloğunda birlikte, diğerleri sütun sütun object dizileri olarak karşılaştırılır. İki tarafta da boş
+    olan hücreler eşit sayılır; boşluk denetimi yalnızca farklı görünen hücrelerde yapılır.
+    """
+    mask = np.zeros((len(new_pos), len(columns)), dtype=bool)
+    numeric = [i for i, c in enumerate(columns)
+               if pd.api.types.is_numeric_dtype(old_df[c].dtype) and pd.api.types.is_numeric_dtype(new_df[c].dtype)]
+
+    if numeric:
+        cols = [columns[i] for i in numeric]
+        a = old_df[cols].to_numpy(dtype="float64", na_value=np.nan)[old_pos]
+        b = new_df[cols].to_numpy(dtype="float64", na_value=np.nan)[new_pos]
+        mask[:, numeric] = (a != b) & ~(np.isnan(a) & np.isnan(b))
+
+    numeric_set = set(numeric)
+    for i, column in enumerate(columns):
+        if i in numeric_set:
+            continue
+        a = old_df[column].to_numpy(dtype=object)[old_pos]
+        b = new_df[column].to_numpy(dtype=object)[new_pos]
+        differs = a != b
+        candidates = np.flatnonzero(differs)
+        if len(candidates):
+            differs[candidates] = ~(pd.isna(a[candidates]) & pd.isna(b[candidates]))
+        mask[:, i] = differs
+    return mask
+
+
+class FrameDiff(NamedTuple):
+    """
+    İki tablonun hizalanmış karşılaştırmasının sıkıştırılmış sonucu: yalnızca satır konumları, değişen satırların
+    maskesi ve anahtarları. Tablolar olmadan taşınabilir (işlem havuzundan pickle ile döner); satırlar gerektiğinde
+    added_rows / removed_rows / modified_rows ile parça parça üretilir.
+    """
+    columns: List              # karşılaştırılan ortak sütunlar (anahtar hariç)
+    added_columns: List[str]
+    removed_columns: List[str]
+    added_pos: np.ndarray      # yalnızca yeni tabloda olan satırların konumları
+    removed_pos: np.ndarray    # yalnızca eski tabloda olan satırların konumları
+    old_pos: np.ndarray        # değişen satırların eski tablodaki konumları
+    new_pos: np.ndarray        # değişen satırların yeni tablodaki konumları
+    mask: np.ndarray           # (değişen satır x sütun) değişiklik maskesi
+    keys: np.ndarray           # değişen satırların anahtarları
+    unchanged: int
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added_pos),
+            "removed": len(self.removed_pos),
+            "modified": len(self.new_pos),
+            "unchanged": self.unchanged,
+        }
+
+
+def align_frames(old_df: pd.DataFrame, new_df: pd.DataFrame, key_column: Optional[str]) -> FrameDiff:
+    """
+    İki tabloyu key_column'daki değerlere göre (None ise satır sırasına göre) hizalar ve ortak sütunları
+    vektörel olarak karşılaştırır. Anahtar sütunu tablolardan birinde yoksa ValueError yükselir.
+    """
+    if key_column is None:
+        old_keys = pd.Series(np.arange(len(old_df)))
+        new_keys = pd.Series(np.arange(len(new_df)))
+    else:
+        for label, df in (("eski", old_df), ("yeni", new_df)):
+            if key_column not in df.columns:
+                raise ValueError(f"Anahtar sütunu '{key_column}' {label} dosyada bulunamadı.")
+        old_keys, new_keys = _key_values(old_df[key_column], new_df[key_column])
+
+    # Yeni satırların eski tablodaki karşılıkları (-1: eşi yok)
+    old_index, new_index = _key_indexes(old_keys, new_keys)
+    matched = old_index.get_indexer(new_index)
+    new_pos = np.flatnonzero(matched >= 0)
+    old_pos = matched[new_pos]
+    old_matched = np.zeros(len(old_df), dtype=bool)
+    old_matched[old_pos] = True
+
+    new_columns = set(new_df.columns)
+    old_columns = set(old_df.columns)
+    columns = [c for c in old_df.columns if c in new_columns and c != key_column]
+    mask = _change_mask(old_df, new_df, columns, old_pos, new_pos)
+    changed_rows = np.flatnonzero(mask.any(axis=1))
+
+    return FrameDiff(
+        columns=columns,
+        added_columns=[str(c) for c in new_df.columns if c not in old_columns],
+        removed_columns=[str(c) for c in old_df.columns if c not in new_columns],
+        added_pos=np.flatnonzero(matched < 0),
+        removed_pos=np.flatnonzero(~old_matched),
+        old_pos=old_pos[changed_rows],
+        new_pos=new_pos[changed_rows],
+        mask=mask[changed_rows],
+        keys=new_keys.to_numpy()[new_pos[changed_rows]],
+        unchanged=len(new_pos) - len(changed_rows),
+    )
+
+
+def added_rows(diff: FrameDiff, new_df: pd.DataFrame, page: slice = slice(None)) -> List[dict]:
+    return _row_dicts(new_df, diff.added_pos[page])
+
+
+def frame_rows(df: pd.DataFrame, page: slice = slice(None)) -> List[dict]:
+    """
+    Yalnızca bir dosyada bulunan sayfanın satırlarının verilen dilimi (sayfanın tamamı eklenmiş/silinmiştir).
+    """
+    return _row_dicts(df, np.arange(len(df))[page])
+
+
+def removed_rows(diff: FrameDiff, old_df: pd.DataFrame, page: slice = slice(None)) -> List[dict]:
+    return _row_dicts(old_df, diff.removed_pos[page])
+
+
+def modified_rows(diff: FrameDiff, old_df: pd.DataFrame, new_df: pd.DataFrame,
+                  page: slice = slice(None)) -> List[dict]:
+    """
+    Değişen satırların verilen dilimi: anahtar, değişen sütunlar, sütun başına maske ("columns" sırasıyla)
+    ve değişen hücrelerin eski/yeni değerleri. Dilimin hücreleri iki blok halinde tek seferde okunur.
+    """
+    names = [str(c) for c in diff.columns]
+    old_values = old_df.iloc[diff.old_pos[page]][diff.columns].to_numpy(dtype=object)
+    new_values = new_df.iloc[diff.new_pos[page]][diff.columns].to_numpy(dtype=object)
+    rows = []
+    for row_mask, key, old_row, new_row in zip(diff.mask[page], diff.keys[page], old_values, new_values):
+        changed = np.flatnonzero(row_mask)
+        rows.append({
+            "key": json_value(key),
+            "changed_columns": [names[i] for i in changed],
+            "mask": row_mask.astype(int).tolist(),
+            "changes": {names[i]: {"from": json_value(old_row[i]), "to": json_value(new_row[i])} for i in changed},
+        })
+    return rows
+
+
+def page_slice(offset: int = 0, limit: Optional[int] = None) -> slice:
+    offset = max(0, offset)
+    return slice(offset, None if limit is None else offset + max(0, limit))
+
+
+def compare_frames(old_df: pd.DataFrame, new_df: pd.DataFrame, key_column: str,
+                   offset: int = 0, limit: Optional[int] = None) -> Dict[str, object]:
+    """
+    İki tabloyu key_column'daki değerlere göre hizalayıp hücre düzeyinde karşılaştırır.
+      - removed : yalnızca eski tabloda olan anahtarların satırları
+      - added   : yalnızca yeni tabloda olan anahtarların satırları
+      - modified: iki tarafta olan ve ortak sütunlardan en az birinde değeri değişen satırlar; her biri için
+                  sütun başına değişiklik maskesi ("mask", "columns" sırasıyla) ve değişen hücrelerin eski/yeni değerleri
+    Karşılaştırma tüm hizalı satırlar üzerinde vektörel yapılır; yalnızca döndürülecek sayfa (her liste için
+    offset/limit) Python nesnelerine çevrilir. Sayımlar "summary" altında tam olarak verilir.
+    Anahtar sütunu tablolardan birinde yoksa ValueError yükselir.
+    """
+    diff = align_frames(old_df, new_df, key_column)
+    page = page_slice(offset, limit)
+    return {
+        "key_column": key_column,
+        "columns": [str(c) for c in diff.columns],
+        "added_columns": diff.added_columns,
+        "removed_columns": diff.removed_columns,
+        "summary": diff.summary,
+        "added": added_rows(diff, new_df, page),
+        "removed": removed_rows(diff, old_df, page),
+        "modified": modified_rows(diff, old_df, new_df, page),
+    }
+
+
+def has_changes(result: Dict[str, object]) -> bool:
+    summary = result["summary"]
+    return bool(summary["added"] or summary["removed"] or summary["modified"]
+                or result["added_columns"] or result["removed_columns"])
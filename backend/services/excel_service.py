@@ -1,13 +1,31 @@
+import multiprocessing
 import os
+import threading
 import pandas as pd
-from typing import List, Dict, Set, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Dict, Set, Optional, Tuple, Union
 from werkzeug.utils import secure_filename
 from codesys_doc_tracker import db
 from codesys_doc_tracker.models.excel_model import ExcelFile
+from codesys_doc_tracker.models.file_index_model import FileIndex
+from services import excel_sidecar
+from services.excel_compare import (
+    FrameDiff, added_rows, align_frames, compare_frames, frame_rows, modified_rows, page_slice, removed_rows
+)
+from services.file_index_service import scan_tree, sync_index, sync_lock, sync_paths
 
 EXCEL_EXPORT_DIR = "ExcelExports"
 ALLOWED_EXTS = {".xlsx", ".xls"}
 
+# Çok sayfalı karşılaştırmada sayfaları paralel karşılaştıracak işlem sayısı (0 veya boş: çekirdek sayısı)
+EXCEL_COMPARE_WORKERS = int(os.environ.get("EXCEL_COMPARE_WORKERS", "0") or 0) or os.cpu_count() or 1
+# Akışlı karşılaştırmada bir NDJSON satırına konacak azami fark satırı
+STREAM_CHUNK_ROWS = 500
+
+_compare_executor: Optional[ProcessPoolExecutor] = None
+_compare_executor_lock = threading.Lock()
+
 
 # ---------- Yardımcılar ----------
 
@@ -26,22 +44,6 @@ def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def _iter_excel_files(base_dir: str, recursive: bool = True):
-    """
-    Belirtilen dizindeki tüm Excel dosyalarını listeler.
-    """
-    if recursive:
-        for root, _dirs, files in os.walk(base_dir):
-            for name in files:
-                if name.lower().endswith(tuple(ALLOWED_EXTS)):
-                    yield os.path.join(root, name)
-    else:
-        for name in os.listdir(base_dir):
-            full = os.path.join(base_dir, name)
-            if os.path.isfile(full) and name.lower().endswith(tuple(ALLOWED_EXTS)):
-                yield full
-
-
 def _canonize_slashes(p: str) -> str:
     """
     Yol ayracını sistemden bağımsız hale getirir.
@@ -79,26 +81,61 @@ def _unique_target_path(dir_path: str, file_name: str) -> Tuple[str, str]:
 def scan_and_sync_excel_files(base_dir: Optional[str] = None, recursive: bool = True) -> Dict[str, int]:
     """
     Yerel dosya sistemindeki Excel dosyalarını tarar ve veritabanı ile senkronize eder.
+    XML taramasıyla aynı şekilde dosya indeksi, tek sorgu ve toplu INSERT kullanılır.
     """
     export_dir = _export_base_dir(base_dir)
     _ensure_dir(export_dir)
     base_name = os.path.basename(export_dir.rstrip("\\/"))
 
-    added = 0
-    fs_db_paths: Set[str] = set()
+    scanned = scan_tree(export_dir, tuple(ALLOWED_EXTS), recursive=recursive)
+    with sync_lock:
+        delta = sync_index(FileIndex.KIND_EXCEL, base_name, scanned)
 
-    for abs_path in _iter_excel_files(export_dir, recursive=recursive):
-        abs_path = os.path.normpath(abs_path)
-        db_path = _path_for_db(abs_path, export_dir)
-        fs_db_paths.add(db_path)
+        registered = ExcelFile.paths_under(base_name)
+        added = ExcelFile.create_many(sorted(path for path in scanned if path not in registered))
 
-        if not ExcelFile.get_by_path(db_path):
-            ExcelFile.create(file_path=db_path)
-            added += 1
+        removed = 0
+        if any(path not in scanned for path in registered):
+            removed = ExcelFile.delete_missing_files(set(scanned), base_name)
 
-    removed = ExcelFile.delete_missing_files(fs_db_paths, base_name)
+    _sync_sidecars([scanned[path].abs_path for path in delta.added + delta.changed], delta)
+    return {"added": added, "removed": removed, "changed": len(delta.changed)}
 
-    return {"added": added, "removed": removed}
+
+def apply_excel_changes(abs_paths) -> Dict[str, int]:
+    """
+    Yalnızca verilen dosyaları (ör. dosya izleyicisinin bildirdiği yolları) veritabanına yansıtır:
+    diskte olup kayıtlı olmayanları ekler, diskten kaybolanların kayıtlarını siler.
+    Dizinin geri kalanı taranmaz.
+    """
+    export_dir = _export_base_dir()
+    entries = {}
+    for abs_path in abs_paths:
+        if abs_path.lower().endswith(tuple(ALLOWED_EXTS)):
+            abs_path = os.path.normpath(abs_path)
+            entries[_path_for_db(abs_path, export_dir)] = abs_path
+    if not entries:
+        return {"added": 0, "removed": 0, "changed": 0}
+
+    with sync_lock:
+        present, delta = sync_paths(FileIndex.KIND_EXCEL, entries)
+        registered = ExcelFile.registered_paths(entries)
+        added = ExcelFile.create_many(sorted(path for path in present if path not in registered))
+        removed = ExcelFile.delete_by_paths([path for path in registered if path not in present])
+
+    _sync_sidecars([present[path].abs_path for path in delta.added + delta.changed], delta)
+    return {"added": added, "removed": removed, "changed": len(delta.changed)}
+
+
+def _sync_sidecars(abs_paths: List[str], delta) -> None:
+    """
+    Yeni/değişmiş dosyaların sütunsal kopyalarını (sidecar) oluşturur; içeriği artık hiçbir indeksli dosyaya
+    ait olmayan sidecar'ları siler. Değişiklik yoksa bir şey yapılmaz.
+    """
+    if abs_paths:
+        excel_sidecar.ensure_sidecars(abs_paths)
+    if delta.changed or delta.removed:
+        excel_sidecar.prune(FileIndex.content_hashes(FileIndex.KIND_EXCEL))
 
 
 def get_file_path_by_id(file_id: int) -> Optional[str]:
@@ -164,9 +201,14 @@ def save_uploaded_excels(file_storages: List) -> Dict[str, List[Dict]]:
     return {"saved": saved_files, "skipped": skipped, "message": message}
 
 
-def compare_excel_files_by_id(file1_id: int, file2_id: int) -> Optional[List[Dict]]:
+def compare_excel_files_by_id(file1_id: int, file2_id: int, key_column: Optional[str] = None,
+                              offset: int = 0, limit: Optional[int] = None):
     """
     Verilen ID'lere sahip iki Excel dosyasını karşılaştırır ve farkları döndürür.
+    key_column verilirse satırlar o sütuna göre hizalanır ve hücre düzeyinde fark döner
+    (bkz. excel_compare.compare_frames; offset/limit her fark listesine uygulanır).
+    Verilmezse tüm sütunlar üzerinden satır bazlı karşılaştırma yapılır: dosya başına yalnızca
+    o dosyada bulunan satırların listesi. Tablolar workbook yerine dosyaların sidecar'larından okunur.
     """
     file1_path = get_file_path_by_id(file1_id)
     file2_path = get_file_path_by_id(file2_id)
@@ -175,11 +217,14 @@ def compare_excel_files_by_id(file1_id: int, file2_id: int) -> Optional[List[Dic
         raise FileNotFoundError("Dosyalardan biri veya ikisi bulunamadı.")
 
     try:
-        df1 = pd.read_excel(file1_path)
-        df2 = pd.read_excel(file2_path)
+        df1 = excel_sidecar.read_frame(file1_path)
+        df2 = excel_sidecar.read_frame(file2_path)
     except Exception as e:
         raise ValueError(f"Excel dosyası okuma hatası: {e}")
 
+    if key_column:
+        return compare_frames(df1, df2, key_column, offset=offset, limit=limit)
+
     # Farklılıkları bulmak için basit bir karşılaştırma (satır bazlı)
     # Varsayım: Her iki dosyada da aynı sütunlar aynı sırada.
     # Daha gelişmiş bir karşılaştırma için pandas.testing.assert_frame_equal veya benzeri kullanılabilir.
@@ -207,4 +252,169 @@ def compare_excel_files_by_id(file1_id: int, file2_id: int) -> Optional[List[Dic
             "differences": right_only.to_dict('records')
         })
     
-    return diffs
\ No newline at end of file
+    return diffs
+
+
+# ---------- Çok sayfalı, akışlı karşılaştırma ----------
+
+def _get_compare_executor() -> ProcessPoolExecutor:
+    """
+    Sayfa karşılaştırma havuzunu ilk kullanımda oluşturur ('spawn': ana işlemin veritabanı bağlantıları
+    kopyalanmaz). İşçiler veritabanına erişmez; tabloları sidecar dizinlerinden mmap ile okur.
+    """
+    global _compare_executor
+    with _compare_executor_lock:
+        if _compare_executor is None:
+            _compare_executor = ProcessPoolExecutor(
+                max_workers=EXCEL_COMPARE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _compare_executor
+
+
+def _reset_compare_executor() -> None:
+    global _compare_executor
+    with _compare_executor_lock:
+        _compare_executor = None
+
+
+def _compare_sheet_job(dir1: str, dir2: str, sheet_name, key_column: Optional[str]) -> FrameDiff:
+    """
+    Havuz işleminde çalışır: iki sidecar'dan aynı adlı sayfayı okuyup hizalanmış karşılaştırmayı döndürür.
+    """
+    return align_frames(excel_sidecar.load_sheet(dir1, sheet_name), excel_sidecar.load_sheet(dir2, sheet_name),
+                        key_column)
+
+
+def _sheet_key(key_column: Union[None, str, Dict[str, str]], sheet_name) -> Optional[str]:
+    if isinstance(key_column, dict):
+        return key_column.get(sheet_name)
+    return key_column
+
+
+def _compare_sheets(dir1: str, dir2: str, sheet_names: List, key_column) -> Dict[object, object]:
+    """
+    Sayfaları karşılaştırır: {sayfa adı: FrameDiff veya hata mesajı}. Birden fazla sayfa varsa işlem havuzunda
+    paralel çalışır; havuz kullanılamazsa sayfalar bu işlemde sırayla karşılaştırılır.
+    """
+    results: Dict[object, object] = {}
+    if len(sheet_names) > 1 and EXCEL_COMPARE_WORKERS > 1:
+        try:
+            executor = _get_compare_executor()
+            futures = {name: executor.submit(_compare_sheet_job, dir1, dir2, name, _sheet_key(key_column, name))
+                       for name in sheet_names}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except ValueError as e:
+                    results[name] = str(e)
+            return results
+        except BrokenProcessPool:
+            _reset_compare_executor()
+            results.clear()
+
+    for name in sheet_names:
+        try:
+            results[name] = _compare_sheet_job(dir1, dir2, name, _sheet_key(key_column, name))
+        except ValueError as e:
+            results[name] = str(e)
+    return results
+
+
+def stream_excel_comparison(file1_id: int, file2_id: int, key_column: Union[None, str, Dict[str, str]] = None,
+                            sheets: Optional[List[str]] = None, offset: int = 0, limit: Optional[int] = None,
+                            chunk_size: int = STREAM_CHUNK_ROWS) -> Iterator[dict]:
+    """
+    İki Excel dosyasının tüm (veya verilen) sayfalarını karşılaştırır ve sonucu parça parça üreten bir iteratör
+    döndürür (NDJSON akışı için). key_column tüm sayfalar için bir sütun adı, {sayfa: sütun} sözlüğü veya
+    None (satırlar sırayla eşlenir) olabilir. Sıra:
+      1. {"type": "summary", ...}: her sayfanın durumu (compared | added | removed | error) ve fark sayıları,
+         toplamlar. Satır ayrıntılarından önce gönderilir; arayüz özeti hemen çizebilir.
+      2. {"type": "rows", "sheet", "kind": removed | added | modified, "offset", "rows"}: her sayfanın fark
+         satırları en fazla chunk_size'lık parçalar halinde. offset/limit her sayfanın her listesine uygulanır.
+         Yalnızca bir dosyada bulunan sayfanın tüm satırları removed/added olarak gönderilir.
+      3. {"type": "end"}
+    Dosyalar bulunamaz veya okunamazsa FileNotFoundError/ValueError akış başlamadan yükselir.
+    """
+    file1_path = get_file_path_by_id(file1_id)
+    file2_path = get_file_path_by_id(file2_id)
+    if not file1_path or not file2_path:
+        raise FileNotFoundError("Dosyalardan biri veya ikisi bulunamadı.")
+
+    try:
+        dir1 = excel_sidecar.build(file1_path)
+        dir2 = excel_sidecar.build(file2_path)
+    except Exception as e:
+        raise ValueError(f"Excel dosyası okuma hatası: {e}")
+
+    sheets1 = {sheet["name"]: sheet for sheet in excel_sidecar.list_sheets(dir1)}
+    sheets2 = {sheet["name"]: sheet for sheet in excel_sidecar.list_sheets(dir2)}
+    names = list(sheets1) + [name for name in sheets2 if name not in sheets1]
+    if sheets is not None:
+        unknown = [name for name in sheets if name not in sheets1 and name not in sheets2]
+        if unknown:
+            raise ValueError(f"Sayfa bulunamadı: {', '.join(map(str, unknown))}")
+        names = [name for name in names if name in set(sheets)]
+
+    return _iter_comparison(file1_path, file2_path, dir1, dir2, sheets1, sheets2, names, key_column,
+                            page_slice(offset, limit), max(1, chunk_size))
+
+
+def _iter_comparison(file1_path: str, file2_path: str, dir1: str, dir2: str, sheets1: dict, sheets2: dict,
+                     names: List, key_column, page: slice, chunk_size: int) -> Iterator[dict]:
+    compared = [name for name in names if name in sheets1 and name in sheets2]
+    diffs = _compare_sheets(dir1, dir2, compared, key_column)
+
+    sheet_summaries = []
+    totals = {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+    for name in names:
+        entry = {"sheet": name}
+        if name not in sheets2:
+            entry.update(status="removed", summary={"added": 0, "removed": sheets1[name]["rows"],
+                                                    "modified": 0, "unchanged": 0})
+        elif name not in sheets1:
+            entry.update(status="added", summary={"added": sheets2[name]["rows"], "removed": 0,
+                                                  "modified": 0, "unchanged": 0})
+        elif isinstance(diffs[name], str):
+            entry.update(status="error", message=diffs[name])
+        else:
+            diff = diffs[name]
+            entry.update(status="compared", key_column=_sheet_key(key_column, name), summary=diff.summary,
+                         columns=[str(c) for c in diff.columns], added_columns=diff.added_columns,
+                         removed_columns=diff.removed_columns)
+        for field, count in entry.get("summary", {}).items():
+            totals[field] += count
+        sheet_summaries.append(entry)
+
+    yield {
+        "type": "summary",
+        "file1": os.path.basename(file1_path),
+        "file2": os.path.basename(file2_path),
+        "sheets": sheet_summaries,
+        "totals": totals,
+    }
+
+    for name in names:
+        if name not in sheets2 or name not in sheets1:
+            # Tek dosyada bulunan sayfanın tüm satırları silinmiş ya da eklenmiş olarak gönderilir
+            kind, dir_path = ("removed", dir1) if name not in sheets2 else ("added", dir2)
+            sheet_df = excel_sidecar.load_sheet(dir_path, name)
+            lists = [(kind, len(sheet_df), lambda part: frame_rows(sheet_df, part))]
+        elif isinstance(diffs[name], str):
+            continue
+        else:
+            diff = diffs[name]
+            old_df = excel_sidecar.load_sheet(dir1, name)
+            new_df = excel_sidecar.load_sheet(dir2, name)
+            lists = [
+                ("removed", len(diff.removed_pos), lambda part: removed_rows(diff, old_df, part)),
+                ("added", len(diff.added_pos), lambda part: added_rows(diff, new_df, part)),
+                ("modified", len(diff.new_pos), lambda part: modified_rows(diff, old_df, new_df, part)),
+            ]
+        for kind, count, render in lists:
+            start, stop, _ = page.indices(count)
+            for chunk_start in range(start, stop, chunk_size):
+                part = slice(chunk_start, min(chunk_start + chunk_size, stop))
+                yield {"type": "rows", "sheet": name, "kind": kind, "offset": chunk_start, "rows": render(part)}
+
+    yield {"type": "end"}
@@ -0,0 +1,205 @@
+import json
+import os
+import shutil
+import uuid
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from services.diff_cache import file_sha256
+
+# Excel dosyalarının sütunsal kopyalarının (sidecar) tutulduğu dizin. Her dosya içerik özetiyle adlandırılmış
+# bir alt dizine bir kez dönüştürülür; karşılaştırmalar workbook'u openpyxl ile yeniden ayrıştırmak yerine
+# buradaki .npy dizilerini okur.
+EXCEL_SIDECAR_DIR = os.environ.get("EXCEL_SIDECAR_DIR", "ExcelSidecars")
+
+# Dosya düzeni değişirse artırılır; eski sürümün dizinleri kullanılmaz ve temizlikte silinir
+_SIDECAR_VERSION = "1"
+_META_FILE = "meta.json"
+_TMP_SUFFIX = ".tmp"
+
+# Sütun türleri
+_KIND_NATIVE = "native"  # sayı/bool/tarih: numpy dizisi olduğu gibi, mmap ile açılır
+_KIND_TEXT = "text"      # yalnızca metin (ve boş) hücreler: tek UTF-8 tampon + karakter ofsetleri + boş maskesi
+_KIND_OBJECT = "object"  # karışık türler: pickle'lı object dizisi (mmap edilemez)
+
+
+def sidecar_path(content_hash: str) -> str:
+    return os.path.join(EXCEL_SIDECAR_DIR, f"{content_hash}_v{_SIDECAR_VERSION}")
+
+
+def _label(column):
+    # JSON'a yazılabilen sütun adları olduğu gibi, diğerleri (ör. tarih başlıkları) metin olarak saklanır
+    return column if isinstance(column, (str, int, float)) and not isinstance(column, bool) else str(column)
+
+
+def _write_column(dir_path: str, prefix: str, series: pd.Series) -> dict:
+    values = series.to_numpy()
+    if values.dtype.kind in "biufcmM":
+        np.save(os.path.join(dir_path, f"{prefix}.npy"), values)
+        return {"kind": _KIND_NATIVE}
+
+    nulls = series.isna().to_numpy()
+    present = values[~nulls]
+    if all(type(v) is str for v in present):
+        texts = ["" if null else value for value, null in zip(values.tolist(), nulls.tolist())]
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), out=offsets[1:])
+        with open(os.path.join(dir_path, f"{prefix}.txt"), "wb") as f:
+            f.write("".join(texts).encode("utf-8"))
+        np.save(os.path.join(dir_path, f"{prefix}.offsets.npy"), offsets)
+        np.save(os.path.join(dir_path, f"{prefix}.nulls.npy"), nulls)
+        return {"kind": _KIND_TEXT, "dtype": str(series.dtype)}
+
+    np.save(os.path.join(dir_path, f"{prefix}.npy"), values.astype(object), allow_pickle=True)
+    return {"kind": _KIND_OBJECT}
+
+
+def _read_column(dir_path: str, prefix: str, spec: dict, rows: int):
+    kind = spec["kind"]
+    if kind == _KIND_NATIVE:
+        # Dosyaya eşlenmiş bellek; düz ndarray görünümü verilir (veri kopyalanmaz, sayfalar okundukça yüklenir)
+        return np.load(os.path.join(dir_path, f"{prefix}.npy"), mmap_mode="r").view(np.ndarray)
+    if kind == _KIND_OBJECT:
+        return np.load(os.path.join(dir_path, f"{prefix}.npy"), allow_pickle=True)
+
+    with open(os.path.join(dir_path, f"{prefix}.txt"), "rb") as f:
+        text = f.read().decode("utf-8")  # tek seferde çözülür, hücreler karakter ofsetleriyle dilimlenir
+    offsets = np.load(os.path.join(dir_path, f"{prefix}.offsets.npy")).tolist()
+    values = np.empty(rows, dtype=object)
+    values[:] = [text[offsets[i]:offsets[i + 1]] for i in range(rows)]
+    values[np.load(os.path.join(dir_path, f"{prefix}.nulls.npy"))] = np.nan
+    try:
+        return pd.array(values, dtype=spec.get("dtype", "object"))
+    except (TypeError, ValueError):
+        return values
+
+
+def build(path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Excel dosyasının tüm sayfalarını bir kez pd.read_excel ile okuyup sütun sütun sidecar dizinine yazar.
+    Sidecar zaten varsa dosya okunmaz. Dizin geçici adla yazılıp yeniden adlandırılır; yarım kalan yazım
+    kullanılmaz. Sidecar dizininin yolunu döndürür.
+    """
+    content_hash = content_hash or file_sha256(path)
+    target = sidecar_path(content_hash)
+    if os.path.exists(os.path.join(target, _META_FILE)):
+        return target
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    os.makedirs(EXCEL_SIDECAR_DIR, exist_ok=True)
+    tmp_dir = f"{target}.{uuid.uuid4().hex}{_TMP_SUFFIX}"
+    os.makedirs(tmp_dir)
+    try:
+        meta = {"version": _SIDECAR_VERSION, "sheets": []}
+        for sheet_index, (sheet_name, df) in enumerate(sheets.items()):
+            columns = []
+            for column_index, column in enumerate(df.columns):
+                spec = _write_column(tmp_dir, f"s{sheet_index}_c{column_index}", df.iloc[:, column_index])
+                columns.append(dict(spec, name=_label(column)))
+            meta["sheets"].append({"name": _label(sheet_name), "rows": len(df), "columns": columns})
+        with open(os.path.join(tmp_dir, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        try:
+            os.rename(tmp_dir, target)
+        except OSError:
+            pass  # aynı içerik başka bir istekte eşzamanlı dönüştürüldü
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return target
+
+
+def _load_meta(dir_path: str) -> dict:
+    with open(os.path.join(dir_path, _META_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_sheet(dir_path: str, sheet_index: int, sheet: dict) -> pd.DataFrame:
+    rows = sheet["rows"]
+    data = {
+        column_index: _read_column(dir_path, f"s{sheet_index}_c{column_index}", spec, rows)
+        for column_index, spec in enumerate(sheet["columns"])
+    }
+    # Sütunlar konumla kurulup sonra adlandırılır (aynı adlı sütunlar da korunur); mmap dizileri kopyalanmaz
+    df = pd.DataFrame(data, index=pd.RangeIndex(rows), copy=False)
+    df.columns = [spec["name"] for spec in sheet["columns"]]
+    return df
+
+
+def list_sheets(dir_path: str) -> List[dict]:
+    """
+    Sidecar'daki sayfaların bilgisi (workbook sırasıyla): [{"name", "rows", "columns"}]
+    """
+    return _load_meta(dir_path)["sheets"]
+
+
+def load_sheet(dir_path: str, sheet_name) -> pd.DataFrame:
+    """
+    Oluşturulmuş bir sidecar dizininden tek sayfayı okur (ör. dosyanın özetini yeniden hesaplamayan işçi süreçler).
+    """
+    for sheet_index, sheet in enumerate(list_sheets(dir_path)):
+        if sheet["name"] == sheet_name:
+            return _load_sheet(dir_path, sheet_index, sheet)
+    raise ValueError(f"Sayfa bulunamadı: {sheet_name}")
+
+
+def read_sheets(path: str, sheets: Optional[Iterable[Union[str, int]]] = None) -> Dict[object, pd.DataFrame]:
+    """
+    pd.read_excel(path, sheet_name=None) karşılığı: {sayfa adı: DataFrame}. Veriler sidecar'dan okunur;
+    sidecar yoksa önce oluşturulur. sheets verilirse yalnızca o sayfalar (ad veya 0 tabanlı sıra) döner.
+    """
+    dir_path = build(path)
+    wanted = None if sheets is None else set(sheets)
+    result = {}
+    for sheet_index, sheet in enumerate(list_sheets(dir_path)):
+        if wanted is None or sheet["name"] in wanted or sheet_index in wanted:
+            result[sheet["name"]] = _load_sheet(dir_path, sheet_index, sheet)
+    return result
+
+
+def read_frame(path: str, sheet: Union[str, int] = 0) -> pd.DataFrame:
+    """
+    pd.read_excel(path, sheet_name=sheet) karşılığı (varsayılan ilk sayfa), sidecar'dan.
+    """
+    frames = read_sheets(path, [sheet])
+    if not frames:
+        raise ValueError(f"Sayfa bulunamadı: {sheet}")
+    return next(iter(frames.values()))
+
+
+def sheet_names(path: str) -> List[object]:
+    return [sheet["name"] for sheet in list_sheets(build(path))]
+
+
+def ensure_sidecars(paths: Iterable[str]) -> int:
+    """
+    Verilen Excel dosyalarının sidecar'larını (yoksa) oluşturur. Tarama ve yüklemeden sonra çağrılır;
+    okunamayan dosyalar atlanır (ilk karşılaştırmada yeniden denenir). Oluşturulan/var olan sayısını döndürür.
+    """
+    done = 0
+    for path in paths:
+        try:
+            build(path)
+            done += 1
+        except Exception as e:
+            print(f"Excel sidecar oluşturulamadı: {path} - {e}")
+    return done
+
+
+def prune(keep_hashes: Iterable[str]) -> int:
+    """
+    İçerik özeti keep_hashes içinde olmayan (dosyası silinmiş/değişmiş) veya eski sürümlü sidecar dizinlerini
+    siler. Yazımı süren geçici dizinlere dokunulmaz. Silinen dizin sayısını döndürür.
+    """
+    if not os.path.isdir(EXCEL_SIDECAR_DIR):
+        return 0
+    keep = {f"{content_hash}_v{_SIDECAR_VERSION}" for content_hash in keep_hashes if content_hash}
+    removed = 0
+    with os.scandir(EXCEL_SIDECAR_DIR) as it:
+        for entry in it:
+            if entry.is_dir() and not entry.name.endswith(_TMP_SUFFIX) and entry.name not in keep:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
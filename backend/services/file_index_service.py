@@ -0,0 +1,151 @@
+import os
+import stat
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from codesys_doc_tracker import db
+from codesys_doc_tracker.models.file_index_model import FileIndex
+from services import diff_cache
+
+
+# Tam tarama, dosya izleyicisi ve yüklemeler aynı işlemde eşzamanlı kayıt eklemesin diye
+# senkronizasyon adımları bu kilit altında çalışır.
+sync_lock = threading.RLock()
+
+
+class ScannedFile(NamedTuple):
+    abs_path: str
+    size: int
+    mtime_ns: int
+
+
+class IndexDelta(NamedTuple):
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+
+
+def _join_db_path(prefix: str, name: str) -> str:
+    return f"{prefix}/{name}" if prefix else name
+
+
+def scan_tree(base_dir: str, exts: Tuple[str, ...], recursive: bool = True) -> Dict[str, ScannedFile]:
+    """
+    Dizini os.scandir ile dolaşır ve uzantısı uyan dosyaları {db yolu: ScannedFile} olarak döndürür.
+    DB yolu, _path_for_db ile aynı biçimdedir ('<dizin adı>/<alt/yol>'), fakat relpath/normpath
+    çağrılmadan dolaşma sırasında oluşturulur. Dizin sembolik bağlantılarına (os.walk gibi) girilmez.
+    """
+    base_name = os.path.basename(base_dir.rstrip("\\/"))
+    found: Dict[str, ScannedFile] = {}
+    stack = [(base_dir, base_name)]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append((entry.path, _join_db_path(prefix, entry.name)))
+                    elif entry.name.lower().endswith(exts) and entry.is_file():
+                        st = entry.stat()
+                        found[_join_db_path(prefix, entry.name)] = ScannedFile(
+                            entry.path, st.st_size, st.st_mtime_ns
+                        )
+                except OSError:
+                    continue  # tarama sırasında silinen dosya
+    return found
+
+
+def _content_hash(abs_path: str) -> Optional[str]:
+    try:
+        return diff_cache.sha256_of_file(abs_path)
+    except OSError:
+        return None
+
+
+def _update_index(kind: str, indexed: Dict[str, Tuple[int, int, int, str]],
+                  present: Dict[str, ScannedFile]) -> IndexDelta:
+    added_rows: List[dict] = []
+    changed_rows: List[dict] = []
+    known_hashes: Dict[str, Tuple[int, int, str]] = {}
+
+    for db_path, f in present.items():
+        prev = indexed.get(db_path)
+        if prev is not None and prev[1] == f.size and prev[2] == f.mtime_ns:
+            content_hash = prev[3]
+        else:
+            content_hash = _content_hash(f.abs_path)
+            row = {"path": db_path, "size": f.size, "mtime_ns": f.mtime_ns, "content_hash": content_hash}
+            if prev is None:
+                added_rows.append(row)
+            else:
+                changed_rows.append(dict(row, id=prev[0]))
+        if content_hash:
+            known_hashes[db_path] = (f.size, f.mtime_ns, content_hash)
+    diff_cache.remember_sha256_many(known_hashes)
+
+    removed = [path for path in indexed if path not in present]
+    if added_rows or changed_rows or removed:
+        FileIndex.apply_changes(kind, added_rows, changed_rows, removed)
+        db.session.commit()
+
+    return IndexDelta(
+        added=[row["path"] for row in added_rows],
+        changed=[row["path"] for row in changed_rows],
+        removed=removed,
+    )
+
+
+def sync_index(kind: str, base_name: str, scanned: Dict[str, ScannedFile]) -> IndexDelta:
+    """
+    Taranan dosyaları kalıcı dosya indeksiyle karşılaştırır. Boyutu ve mtime'ı değişmeyen dosyalar okunmaz;
+    yalnızca yeni veya değişmiş dosyaların içerik özeti hesaplanır. İndeks toplu ifadelerle güncellenir.
+    Bilinen özetler diff önbelleğine de verilir; diff üretimi bu dosyaları özet için yeniden okumaz.
+    """
+    return _update_index(kind, FileIndex.load(kind, base_name), scanned)
+
+
+def sync_paths(kind: str, entries: Dict[str, str]) -> Tuple[Dict[str, ScannedFile], IndexDelta]:
+    """
+    Yalnızca verilen dosyaları ({db yolu: mutlak yol}) indeksle eşitler; dizinin geri kalanına dokunmaz.
+    Diskte artık bulunmayan dosyalar indeksten düşer. Dönüş: (diskte bulunanlar, indeks farkı)
+    """
+    present: Dict[str, ScannedFile] = {}
+    for db_path, abs_path in entries.items():
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            present[db_path] = ScannedFile(abs_path, st.st_size, st.st_mtime_ns)
+    return present, _update_index(kind, FileIndex.load_paths(kind, entries), present)
+
+
+def record_hashed_files(kind: str, files: Dict[str, Tuple[str, str]]) -> None:
+    """
+    Özeti yazılırken hesaplanmış dosyaları ({db yolu: (mutlak yol, özet)}) indekse işler.
+    Sonraki taramada bu dosyalar değişmemiş görünür ve özet için yeniden okunmaz.
+    """
+    if not files:
+        return
+    with sync_lock:
+        indexed = FileIndex.load_paths(kind, files)
+        added_rows: List[dict] = []
+        changed_rows: List[dict] = []
+        known_hashes: Dict[str, Tuple[int, int, str]] = {}
+        for db_path, (abs_path, content_hash) in files.items():
+            st = os.stat(abs_path)
+            row = {"path": db_path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "content_hash": content_hash}
+            prev = indexed.get(db_path)
+            if prev is None:
+                added_rows.append(row)
+            else:
+                changed_rows.append(dict(row, id=prev[0]))
+            known_hashes[db_path] = (st.st_size, st.st_mtime_ns, content_hash)
+        FileIndex.apply_changes(kind, added_rows, changed_rows, [])
+        db.session.commit()
+    diff_cache.remember_sha256_many(known_hashes)
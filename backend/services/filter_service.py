@@ -1,22 +1,92 @@
+import csv
+import importlib.util
 import os
-import re
-import pandas as pd
-from datetime import datetime
-from html import unescape
+import threading
+import uuid
+from typing import Iterable, Iterator, List, Optional
 
+from codesys_doc_tracker.models.signal_model import Signal, SignalName
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
-from services.xmlfile_service import DEFAULT_EXPORT_DIR
+from services import document_cache
+from services.signal_index_service import index_pending_signals
+from services import excel_sidecar
+from services.diff_cache import file_sha256
+from services.excel_service import get_file_path_by_id as get_excel_path_by_id
+from services.signal_crosscheck import JOIN_NAME, crosscheck, xml_signal_frame
+from services.signal_parser import (
+    MATCH_EXACT, SignalMatcher, SignalRow, extract_st_text, iter_lines, iter_signal_rows, parse_signal_rows
+)
 
 # Projenin temel dizinini dinamik olarak bul
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-# Excel dışa aktarma klasörünün tam yolunu oluştur ve oluştur
-EXPORT_DIR = os.path.join(BASE_DIR, "backend/ExcelExports")
-os.makedirs(EXPORT_DIR, exist_ok=True)
+# Sinyal tablosu dışa aktarımlarının önbellek klasörü. Dosya adı kaynak XML'in içerik özetinden türetilir;
+# aynı içerik tekrar istendiğinde dosya yeniden üretilmeden diskten sunulur. (Excel yükleme klasörü
+# ExcelExports'tan ayrıdır: dışa aktarımlar Excel dosya listesine karışmaz.)
+SIGNAL_EXPORT_DIR = os.environ.get("SIGNAL_EXPORT_DIR", os.path.join(BASE_DIR, "backend", "SignalExports"))
+os.makedirs(SIGNAL_EXPORT_DIR, exist_ok=True)
+# Önbellek klasörünün toplam boyut sınırı (byte). 0 verilirse boyut tabanlı temizlik yapılmaz.
+SIGNAL_EXPORT_MAX_BYTES = int(os.environ.get("SIGNAL_EXPORT_MAX_BYTES", str(256 * 1024 * 1024)))
 
-def extract_filtered_signals(file_id: int, keywords: list) -> tuple:
+EXPORT_FORMAT_XLSX = "xlsx"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = (EXPORT_FORMAT_XLSX, EXPORT_FORMAT_CSV, EXPORT_FORMAT_PARQUET)
+
+# Sütunlar veya yazım biçimi değişirse artırılır; eski önbellek dosyaları kullanılmaz
+_EXPORT_VERSION = "1"
+_EXPORT_COLUMNS = ["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default"]
+_PARQUET_BATCH_ROWS = 10_000
+_export_lock = threading.Lock()
+
+def _load_st_text(file_id: int, path: str) -> str:
+    """
+    Dosyadaki ilk ST/xhtml bloğunun unescape edilmiş metni; blok yoksa boş metin.
+    Metin ve sonuç belge önbelleğinde tutulur.
+    """
+    def load():
+        return extract_st_text(document_cache.read_text(file_id, path))
+    return document_cache.get(file_id, path, document_cache.KIND_ST_TEXT, load)
+
+
+def _load_signal_rows(file_id: int, path: str) -> List[SignalRow]:
+    """
+    ST bloğundaki tüm sinyal satırları: (ID, ad, Max, Min, Def, Resolution, Offset).
+    Filtreleme ve Excel'e aktarma aynı tabloyu önbellekten kullanır.
+    """
+    def load():
+        return parse_signal_rows(_load_st_text(file_id, path))
+    return document_cache.get(file_id, path, document_cache.KIND_SIGNALS, load)
+
+
+def _load_signal_frame(file_id: int, path: str):
+    """
+    Sinyal tablosunun DataFrame hali (Excel çapraz kontrolü için); satırlarla aynı şekilde önbellekte tutulur.
+    """
+    def load():
+        return xml_signal_frame(_load_signal_rows(file_id, path))
+    return document_cache.get(file_id, path, document_cache.KIND_SIGNAL_FRAME, load)
+
+
+def _signal_dict(row: SignalRow) -> dict:
+    signal_id, name, max_value, min_value, default, resolution, offset = row
+    return {
+        "ID": signal_id,
+        "keyword": name,
+        "Max": max_value,
+        "Min": min_value,
+        "Def": default,
+        "Resolution": resolution,
+        "Offset": offset
+    }
+
+
+def extract_filtered_signals(file_id: int, keywords: list, match: str = MATCH_EXACT) -> tuple:
     """
     XML dosyasından anahtar kelimelere göre sinyal verilerini çeker.
+    match: exact (varsayılan) | prefix | glob. Birebir aramalar dosya yerine signals tablosundan
+    (xmlfile_id, name) indeksiyle cevaplanır; önek/glob aramaları dosyanın önbellekteki sinyal tablosu
+    üzerinde trie eşleştiricisiyle yapılır.
     """
     xml_file = XMLFile.query.get(file_id)
     if not xml_file:
@@ -28,61 +98,209 @@ def extract_filtered_signals(file_id: int, keywords: list) -> tuple:
     if not os.path.exists(normalized_path):
         return False, f"Dosya yolu bulunamadı: {normalized_path}"
 
-    results = []
-    
     try:
-        with open(normalized_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        st_block_pattern = re.compile(r'<ST>.*?<xhtml[^>]*>(.*?)</xhtml>.*?</ST>', re.DOTALL | re.IGNORECASE)
-        match = st_block_pattern.search(content)
-
-        if match:
-            st_content = match.group(1)
-            st_content = unescape(st_content)
-
-            current_id = ""
-            lines = st_content.split('\n')
-            for line in lines:
-                # Düzeltme: Onaltılık (hexadecimal) ID'leri çeken regex
-                id_match = re.search(r'ID:([0-9a-fA-F]+)', line)
-                if id_match:
-                    current_id = id_match.group(1)
-                
-                signal_match = re.search(
-                    r'//-*\s*SIGNAL\s*->\s*(?P<signal_name>\S+)\s*'
-                    r'Max\s*:\s*(?P<max>.*?)\s*'
-                    r'Min\s*:\s*(?P<min>.*?)\s*'
-                    r'Def\s*:\s*(?P<def>.*?)\s*'
-                    r'Resolution\s*:\s*(?P<res>.*?)\s*'
-                    r'Offset\s*:\s*(?P<off>.*?)\s*$',
-                    line
-                )
-                
-                if signal_match:
-                    signal_name = signal_match.group('signal_name')
-                    if any(keyword.strip() == signal_name.strip() for keyword in keywords):
-                        results.append({
-                            "ID": current_id,
-                            "keyword": signal_name,
-                            "Max": signal_match.group('max').strip(),
-                            "Min": signal_match.group('min').strip(),
-                            "Def": signal_match.group('def').strip(),
-                            "Resolution": signal_match.group('res').strip(),
-                            "Offset": signal_match.group('off').strip()
-                        })
-        else:
+        matcher = SignalMatcher(keywords, match)
+        # Sinyal tablosu kayıt sırasında signals tablosuna çıkarılır; eksikse (ör. eski kayıt) şimdi çıkarılır
+        if matcher.is_exact and xml_file.content_hash is not None:
+            if xml_file.signals_hash != xml_file.content_hash:
+                index_pending_signals([file_id])
+            if xml_file.signals_hash == xml_file.content_hash:
+                results = Signal.search(file_id, matcher.names)
+                if results or Signal.count_for_file(file_id):
+                    return results, None
+
+        # İndeks yoksa, dosyada hiç sinyal yoksa veya önek/glob aramasında: dosyanın önbellekteki tablosu
+        if not _load_st_text(file_id, normalized_path):
             return False, "ST bloğu veya xhtml bloğu XML dosyasında bulunamadı."
-            
+
+        results = [_signal_dict(row) for row in _load_signal_rows(file_id, normalized_path) if matcher(row[1])]
     except Exception as e:
         return False, f"Filtreleme fonksiyonu içinde hata: {e}"
 
     return results, None
 
-def export_signals_to_excel(file_id: int) -> tuple:
+def search_signals(query: str, mode: str = "exact", limit: int = 50, offset: int = 0) -> dict:
+    """
+    Sinyal adını tüm kayıtlı XML dosyalarında arar (exact / prefix / substring, büyük/küçük harf duyarsız).
+    Sonuçlar dosya bazında gruplanır ve dosya bazında sayfalanır. Geçersiz sorgu/mod için ValueError fırlatır.
+    """
+    query = (query or "").strip()
+    if not query:
+        raise ValueError("Arama metni gerekli.")
+    if mode not in SignalName.SEARCH_MODES:
+        raise ValueError(f"Geçersiz arama modu: {mode}")
+
+    groups, total_files, total_hits = Signal.search_all(query, mode, limit, offset)
+    paths = dict(XMLFile.query.with_entities(XMLFile.id, XMLFile.file_path)
+                 .filter(XMLFile.id.in_([file_id for file_id, _ in groups])).all()) if groups else {}
+    return {
+        "query": query,
+        "mode": mode,
+        "offset": offset,
+        "limit": limit,
+        "total_files": total_files,
+        "total_hits": total_hits,
+        "files": [
+            {
+                "file_id": file_id,
+                "file_path": paths.get(file_id),
+                "file_name": os.path.basename(paths.get(file_id) or ""),
+                "hits": hits,
+            }
+            for file_id, hits in groups
+        ],
+    }
+
+# Zaman çizelgesinde sürümler arasında karşılaştırılan alanlar
+_HISTORY_FIELDS = ("ID", "Max", "Min", "Def", "Resolution", "Offset")
+
+
+def get_signal_history(name: str) -> dict:
+    """
+    Bir sinyalin ID ve Max/Min/Def/Resolution/Offset değerlerinin export sürümleri boyunca (yüklenme tarihine
+    göre) nasıl değiştiğini döndürür. Kayıt sırasında çıkarılmış sinyal tablolarından tek sorguyla hesaplanır;
+    dosyalar yeniden okunmaz. Her sürüm için bir önceki sürüme göre değişen alanlar 'changes' içinde verilir.
+    Bir dosyada aynı sinyal birden fazla kez geçiyorsa ilki esas alınır, tekrar sayısı 'occurrences'tadır.
+    """
+    name = (name or "").strip()
+    if not name:
+        raise ValueError("Sinyal adı gerekli.")
+
+    versions = []
+    for file_id, file_path, upload_date, signal in Signal.history(name):
+        if versions and versions[-1]["file_id"] == file_id:
+            versions[-1]["occurrences"] += 1
+            continue
+        values = {field: signal[field] for field in _HISTORY_FIELDS}
+        previous = versions[-1]["values"] if versions else None
+        if previous is None:
+            status, changes = "added", {}
+        else:
+            changes = {field: {"from": previous[field], "to": values[field]}
+                       for field in _HISTORY_FIELDS if previous[field] != values[field]}
+            status = "changed" if changes else "unchanged"
+        versions.append({
+            "file_id": file_id,
+            "file_name": os.path.basename(file_path),
+            "upload_date": upload_date.isoformat() if upload_date else None,
+            "values": values,
+            "status": status,
+            "changes": changes,
+            "occurrences": 1,
+        })
+
+    return {
+        "name": name,
+        "versions": versions,
+        "total_versions": len(versions),
+        "change_count": sum(1 for v in versions if v["status"] == "changed"),
+    }
+
+def _export_rows(rows: Iterable[SignalRow]) -> Iterator[list]:
+    # Sütun sırası: ID, ad, Resolution, Offset, Min, Max, Default
+    for signal_id, name, max_value, min_value, default, resolution, offset in rows:
+        yield [signal_id, name, resolution, offset, min_value, max_value, default]
+
+
+def _write_xlsx(path: str, rows: Iterable[list]) -> int:
+    """
+    openpyxl'in write_only kipinde yazar: satırlar tutulmadan doğrudan sayfanın XML akışına eklenir.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(_EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def _write_csv(path: str, rows: Iterable[list]) -> int:
+    # utf-8-sig: Excel Türkçe karakterleri BOM ile doğru açar
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(_EXPORT_COLUMNS)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_parquet(path: str, rows: Iterable[list]) -> int:
+    """
+    pyarrow ile _PARQUET_BATCH_ROWS satırlık parçalar (row group) halinde yazar. pyarrow isteğe bağlıdır.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in _EXPORT_COLUMNS])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= _PARQUET_BATCH_ROWS:
+                writer.write_table(pa.Table.from_arrays([list(col) for col in zip(*batch)], schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_arrays([list(col) for col in zip(*batch)], schema=schema))
+            count += len(batch)
+    return count
+
+
+_EXPORT_WRITERS = {
+    EXPORT_FORMAT_XLSX: _write_xlsx,
+    EXPORT_FORMAT_CSV: _write_csv,
+    EXPORT_FORMAT_PARQUET: _write_parquet,
+}
+
+
+def _evict_exports(keep: str) -> int:
     """
-    Bir XML dosyasındaki tüm sinyalleri çeker ve Excel'e dönüştürür.
+    Önbellek klasörü SIGNAL_EXPORT_MAX_BYTES'ı aşarsa en uzun süredir kullanılmayan dosyaları siler.
     """
+    if SIGNAL_EXPORT_MAX_BYTES <= 0:
+        return 0
+    entries = []
+    with os.scandir(SIGNAL_EXPORT_DIR) as it:
+        for entry in it:
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= SIGNAL_EXPORT_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def export_signals_to_excel(file_id: int, fmt: str = EXPORT_FORMAT_XLSX) -> tuple:
+    """
+    Bir XML dosyasındaki tüm sinyalleri dışa aktarır. fmt: xlsx (varsayılan) | csv | parquet (pyarrow gerekir).
+    Satırlar ayrıştırıcıdan tek tek doğrudan yazıcıya akar; tablo bellekte DataFrame olarak kurulmaz.
+    Çıktı SIGNAL_EXPORT_DIR'de kaynak dosyanın içerik özetiyle adlandırılır: aynı içerik için tekrar
+    istenen dışa aktarım diskteki dosyadan döner. Dönüş: (True, dosya yolu) veya (False, hata mesajı)
+    """
+    if fmt not in EXPORT_FORMATS:
+        return False, f"Geçersiz dışa aktarma biçimi: {fmt}"
+    if fmt == EXPORT_FORMAT_PARQUET and importlib.util.find_spec("pyarrow") is None:
+        return False, "Parquet dışa aktarımı için pyarrow kurulu olmalı."
+
     xml_file = XMLFile.query.get(file_id)
     if not xml_file:
         return False, "Dosya bulunamadı."
@@ -94,56 +312,73 @@ def export_signals_to_excel(file_id: int) -> tuple:
         return False, f"Dosya yolu bulunamadı: {normalized_path}"
 
     try:
-        with open(normalized_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
+        content_hash = file_sha256(normalized_path)
+    except OSError as e:
         return False, f"Dosya okunamadı: {str(e)}"
 
-    data = []
-    st_block_pattern = re.compile(r'<ST>.*?<xhtml[^>]*>(.*?)</xhtml>.*?</ST>', re.DOTALL | re.IGNORECASE)
-    match = st_block_pattern.search(content)
-
-    if match:
-        st_content = match.group(1)
-        st_content = unescape(st_content)
-        
-        current_id = ""
-        lines = st_content.split('\n')
-        for line in lines:
-            # Düzeltme: Onaltılık (hexadecimal) ID'leri çeken regex
-            id_match = re.search(r'ID:([0-9a-fA-F]+)', line)
-            if id_match:
-                current_id = id_match.group(1)
-            
-            signal_match = re.search(
-                r'//-*\s*SIGNAL\s*->\s*(?P<signal_name>\S+)\s*'
-                r'Max\s*:\s*(?P<max>.*?)\s*'
-                r'Min\s*:\s*(?P<min>.*?)\s*'
-                r'Def\s*:\s*(?P<def>.*?)\s*'
-                r'Resolution\s*:\s*(?P<res>.*?)\s*'
-                r'Offset\s*:\s*(?P<off>.*?)\s*$',
-                line
-            )
-            
-            if signal_match:
-                data.append([
-                    current_id,
-                    signal_match.group('signal_name'),
-                    signal_match.group('res').strip(),
-                    signal_match.group('off').strip(),
-                    signal_match.group('min').strip(),
-                    signal_match.group('max').strip(),
-                    signal_match.group('def').strip()
-                ])
-
-    if not data:
-        return False, "Sinyal verisi bulunamadı"
-
-    df = pd.DataFrame(data, columns=["ID", "Signal Name", "Resolution", "Offset", "Min", "Max", "Default"])
-
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    excel_filename = f"signal_table_{file_id}_{timestamp}.xlsx"
-    excel_path = os.path.join(EXPORT_DIR, excel_filename)
-    df.to_excel(excel_path, index=False)
-
-    return True, excel_path
\ No newline at end of file
+    export_path = os.path.join(SIGNAL_EXPORT_DIR, f"signal_table_{content_hash}_v{_EXPORT_VERSION}.{fmt}")
+    if os.path.exists(export_path):
+        try:
+            os.utime(export_path, None)  # boyut tabanlı temizlikte en son kullanılanlar en sona kalsın
+        except OSError:
+            pass
+        return True, export_path
+
+    cached_rows: Optional[List[SignalRow]] = document_cache.peek(file_id, normalized_path, document_cache.KIND_SIGNALS)
+    try:
+        if cached_rows is not None:
+            rows = iter(cached_rows)
+        else:
+            rows = iter_signal_rows(iter_lines(_load_st_text(file_id, normalized_path)))
+    except (OSError, UnicodeDecodeError) as e:
+        return False, f"Dosya okunamadı: {str(e)}"
+
+    # Eşzamanlı istekler aynı hedefe yazabilir; her biri kendi geçici dosyasına yazar ve os.replace ile taşır
+    tmp_path = f"{export_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        count = _EXPORT_WRITERS[fmt](tmp_path, _export_rows(rows))
+        if not count:
+            return False, "Sinyal verisi bulunamadı"
+        os.replace(tmp_path, export_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    with _export_lock:
+        _evict_exports(keep=export_path)
+    return True, export_path
+
+
+def crosscheck_signals_with_excel(xml_file_id: int, excel_file_id: int, sheet=0, join: str = JOIN_NAME,
+                                  columns: Optional[dict] = None, offset: int = 0,
+                                  limit: Optional[int] = None) -> tuple:
+    """
+    XML dosyasındaki SIGNAL tablosunu bir Excel sinyal tablosuyla (varsayılan ilk sayfa) karşılaştırır:
+    Max/Min/Def/Resolution/Offset değeri farklı olan sinyaller ve yalnızca bir tarafta bulunanlar
+    (bkz. signal_crosscheck.crosscheck). İki taraf da önbellekten okunur: XML tablosu belge önbelleğinden,
+    Excel tablosu dosyanın sidecar'ından. Dönüş: (sonuç, None) veya (None, hata mesajı);
+    dosya kayıtlarından biri yoksa FileNotFoundError fırlatılır.
+    """
+    xml_file = XMLFile.query.get(xml_file_id)
+    if not xml_file:
+        raise FileNotFoundError("XML dosyası bulunamadı.")
+    xml_path = os.path.normpath(xml_file.file_path)
+    excel_path = get_excel_path_by_id(excel_file_id)
+    if not excel_path:
+        raise FileNotFoundError("Excel dosyası bulunamadı.")
+
+    try:
+        xml_df = _load_signal_frame(xml_file_id, xml_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"XML dosyası okunamadı: {str(e)}"
+    try:
+        excel_df = excel_sidecar.read_frame(excel_path, sheet)
+    except Exception as e:
+        return None, f"Excel dosyası okunamadı: {str(e)}"
+
+    try:
+        result = crosscheck(xml_df, excel_df, columns=columns, join=join, offset=offset, limit=limit)
+    except ValueError as e:
+        return None, str(e)
+    result.update(xml_file=os.path.basename(xml_path), excel_file=os.path.basename(excel_path))
+    return result, None
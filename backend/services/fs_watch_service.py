@@ -0,0 +1,333 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from flask import Flask
+
+from codesys_doc_tracker import db
+from services import excel_service, xmlfile_service
+from services.file_index_service import scan_tree
+
+# İzleme modu: "off" (varsayılan), "auto" (Linux'ta inotify, olmazsa yoklama), "inotify" veya "poll"
+FS_WATCH_MODE = os.environ.get("FS_WATCH", "off").strip().lower()
+
+# Son olaydan sonra bu kadar sessizlik olunca birikmiş değişiklikler uygulanır (saniye)
+FS_WATCH_DEBOUNCE = float(os.environ.get("FS_WATCH_DEBOUNCE", "0.5"))
+
+# Olaylar hiç durmasa bile en geç bu kadar sürede bir uygulama yapılır (saniye)
+FS_WATCH_MAX_DELAY = float(os.environ.get("FS_WATCH_MAX_DELAY", "5"))
+
+# Yoklama modunda dizinlerin yeniden stat'lanma aralığı (saniye)
+FS_WATCH_POLL_INTERVAL = float(os.environ.get("FS_WATCH_POLL_INTERVAL", "2"))
+
+# inotify olay maskeleri (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_DELETE_SELF | _IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Bir dizinin tamamının yeniden taranması gerektiğini bildiren olay yolu
+FULL_RESCAN = None
+
+
+class WatchedDir(NamedTuple):
+    export_dir: str
+    exts: Tuple[str, ...]
+    apply_changes: Callable[[List[str]], Dict[str, int]]
+    full_scan: Callable[[], Dict[str, int]]
+
+
+# ---------- Arka uçlar ----------
+
+class _PollingBackend:
+    """
+    Dizinleri belirli aralıklarla scan_tree ile stat'lar ve boyutu/mtime'ı değişen,
+    yeni gelen veya kaybolan dosyaları bildirir. inotify olmayan sistemler ve ağ dizinleri için.
+    """
+
+    name = "poll"
+
+    def __init__(self, watches: List[WatchedDir], interval: float = FS_WATCH_POLL_INTERVAL):
+        self._watches = watches
+        self._interval = interval
+        self._snapshots = [self._snapshot(w) for w in watches]
+        self._next_poll = time.monotonic() + interval
+
+    @staticmethod
+    def _snapshot(watch: WatchedDir) -> Dict[str, Tuple[int, int]]:
+        return {f.abs_path: (f.size, f.mtime_ns)
+                for f in scan_tree(watch.export_dir, watch.exts).values()}
+
+    def wait(self, timeout: float) -> List[Tuple[int, Optional[str]]]:
+        delay = self._next_poll - time.monotonic()
+        if delay > 0:
+            time.sleep(min(delay, timeout))
+            if time.monotonic() < self._next_poll:
+                return []
+        self._next_poll = time.monotonic() + self._interval
+
+        events = []
+        for i, watch in enumerate(self._watches):
+            current = self._snapshot(watch)
+            previous = self._snapshots[i]
+            events.extend((i, path) for path, stat in current.items() if previous.get(path) != stat)
+            events.extend((i, path) for path in previous if path not in current)
+            self._snapshots[i] = current
+        return events
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyBackend:
+    """
+    Linux inotify arayüzünü ctypes ile kullanır (ek paket gerekmez). Alt dizinler tek tek izlenir;
+    yeni bir alt dizin gelince ona da izleme eklenir ve içindeki dosyalar bildirilir.
+    Kuyruk taşması veya bir alt dizinin silinmesi/taşınması durumunda o dizin için tam tarama istenir.
+    """
+
+    name = "inotify"
+
+    def __init__(self, watches: List[WatchedDir]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+        self._watches = watches
+        self._wds: Dict[int, Tuple[int, str]] = {}  # wd -> (izleme sırası, dizin yolu)
+        try:
+            for i, watch in enumerate(watches):
+                self._add_tree(i, watch.export_dir, strict=True)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add_watch(self, watch_index: int, dir_path: str, strict: bool = False) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if strict:
+                raise OSError(err, f"inotify_add_watch başarısız: {dir_path}")
+            print(f"Dizin izlenemiyor: {dir_path} - {os.strerror(err)}")
+            return
+        self._wds[wd] = (watch_index, dir_path)
+
+    def _add_tree(self, watch_index: int, dir_path: str, strict: bool = False) -> None:
+        self._add_watch(watch_index, dir_path, strict=strict)
+        stack = [dir_path]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        self._add_watch(watch_index, entry.path)
+                        stack.append(entry.path)
+
+    def wait(self, timeout: float) -> List[Tuple[int, Optional[str]]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: List[Tuple[int, Optional[str]]] = []
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = os.fsdecode(data[pos:pos + name_len].rstrip(b"\0"))
+            pos += name_len
+
+            if mask & _IN_Q_OVERFLOW:
+                events.extend((i, FULL_RESCAN) for i in range(len(self._watches)))
+                continue
+            if mask & _IN_IGNORED:
+                self._wds.pop(wd, None)
+                continue
+            if wd not in self._wds:
+                continue
+            watch_index, dir_path = self._wds[wd]
+
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                if dir_path == self._watches[watch_index].export_dir:
+                    events.append((watch_index, FULL_RESCAN))
+                continue
+            path = os.path.join(dir_path, name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Yeni dizin: izlemeye al, içindeki (izleme eklenmeden önce oluşmuş olabilecek) dosyaları bildir
+                    self._add_tree(watch_index, path)
+                    events.extend((watch_index, f.abs_path)
+                                  for f in scan_tree(path, self._watches[watch_index].exts).values())
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    events.append((watch_index, FULL_RESCAN))
+                continue
+            if name.lower().endswith(self._watches[watch_index].exts):
+                events.append((watch_index, path))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+def _make_backend(mode: str, watches: List[WatchedDir]):
+    if mode in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return _InotifyBackend(watches)
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            print(f"inotify kullanılamıyor, yoklama moduna geçiliyor: {e}")
+    elif mode == "inotify":
+        raise OSError(errno.ENOSYS, "inotify yalnızca Linux'ta kullanılabilir")
+    return _PollingBackend(watches)
+
+
+# ---------- İzleyici ----------
+
+class DirectoryWatcher(threading.Thread):
+    """
+    Export dizinlerini izleyen arka plan iş parçacığı. Olayları dizin başına biriktirir;
+    FS_WATCH_DEBOUNCE kadar sessizlik olduğunda (en geç FS_WATCH_MAX_DELAY sonra) yalnızca
+    değişen dosyaları veritabanına yansıtır. Başlarken bir kez tam senkronizasyon yapar;
+    bu sayede sunucu kapalıyken gelen dosyalar da kaydedilir.
+    """
+
+    def __init__(self, app: Flask, watches: List[WatchedDir], mode: str = "auto",
+                 debounce: float = FS_WATCH_DEBOUNCE, max_delay: float = FS_WATCH_MAX_DELAY):
+        super().__init__(name="fs-watch", daemon=True)
+        self.app = app
+        self.watches = watches
+        self.debounce = debounce
+        self.max_delay = max_delay
+        # İzleme, ilk senkronizasyondan önce kurulur; arada gelen dosyalar kaçmaz
+        self.backend = _make_backend(mode, watches)
+        self._stop_event = threading.Event()
+        self._pending: List[Set[str]] = [set() for _ in watches]
+        self._full: List[bool] = [True] * len(watches)
+        self._first_event: Optional[float] = None
+        self._last_event: Optional[float] = None
+        self.flushes = 0
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        self.join(timeout)
+
+    def run(self) -> None:
+        self._flush()
+        try:
+            while not self._stop_event.is_set():
+                events = self.backend.wait(self._wait_timeout())
+                now = time.monotonic()
+                for watch_index, path in events:
+                    if path is FULL_RESCAN:
+                        self._full[watch_index] = True
+                    else:
+                        self._pending[watch_index].add(path)
+                if events:
+                    self._last_event = now
+                    if self._first_event is None:
+                        self._first_event = now
+                if self._first_event is not None and (
+                        now - self._last_event >= self.debounce or now - self._first_event >= self.max_delay):
+                    self._flush()
+        finally:
+            self.backend.close()
+
+    def _wait_timeout(self) -> float:
+        if self._first_event is None:
+            return 0.5  # stop() isteğini geciktirmemek için
+        now = time.monotonic()
+        return max(0.0, min(self._last_event + self.debounce, self._first_event + self.max_delay) - now)
+
+    def _flush(self) -> None:
+        self._first_event = self._last_event = None
+        with self.app.app_context():
+            for i, watch in enumerate(self.watches):
+                full, paths = self._full[i], self._pending[i]
+                self._full[i], self._pending[i] = False, set()
+                if not full and not paths:
+                    continue
+                try:
+                    result = watch.full_scan() if full else watch.apply_changes(sorted(paths))
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Dizin değişiklikleri uygulanamadı ({watch.export_dir}): {e}")
+                    continue
+                if result.get("added") or result.get("removed") or result.get("changed"):
+                    print(f"{watch.export_dir}: {result['added']} eklendi, {result['removed']} silindi, "
+                          f"{result['changed']} değişti.")
+            db.session.remove()
+        self.flushes += 1
+
+
+_watcher: Optional[DirectoryWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def default_watches() -> List[WatchedDir]:
+    xml_dir = xmlfile_service._export_base_dir()
+    excel_dir = excel_service._export_base_dir()
+    xmlfile_service._ensure_dir(xml_dir)
+    excel_service._ensure_dir(excel_dir)
+    return [
+        WatchedDir(xml_dir, tuple(xmlfile_service.ALLOWED_EXTS),
+                   xmlfile_service.apply_xml_changes, xmlfile_service.scan_and_sync_xml_files),
+        WatchedDir(excel_dir, tuple(excel_service.ALLOWED_EXTS),
+                   excel_service.apply_excel_changes, excel_service.scan_and_sync_excel_files),
+    ]
+
+
+def start_fs_watcher(app: Flask, mode: str = FS_WATCH_MODE) -> Optional[DirectoryWatcher]:
+    """
+    FS_WATCH açıksa XML ve Excel export dizinleri için izleyiciyi (işlem başına bir kez) başlatır.
+    İzleyici çalışıyorsa döndürür; kapalıysa None döner ve çağıran tam taramaya devam eder.
+    Birden fazla işlemle çalışan sunucularda yalnızca bir işlemde açılması yeterlidir.
+    """
+    global _watcher
+    if mode in ("", "0", "off", "false", "no"):
+        return None
+    if mode in ("1", "on", "true", "yes"):
+        mode = "auto"
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = DirectoryWatcher(app, default_watches(), mode=mode)
+            _watcher.start()
+            print(f"Dosya izleyici başlatıldı ({_watcher.backend.name}).")
+        return _watcher
+
+
+def stop_fs_watcher() -> None:
+    global _watcher
+    with _watcher_lock:
+        if _watcher is not None:
+            _watcher.stop()
+            _watcher = None
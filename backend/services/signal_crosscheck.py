@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services.excel_compare import json_value, page_slice
+from services.signal_parser import SignalRow
+
+# Karşılaştırılan değer alanları ve Excel sinyal tablosundaki varsayılan sütun adları
+# (export_signals_to_excel'in yazdığı başlıklarla aynı)
+FIELDS = ("Max", "Min", "Def", "Resolution", "Offset")
+DEFAULT_COLUMNS = {
+    "name": "Signal Name",
+    "id": "ID",
+    "Max": "Max",
+    "Min": "Min",
+    "Def": "Default",
+    "Resolution": "Resolution",
+    "Offset": "Offset",
+}
+
+JOIN_NAME = "name"        # yalnızca sinyal adı
+JOIN_ID_NAME = "id_name"  # ID ve ad birlikte (aynı ad farklı ID bloklarında geçiyorsa)
+JOIN_MODES = (JOIN_NAME, JOIN_ID_NAME)
+
+# Sayısal değerlerin eşit sayılması için göreli tolerans (Excel'de 0.1 gibi değerler double saklanır)
+_RTOL = 1e-9
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """
+    Metin karşılaştırması için: boşlar '', baş/son boşluklar atılmış, küçük harf.
+    """
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip().str.lower()
+
+
+def _normalize_id(series: pd.Series) -> pd.Series:
+    # XML'deki ID'ler onaltılıktır ('1A0'); Excel'de sayı olarak okunmuş olabilir
+    values = series.astype(object).where(series.notna(), "")
+    values = values.map(lambda v: str(int(v)) if isinstance(v, float) and v.is_integer() else str(v))
+    return values.str.strip().str.upper().str.removeprefix("0X")
+
+
+def _values_equal(a: pd.Series, b: pd.Series) -> np.ndarray:
+    """
+    İki değer sütununu satır satır karşılaştırır: iki taraf da sayıya çevrilebiliyorsa sayısal (toleranslı),
+    değilse metin olarak. İki tarafta da boş olan hücreler eşittir.
+    """
+    a_num = pd.to_numeric(a, errors="coerce").astype("float64")
+    b_num = pd.to_numeric(b, errors="coerce").astype("float64")
+    both_numeric = (a_num.notna() & b_num.notna()).to_numpy()
+    numeric_equal = np.isclose(a_num.fillna(0).to_numpy(), b_num.fillna(0).to_numpy(), rtol=_RTOL, atol=0.0)
+    text_equal = (_text(a) == _text(b)).to_numpy()
+    return np.where(both_numeric, numeric_equal, text_equal)
+
+
+def xml_signal_frame(rows: Sequence[SignalRow]) -> pd.DataFrame:
+    """
+    Ayrıştırıcının (ID, ad, Max, Min, Def, Resolution, Offset) satırlarından tablo.
+    """
+    return pd.DataFrame(list(rows), columns=["ID", "name", "Max", "Min", "Def", "Resolution", "Offset"], dtype=object)
+
+
+def crosscheck(xml_df: pd.DataFrame, excel_df: pd.DataFrame, columns: Optional[Dict[str, str]] = None,
+               join: str = JOIN_NAME, offset: int = 0, limit: Optional[int] = None) -> Dict[str, object]:
+    """
+    XML'deki SIGNAL tablosunu (xml_signal_frame) Excel sinyal tablosuyla sinyal adına (join=id_name ise ID ve
+    ada) göre birleştirir ve Max/Min/Def/Resolution/Offset değerleri farklı olan sinyalleri döndürür.
+    columns, Excel sütun adlarını DEFAULT_COLUMNS'taki anahtarlar için değiştirir. Aynı anahtar birden fazla
+    geçerse satırlar sıralarıyla eşlenir. Birleştirme ve değer karşılaştırmaları vektörel yapılır; yalnızca
+    döndürülecek sayfa (her liste için offset/limit) Python nesnelerine çevrilir.
+    Ad sütunu (join=id_name ise ID sütunu da) Excel'de yoksa ValueError yükselir.
+    """
+    if join not in JOIN_MODES:
+        raise ValueError(f"Geçersiz birleştirme: {join}")
+    mapping = dict(DEFAULT_COLUMNS, **(columns or {}))
+    required = ["name", "id"] if join == JOIN_ID_NAME else ["name"]
+    for field in required:
+        if mapping[field] not in excel_df.columns:
+            raise ValueError(f"Excel tablosunda '{mapping[field]}' sütunu bulunamadı.")
+    fields = [field for field in FIELDS if mapping[field] in excel_df.columns]
+
+    # Ad eşleştirmesi büyük/küçük harf ve baş/son boşluk duyarsızdır (CODESYS tanımlayıcıları gibi).
+    # Excel satır numarası: başlık 1. satırda, veriler 2. satırdan başlar.
+    left = pd.DataFrame({"key": _text(xml_df["name"]).to_numpy(), "name": xml_df["name"].to_numpy(),
+                         "xml_id": xml_df["ID"].to_numpy()})
+    right = pd.DataFrame({"key": _text(excel_df[mapping["name"]]).to_numpy(),
+                          "name": excel_df[mapping["name"]].astype(object).to_numpy(),
+                          "excel_row": np.arange(len(excel_df)) + 2})
+    if join == JOIN_ID_NAME:
+        left["key"] = _normalize_id(xml_df["ID"]).to_numpy() + "\x00" + left["key"]
+        right["key"] = _normalize_id(excel_df[mapping["id"]]).to_numpy() + "\x00" + right["key"]
+    for field in fields:
+        left[f"xml_{field}"] = xml_df[field].to_numpy()
+        right[f"excel_{field}"] = excel_df[mapping[field]].to_numpy()
+    right = right[right["key"] != ""]  # adı boş (ara/boş) Excel satırları sinyal sayılmaz
+    left["occurrence"] = left.groupby("key", sort=False).cumcount()
+    right["occurrence"] = right.groupby("key", sort=False).cumcount()
+
+    merged = pd.merge(left, right, on=["key", "occurrence"], how="outer", suffixes=("", "_excel"),
+                      indicator=True, sort=False)
+    both = merged[merged["_merge"] == "both"].reset_index(drop=True)
+    only_xml = merged[merged["_merge"] == "left_only"]
+    only_excel = merged[merged["_merge"] == "right_only"]
+
+    differs = np.zeros((len(both), len(fields)), dtype=bool)
+    for i, field in enumerate(fields):
+        differs[:, i] = ~_values_equal(both[f"xml_{field}"], both[f"excel_{field}"])
+    mismatched = np.flatnonzero(differs.any(axis=1))
+
+    page = page_slice(offset, limit)
+    mismatches: List[dict] = []
+    for row in mismatched[page]:
+        record = both.iloc[row]
+        mismatches.append({
+            "name": record["name"],
+            "id": record["xml_id"],
+            "excel_row": int(record["excel_row"]),
+            "fields": {
+                field: {"xml": json_value(record[f"xml_{field}"]), "excel": json_value(record[f"excel_{field}"])}
+                for i, field in enumerate(fields) if differs[row, i]
+            },
+        })
+
+    return {
+        "join": join,
+        "fields": fields,
+        "missing_columns": [mapping[field] for field in FIELDS if field not in fields],
+        "summary": {
+            "xml_signals": len(xml_df),
+            "excel_signals": len(right),
+            "matched": len(both),
+            "mismatched": len(mismatched),
+            "only_in_xml": len(only_xml),
+            "only_in_excel": len(only_excel),
+        },
+        "mismatches": mismatches,
+        "only_in_xml": [{"name": name, "id": xml_id}
+                        for name, xml_id in zip(only_xml["name"].to_numpy()[page], only_xml["xml_id"].to_numpy()[page])],
+        "only_in_excel": [{"name": json_value(name), "excel_row": int(excel_row)}
+                          for name, excel_row in zip(only_excel["name_excel"].to_numpy()[page],
+                                                     only_excel["excel_row"].to_numpy()[page])],
+    }
@@ -0,0 +1,44 @@
+import os
+from typing import List, Optional
+
+from codesys_doc_tracker import db
+from codesys_doc_tracker.models.signal_model import Signal
+from codesys_doc_tracker.models.xmlfile_model import XMLFile
+from services.file_index_service import sync_lock
+from services.signal_parser import extract_st_text, parse_signal_rows
+
+# Her commit'te işlenen dosya sayısı; ilk taramada tüm dizin tek işlemde tutulmasın diye
+_INDEX_BATCH = 200
+
+
+def index_pending_signals(file_ids: Optional[List[int]] = None, root_dir: str = "") -> int:
+    """
+    Sinyal tablosu olmayan veya içeriği değişmiş XML dosyalarının SIGNAL satırlarını çıkarıp signals tablosuna
+    yazar. Tarama ve yüklemeden sonra çağrılır; değişmemiş dosyalar okunmaz. Okunamayan dosyalar atlanır
+    (bir sonraki senkronizasyonda yeniden denenir). DB yolları root_dir'e (export dizininin üst dizini;
+    boşsa çalışma dizini) göre çözülür. İşlenen dosya sayısını döndürür.
+    """
+    with sync_lock:
+        return _index_pending(XMLFile.signal_index_pending(file_ids), root_dir)
+
+
+def _index_pending(pending, root_dir: str) -> int:
+    indexed = 0
+    for i in range(0, len(pending), _INDEX_BATCH):
+        rows_by_file = {}
+        hashes = {}
+        for file_id, file_path, content_hash in pending[i:i + _INDEX_BATCH]:
+            try:
+                with open(os.path.normpath(os.path.join(root_dir, file_path)), "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Sinyal tablosu çıkarılamadı: {file_path} - {e}")
+                continue
+            rows_by_file[file_id] = parse_signal_rows(extract_st_text(content))
+            hashes[file_id] = content_hash
+
+        Signal.replace_for_files(rows_by_file)
+        XMLFile.mark_signals_indexed(hashes)
+        db.session.commit()
+        indexed += len(rows_by_file)
+    return indexed
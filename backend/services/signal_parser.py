@@ -0,0 +1,164 @@
+import fnmatch
+import io
+import re
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (ID, ad, Max, Min, Def, Resolution, Offset)
+SignalRow = Tuple[str, str, str, str, str, str, str]
+
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_GLOB = "glob"
+MATCH_MODES = (MATCH_EXACT, MATCH_PREFIX, MATCH_GLOB)
+
+_ST_BLOCK_PATTERN = re.compile(r'<ST>.*?<xhtml[^>]*>(.*?)</xhtml>.*?</ST>', re.DOTALL | re.IGNORECASE)
+# Düzeltme: Onaltılık (hexadecimal) ID'leri çeken regex
+_ID_PATTERN = re.compile(r'ID:([0-9a-fA-F]+)')
+_SIGNAL_PATTERN = re.compile(
+    r'//-*\s*SIGNAL\s*->\s*(?P<signal_name>\S+)\s*'
+    r'Max\s*:\s*(?P<max>.*?)\s*'
+    r'Min\s*:\s*(?P<min>.*?)\s*'
+    r'Def\s*:\s*(?P<def>.*?)\s*'
+    r'Resolution\s*:\s*(?P<res>.*?)\s*'
+    r'Offset\s*:\s*(?P<off>.*?)\s*$'
+)
+# Yalnızca adı okuyan hafif desen; tam desen sadece adı eşleşen satırlarda çalıştırılır
+_SIGNAL_NAME_PATTERN = re.compile(r'//-*\s*SIGNAL\s*->\s*(\S+)')
+_GLOB_CHARS = "*?["
+
+
+class _TrieNode:
+    __slots__ = ("children", "prefix", "globs", "glob")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.prefix = False
+        self.globs: List[str] = []
+        # Düğümdeki tüm glob desenleri tek bir derlenmiş alternatif ifadede
+        self.glob: Optional[re.Pattern] = None
+
+
+class SignalMatcher:
+    """
+    Sinyal adlarını anahtar kelimelerle eşleştirir.
+      - exact : ad, kelimelerden birine birebir eşit (küme araması)
+      - prefix: ad, kelimelerden biriyle başlıyor
+      - glob  : kelimeler fnmatch desenleri ('S_ER_*', 'S_?SS*'); joker içermeyen kelimeler birebir eşleşir
+    prefix ve glob kelimeleri bir trie'de tutulur: ad trie boyunca bir kez yürünür ve yalnızca yoldaki
+    düğümlerin desenleri denenir, kelime sayısıyla doğrusal tarama yapılmaz. Kelimelerin baş/son boşlukları atılır.
+    """
+
+    def __init__(self, keywords: Iterable[str], mode: str = MATCH_EXACT):
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Geçersiz eşleştirme modu: {mode}")
+        self.mode = mode
+        self.names = set()
+        self._root: Optional[_TrieNode] = None
+
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if not keyword:
+                continue
+            if mode == MATCH_EXACT or (mode == MATCH_GLOB and not any(c in keyword for c in _GLOB_CHARS)):
+                self.names.add(keyword)
+                continue
+            literal = keyword
+            if mode == MATCH_GLOB:
+                # Trie yolu desenin ilk jokerinden önceki sabit kısmıdır
+                literal = keyword[:min(keyword.find(c) for c in _GLOB_CHARS if c in keyword)]
+            node = self._node_for(literal)
+            if mode == MATCH_PREFIX:
+                node.prefix = True
+            else:
+                node.globs.append(fnmatch.translate(keyword))
+
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            if node.globs:
+                node.glob = re.compile("|".join(node.globs))
+            stack.extend(node.children.values())
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        Yalnızca birebir adlardan mı oluşuyor (indeksli IN sorgusuna çevrilebilir mi)?
+        """
+        return self._root is None
+
+    def _node_for(self, literal: str) -> _TrieNode:
+        if self._root is None:
+            self._root = _TrieNode()
+        node = self._root
+        for char in literal:
+            node = node.children.setdefault(char, _TrieNode())
+        return node
+
+    def __call__(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        node = self._root
+        if node is None:
+            return False
+        for char in name:
+            if node.prefix or (node.glob is not None and node.glob.match(name)):
+                return True
+            node = node.children.get(char)
+            if node is None:
+                return False
+        return node.prefix or (node.glob is not None and node.glob.match(name) is not None)
+
+
+def extract_st_text(content: str) -> str:
+    """
+    Belgedeki ilk ST/xhtml bloğunun unescape edilmiş metni; blok yoksa boş metin.
+    """
+    match = _ST_BLOCK_PATTERN.search(content)
+    return unescape(match.group(1)) if match else ""
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    Metnin satırlarını (sondaki '\\n' dahil), tüm satır listesini oluşturmadan üretir.
+    """
+    return iter(io.StringIO(text))
+
+
+def iter_signal_rows(lines: Iterable[str], matcher: Optional[SignalMatcher] = None) -> Iterator[SignalRow]:
+    """
+    ST satırlarını tek geçişte tarar ve 'SIGNAL ->' satırlarını en son görülen ID ile birlikte üretir.
+    Düzenli ifadeler yalnızca 'ID:' / 'SIGNAL' içeren satırlarda çalıştırılır. matcher verilirse önce
+    yalnızca ad okunur; tam desen sadece adı eşleşen satırlarda uygulanır.
+    """
+    id_search = _ID_PATTERN.search
+    signal_search = _SIGNAL_PATTERN.search
+    name_search = _SIGNAL_NAME_PATTERN.search
+    current_id = ""
+    for line in lines:
+        if "ID:" in line:
+            id_match = id_search(line)
+            if id_match:
+                current_id = id_match.group(1)
+
+        if "SIGNAL" not in line:
+            continue
+        if matcher is not None:
+            name_match = name_search(line)
+            if name_match is None or not matcher(name_match.group(1)):
+                continue
+        signal_match = signal_search(line)
+        if signal_match:
+            name, max_value, min_value, default, resolution, offset = signal_match.group(
+                'signal_name', 'max', 'min', 'def', 'res', 'off')
+            if matcher is not None and not matcher(name):
+                continue  # satırda birden fazla 'SIGNAL ->' varsa tam desen başka adı yakalamış olabilir
+            yield (current_id, name, max_value.strip(), min_value.strip(), default.strip(),
+                   resolution.strip(), offset.strip())
+
+
+def parse_signal_rows(st_text: str, matcher: Optional[SignalMatcher] = None) -> List[SignalRow]:
+    """
+    ST metnindeki sinyal satırlarının listesi (iter_signal_rows ile).
+    """
+    return list(iter_signal_rows(iter_lines(st_text), matcher))
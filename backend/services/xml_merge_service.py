@@ -1,9 +1,28 @@
 import os
+import re
+import shutil
+import time
+import uuid
 import xml.etree.ElementTree as ET
-from typing import Optional, Tuple
+import zipfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
+from services import document_cache
 from services.xmlfile_service import get_file_path_by_id
 
+# Projenin temel dizinini dinamik olarak bul
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Toplu birleştirme çıktılarının klasörü. Her iş, indirme token'ıyla adlandırılmış bir alt klasöre yazılır;
+# istemci birleştirilmiş içeriği geri göndermek yerine dosyayı token ile indirir.
+MERGE_OUTPUT_DIR = os.environ.get("XML_MERGE_OUTPUT_DIR", os.path.join(BASE_DIR, "backend", "MergedXML"))
+# Çıktıların saklanma süresi (saniye); daha eski işler yeni bir iş başlarken silinir
+MERGE_OUTPUT_TTL = int(os.environ.get("XML_MERGE_OUTPUT_TTL", str(60 * 60)))
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+_TMP_SUFFIX = ".tmp"
+_TOKEN_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
 # Yeni kod bloğunun ekleneceği başlangıç ve bitiş işaretçileri
 # Bu işaretçiler, XML dosyasındaki "MESSAGE AREA" yorumlarını temsil eder.
 INSERTION_START_MARKER = "//MESSAGE------"
@@ -21,9 +40,8 @@ def merge_xml_and_get_content(file_id: int, new_xml_block: str) -> Optional[str]
             print(f"Hata: Dosya ID'si bulunamadı veya dosya mevcut değil: {file_id}")
             return None
 
-        # Dosyayı metin olarak oku
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_content = f.read()
+        # Dosyayı metin olarak oku (belge önbelleğinden)
+        file_content = document_cache.read_text(file_id, file_path)
 
         # Eklenecek yeni kod bloğunu hazırlama
         # Kullanıcının girdiği kod bloğunu CDATA içinde sararak XML'e uygun hale getiririz
@@ -31,7 +49,8 @@ def merge_xml_and_get_content(file_id: int, new_xml_block: str) -> Optional[str]
 
         # Ekleme noktasını bulma
         # İlk 'MESSAGE AREA' işaretçisinin sonunu buluyoruz
-        insertion_point = file_content.find(INSERTION_END_MARKER)
+        insertion_point = document_cache.get(file_id, file_path, document_cache.KIND_MERGE_POINT,
+                                             lambda: file_content.find(INSERTION_END_MARKER))
         
         if insertion_point == -1:
             print("Hata: Birleştirme hedefi olan 'MESSAGE AREA' işaretçisi bulunamadı.")
@@ -45,4 +64,178 @@ def merge_xml_and_get_content(file_id: int, new_xml_block: str) -> Optional[str]
 
     except Exception as e:
         print(f"Beklenmeyen bir hata oluştu: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def _find_marker_offset(path: str) -> int:
+    """
+    INSERTION_END_MARKER'ın dosyadaki ilk byte konumu (yoksa -1). Dosya parça parça taranır; işaretçinin
+    parça sınırına denk gelmesi için bir önceki parçanın son len(işaretçi) - 1 byte'ı korunur.
+    """
+    marker = INSERTION_END_MARKER.encode("utf-8")
+    keep = len(marker) - 1
+    consumed = 0  # tail'in dosyadaki başlangıç konumu
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_COPY_CHUNK_SIZE)
+            if not chunk:
+                return -1
+            window = tail + chunk
+            found = window.find(marker)
+            if found != -1:
+                return consumed + found
+            tail = window[-keep:] if keep else b""
+            consumed += len(window) - len(tail)
+
+
+def _insertion_offset(file_id: int, path: str) -> int:
+    return document_cache.get(file_id, path, document_cache.KIND_MERGE_OFFSET, lambda: _find_marker_offset(path))
+
+
+def write_merged(source_path: str, insertion_offset: int, blocks: Sequence[str], out) -> int:
+    """
+    Birleştirilmiş dosyayı out'a (ikili yazılabilir dosya nesnesi) akış halinde yazar: kaynağın
+    insertion_offset'e kadarki kısmı, sırayla her kod bloğu ve kaynağın kalanı. Kaynak bellekte
+    tümüyle tutulmaz, metin birleştirmesi yapılmaz. Blokları tek tek merge_xml_and_get_content ile
+    eklemekle aynı sonucu verir (satır sonları kaynaktaki gibi korunur). Yazılan byte sayısını döndürür.
+    """
+    written = 0
+    with open(source_path, "rb") as src:
+        remaining = insertion_offset
+        while remaining > 0:
+            chunk = src.read(min(_COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            out.write(chunk)
+            written += len(chunk)
+            remaining -= len(chunk)
+        for block in blocks:
+            data = f"\n{block}\n".encode("utf-8")
+            out.write(data)
+            written += len(data)
+        while True:
+            chunk = src.read(_COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def _merged_file_name(path: str) -> str:
+    # 'dosya_adı.xml' -> 'dosya_adı_merged.xml'
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"{stem}_merged{ext}"
+
+
+def _group_items(items: Iterable[Tuple[int, Sequence[str]]]) -> Dict[int, List[str]]:
+    # Aynı dosya birden fazla kez verilirse blokları verildiği sırayla tek çıktıda birleştirilir
+    grouped: Dict[int, List[str]] = {}
+    for file_id, blocks in items:
+        grouped.setdefault(file_id, []).extend(block for block in blocks if block)
+    return {file_id: blocks for file_id, blocks in grouped.items() if blocks}
+
+
+def _evict_merge_outputs(now: float) -> int:
+    """
+    MERGE_OUTPUT_TTL'den eski iş klasörlerini (yarım kalmış geçici klasörler dahil) siler.
+    """
+    if MERGE_OUTPUT_TTL <= 0 or not os.path.isdir(MERGE_OUTPUT_DIR):
+        return 0
+    removed = 0
+    with os.scandir(MERGE_OUTPUT_DIR) as it:
+        for entry in it:
+            try:
+                expired = entry.is_dir() and now - entry.stat().st_mtime > MERGE_OUTPUT_TTL
+            except OSError:
+                continue
+            if expired:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
+
+
+def merge_xml_batch(items: Iterable[Tuple[int, Sequence[str]]]) -> tuple:
+    """
+    Birden fazla kod bloğunu birden fazla XML dosyasına tek işte ekler. items: (file_id, [kod blokları]).
+    Her dosyanın işaretçi konumu önce bulunur (belge önbelleğinde tutulur); işaretçisi olmayan veya
+    bulunamayan dosyalar "failed" listesine yazılır, diğerleri birleştirilir. Çıktı MERGE_OUTPUT_DIR'de
+    bir token klasörüne akış halinde yazılır: tek dosya için birleştirilmiş XML'in kendisi, birden fazla
+    dosya için her birinin doğrudan arşive yazıldığı bir zip. İçerik yanıtta dönmez; indirme
+    get_merge_output(token) ile yapılır.
+    Dönüş: ({"token", "file_name", "files", "failed"}, None) veya (None, hata mesajı)
+    """
+    grouped = _group_items(items)
+    if not grouped:
+        return None, "Birleştirilecek dosya ve kod bloğu bulunamadı."
+
+    merges = []  # (file_id, kaynak yol, ekleme konumu, bloklar)
+    failed = []
+    for file_id, blocks in grouped.items():
+        file_path = get_file_path_by_id(file_id)
+        if not file_path or not os.path.exists(file_path):
+            failed.append({"file_id": file_id, "message": "Dosya bulunamadı."})
+            continue
+        try:
+            offset = _insertion_offset(file_id, file_path)
+        except OSError as e:
+            failed.append({"file_id": file_id, "message": f"Dosya okunamadı: {str(e)}"})
+            continue
+        if offset == -1:
+            failed.append({"file_id": file_id,
+                           "message": "Birleştirme hedefi olan 'MESSAGE AREA' işaretçisi bulunamadı."})
+            continue
+        merges.append((file_id, file_path, offset, blocks))
+    if not merges:
+        return None, "Hiçbir dosya birleştirilemedi: " + "; ".join(
+            f"{item['file_id']}: {item['message']}" for item in failed)
+
+    now = time.time()
+    os.makedirs(MERGE_OUTPUT_DIR, exist_ok=True)
+    _evict_merge_outputs(now)
+    token = uuid.uuid4().hex
+    tmp_dir = os.path.join(MERGE_OUTPUT_DIR, f"{token}{_TMP_SUFFIX}")
+    os.makedirs(tmp_dir)
+    files = []
+    try:
+        if len(merges) == 1:
+            file_id, file_path, offset, blocks = merges[0]
+            file_name = _merged_file_name(file_path)
+            with open(os.path.join(tmp_dir, file_name), "wb") as out:
+                size = write_merged(file_path, offset, blocks, out)
+            files.append({"file_id": file_id, "file_name": file_name, "blocks": len(blocks), "bytes": size})
+        else:
+            file_name = f"merged_xml_{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}.zip"
+            used_names = set()
+            with zipfile.ZipFile(os.path.join(tmp_dir, file_name), "w", zipfile.ZIP_DEFLATED) as archive:
+                for file_id, file_path, offset, blocks in merges:
+                    entry_name = _merged_file_name(file_path)
+                    if entry_name in used_names:
+                        stem, ext = os.path.splitext(entry_name)
+                        entry_name = f"{stem}_{file_id}{ext}"
+                    used_names.add(entry_name)
+                    # force_zip64: boyut önceden bilinmediğinden büyük dosyalar için de geçerli başlık
+                    with archive.open(entry_name, "w", force_zip64=True) as out:
+                        size = write_merged(file_path, offset, blocks, out)
+                    files.append({"file_id": file_id, "file_name": entry_name, "blocks": len(blocks), "bytes": size})
+        os.rename(tmp_dir, os.path.join(MERGE_OUTPUT_DIR, token))
+    except OSError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None, f"Birleştirilmiş dosya yazılamadı: {str(e)}"
+
+    return {"token": token, "file_name": file_name, "files": files, "failed": failed}, None
+
+
+def get_merge_output(token: str) -> Optional[str]:
+    """
+    Toplu birleştirme işinin çıktı dosyasının yolu; token geçersizse veya çıktı silinmişse None.
+    """
+    if not _TOKEN_PATTERN.match(token or ""):
+        return None
+    job_dir = os.path.join(MERGE_OUTPUT_DIR, token)
+    try:
+        names = [name for name in os.listdir(job_dir) if not name.endswith(_TMP_SUFFIX)]
+    except OSError:
+        return None
+    return os.path.join(job_dir, names[0]) if names else None
@@ -0,0 +1,201 @@
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from services.diff_stream import iter_streaming_diff
+
+# Karşılaştırmaya hiç girmeyecek (metadata) alt ağaçlar — satır tabanlı filtredeki atlamalarla aynı
+SKIPPED_TAGS = {"fileHeader", "contentHeader", "coordinateInfo"}
+
+# Değişen yaprakların içinde gösterilecek bağlam satırı sayısı
+DEFAULT_CONTEXT = 3
+
+# iter_leaves çıktısının biçimi değişirse artırılır; önbellekteki yapısal diff raporları geçersizleşir
+LEAF_FORMAT_VERSION = "2"
+
+# Çocuklu elemanların niteliklerinin sözde yaprağı: '<eleman yolu>/@'
+ATTRIBUTES_SEGMENT = "@"
+
+
+def _local_name(tag: str) -> str:
+    """
+    '{http://www.plcopen.org/xml/tc6_0200}pou' -> 'pou'
+    """
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+class _Frame:
+    __slots__ = ("key", "tag", "has_children", "sibling_counts")
+
+    def __init__(self, key: str, tag: str):
+        self.key = key
+        self.tag = tag
+        self.has_children = False
+        self.sibling_counts: Dict[str, int] = {}
+
+
+def _render_attributes(elem: ET.Element) -> str:
+    return " ".join(f'{_local_name(k)}="{v}"' for k, v in sorted(elem.attrib.items()))
+
+
+def _render_leaf(tag: str, elem: ET.Element) -> List[str]:
+    """
+    Yaprak elemanı karşılaştırılabilir satırlara çevirir: varsa nitelikler tek satırda, ardından metin satırları.
+    """
+    lines = []
+    attrs = _render_attributes(elem)
+    if attrs:
+        lines.append(f"<{tag} {attrs}>")
+    text = elem.text or ""
+    if text.strip():
+        lines.extend(text.splitlines())
+    if not lines:
+        lines.append(f"<{tag}/>")
+    return lines
+
+
+def iter_leaves(source) -> Iterator[Tuple[str, List[str]]]:
+    """
+    PLCopen XML belgesini iterparse ile tek geçişte okur ve (anahtar, satırlar) çiftleri üretir.
+    Anahtar, elemanın yoludur; 'name' niteliği olan elemanlar adlarıyla (pou[P_IOVD_A]),
+    adsız kardeşler sıra numarasıyla ayırt edilir. Çocuklu elemanların nitelikleri (variable/@address,
+    pou/@pouType gibi) '<yol>/@' anahtarlı ayrı bir yaprak olarak üretilir. İşlenen alt ağaçlar bellekten
+    hemen atılır.
+    source; dosya yolu, dosya nesnesi ya da her çağrıda yeni bir dosya nesnesi açan fonksiyon olabilir.
+    """
+    if callable(source):
+        with source() as f:
+            yield from iter_leaves(f)
+        return
+
+    stack: List[_Frame] = []
+    elems: List[ET.Element] = []
+    skip_depth = 0
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = _local_name(elem.tag)
+
+        if event == "start":
+            if skip_depth or tag in SKIPPED_TAGS:
+                skip_depth += 1
+                continue
+
+            parent = stack[-1] if stack else None
+            name = elem.get("name")
+            segment = f"{tag}[{name}]" if name is not None else tag
+            if parent is not None:
+                parent.has_children = True
+                seen = parent.sibling_counts.get(segment, 0)
+                parent.sibling_counts[segment] = seen + 1
+                if seen:
+                    segment = f"{segment}#{seen}"
+                key = f"{parent.key}/{segment}"
+            else:
+                key = segment
+            stack.append(_Frame(key, tag))
+            elems.append(elem)
+            continue
+
+        # event == "end"
+        if skip_depth:
+            skip_depth -= 1
+            if skip_depth == 0:
+                elem.clear()
+            continue
+
+        frame = stack.pop()
+        elems.pop()
+        if not frame.has_children:
+            yield frame.key, _render_leaf(frame.tag, elem)
+        elif elem.attrib:
+            yield f"{frame.key}/{ATTRIBUTES_SEGMENT}", [f"<{frame.tag} {_render_attributes(elem)}>"]
+
+        # Alt ağaç işlendi; hem kendisini hem de ebeveynin çocuk listesini boşalt
+        elem.clear()
+        if elems:
+            del elems[-1][:]
+
+
+def _digest(lines: List[str]) -> bytes:
+    return hashlib.blake2b("\n".join(lines).encode("utf-8"), digest_size=16).digest()
+
+
+def _diff_leaf(old_lines: List[str], new_lines: List[str], context: int) -> Iterator[str]:
+    # Büyük ST gövdelerinde küçük değişiklikler için doğrusal çalışan akış motoru kullanılır
+    yield from iter_streaming_diff(
+        (line + "\n" for line in old_lines),
+        (line + "\n" for line in new_lines),
+        context=context,
+    )
+
+
+def iter_structural_diff(old_source, new_source, context: int = DEFAULT_CONTEXT,
+                         on_leaf: Optional[Callable[[], None]] = None,
+                         old_digests: Optional[Dict[str, bytes]] = None,
+                         new_digests: Optional[Dict[str, bytes]] = None) -> Iterator[str]:
+    """
+    İki PLCopen XML belgesini yapısal olarak karşılaştırır ve ' ', '-', '+' önekli rapor satırları üretir.
+
+    1. geçiş: eski belgedeki her yaprağın yalnızca özeti (hash) saklanır.
+    2. geçiş: yeni belgedeki yapraklar özetle karşılaştırılır; yalnızca değişen/eklenen yaprakların metni tutulur.
+    3. geçiş: eski belgeden yalnızca değişen ve silinen yaprakların metni okunur.
+    Metin diff'i sadece değişen yaprakların içinde çalışır; toplam maliyet belge boyutunda doğrusaldır.
+
+    old_digests verilirse (ör. bir önceki karşılaştırmada yeni taraf olan belge) 1. geçiş atlanır.
+    new_digests bir sözlük olarak verilirse 2. geçişte yeni belgenin özetleriyle doldurulur;
+    sürüm serilerinde bir sonraki çiftin old_digests'i olarak kullanılabilir.
+    """
+    if old_digests is None:
+        old_digests = {}
+        for key, lines in iter_leaves(old_source):
+            old_digests[key] = _digest(lines)
+            if on_leaf:
+                on_leaf()
+
+    # anahtar -> yeni satırlar (eklenen yapraklar için eski taraf None)
+    changed: Dict[str, List[str]] = {}
+    added = set()
+    seen = set()
+    for key, lines in iter_leaves(new_source):
+        seen.add(key)
+        digest = _digest(lines)
+        if new_digests is not None:
+            new_digests[key] = digest
+        old_digest = old_digests.get(key)
+        if old_digest is None:
+            changed[key] = lines
+            added.add(key)
+        elif old_digest != digest:
+            changed[key] = lines
+        if on_leaf:
+            on_leaf()
+
+    removed_keys = [key for key in old_digests if key not in seen]
+    del old_digests
+    if not changed and not removed_keys:
+        return
+
+    wanted = (set(changed) - added) | set(removed_keys)
+    old_texts: Dict[str, List[str]] = {}
+    removed: List[Tuple[str, List[str]]] = []
+    removed_set = set(removed_keys)
+    for key, lines in iter_leaves(old_source):
+        if key not in wanted:
+            continue
+        if key in removed_set:
+            removed.append((key, lines))
+        else:
+            old_texts[key] = lines
+
+    for key, new_lines in changed.items():
+        yield f" ### {key}\n"
+        if key in added:
+            for line in new_lines:
+                yield f"+{line}\n"
+        else:
+            yield from _diff_leaf(old_texts.pop(key, []), new_lines, context)
+
+    for key, old_lines in removed:
+        yield f" ### {key}\n"
+        for line in old_lines:
+            yield f"-{line}\n"
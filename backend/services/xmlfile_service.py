@@ -1,15 +1,30 @@
+import hashlib
 import os
+import uuid
+from xml.parsers import expat
 from datetime import datetime
 from typing import Optional, Dict, Set, List, Tuple
 
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
 from werkzeug.utils import secure_filename
 
+from codesys_doc_tracker.models.file_index_model import FileIndex
 from codesys_doc_tracker.models.xmlfile_model import XMLFile
 from codesys_doc_tracker.models.diff_model import Diff
+from services import document_cache
+from services.file_index_service import record_hashed_files, scan_tree, sync_index, sync_lock, sync_paths
+from services.signal_index_service import index_pending_signals
 
 DEFAULT_EXPORT_DIR = "CodesysXML_Export"
 ALLOWED_EXTS = {".xml"}
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Akışlı yüklemede istek gövdesinden bir seferde okunan miktar ve multipart çözücüsünün
+# (başlıklar / henüz ayrıştırılmamış veri için) tutabileceği azami tampon (Flask varsayılanı)
+_STREAM_READ_SIZE = 64 * 1024
+_MAX_MULTIPART_BUFFER = 500 * 1024
+
 
 # ---------- Yardımcılar ----------
 
@@ -28,22 +43,6 @@ def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def _iter_xml_files(base_dir: str, recursive: bool = True):
-    """
-    Belirtilen dizindeki tüm XML dosyalarını (opsiyonel olarak alt dizinlerde) listeler.
-    """
-    if recursive:
-        for root, _dirs, files in os.walk(base_dir):
-            for name in files:
-                if name.lower().endswith(".xml"):
-                    yield os.path.join(root, name)
-    else:
-        for name in os.listdir(base_dir):
-            full = os.path.join(base_dir, name)
-            if os.path.isfile(full) and name.lower().endswith(".xml"):
-                yield full
-
-
 def _canonize_slashes(p: str) -> str:
     """
     Yol ayracını sistemden bağımsız hale getirir.
@@ -76,31 +75,86 @@ def _unique_target_path(dir_path: str, file_name: str) -> Tuple[str, str]:
     return abs_path, final
 
 
+def _claim_target_path(tmp_path: str, dir_path: str, file_name: str) -> Tuple[str, str]:
+    """
+    Geçici dosyayı, var olan bir dosyanın üzerine yazmadan hedef adına taşır. os.link hedef varsa
+    hata verdiğinden, eşzamanlı iki yükleme aynı adı seçse bile biri (1), (2)... ekiyle kaydedilir.
+    Sabit bağlantı desteklenmeyen dosya sistemlerinde _unique_target_path + os.replace kullanılır.
+    """
+    base, ext = os.path.splitext(file_name)
+    final = file_name
+    i = 1
+    while True:
+        abs_path = os.path.join(dir_path, final)
+        try:
+            os.link(tmp_path, abs_path)
+        except FileExistsError:
+            final = f"{base}({i}){ext}"
+            i += 1
+            continue
+        except OSError:
+            abs_path, final = _unique_target_path(dir_path, final)
+            os.replace(tmp_path, abs_path)
+            return abs_path, final
+        os.remove(tmp_path)
+        return abs_path, final
+
+
 # ---------- Tarama & Temizleme ----------
 
 def scan_and_sync_xml_files(base_dir: Optional[str] = None, recursive: bool = True) -> Dict[str, int]:
     """
     Yerel dosya sistemindeki XML dosyalarını tarar ve veritabanı ile senkronize eder.
+    Dosyalar os.scandir'in stat bilgisiyle dosya indeksine karşı denetlenir; yalnızca yeni/değişmiş
+    dosyalar okunur. Kayıtlı yollar tek sorguda alınır, yeni kayıtlar tek toplu INSERT ile eklenir.
+    Yeni/değişmiş dosyaların sinyal tabloları da bu sırada signals tablosuna çıkarılır.
     """
     export_dir = _export_base_dir(base_dir)
     _ensure_dir(export_dir)
     base_name = os.path.basename(export_dir.rstrip("\\/"))
 
-    added = 0
-    fs_db_paths: Set[str] = set()
+    scanned = scan_tree(export_dir, tuple(ALLOWED_EXTS), recursive=recursive)
+    with sync_lock:
+        delta = sync_index(FileIndex.KIND_XML, base_name, scanned)
 
-    for abs_path in _iter_xml_files(export_dir, recursive=recursive):
-        abs_path = os.path.normpath(abs_path)
-        db_path = _path_for_db(abs_path, export_dir)
-        fs_db_paths.add(db_path)
+        registered = XMLFile.paths_under(base_name)
+        added = XMLFile.create_many(sorted(path for path in scanned if path not in registered))
+        XMLFile.refresh_content_hashes(delta.changed)
+        document_cache.invalidate_paths(delta.changed)
+        index_pending_signals(root_dir=os.path.dirname(export_dir))
 
-        if not XMLFile.get_by_path(db_path):
-            XMLFile.create(file_path=db_path)
-            added += 1
+        removed = 0
+        if any(path not in scanned for path in registered):
+            removed = XMLFile.delete_missing_files(set(scanned), base_name)
 
-    removed = XMLFile.delete_missing_files(fs_db_paths, base_name)
+    return {"added": added, "removed": removed, "changed": len(delta.changed)}
 
-    return {"added": added, "removed": removed}
+
+def apply_xml_changes(abs_paths) -> Dict[str, int]:
+    """
+    Yalnızca verilen dosyaları (ör. dosya izleyicisinin bildirdiği yolları) veritabanına yansıtır:
+    diskte olup kayıtlı olmayanları ekler, diskten kaybolanların kayıtlarını siler.
+    Dizinin geri kalanı taranmaz.
+    """
+    export_dir = _export_base_dir()
+    entries = {}
+    for abs_path in abs_paths:
+        if abs_path.lower().endswith(tuple(ALLOWED_EXTS)):
+            abs_path = os.path.normpath(abs_path)
+            entries[_path_for_db(abs_path, export_dir)] = abs_path
+    if not entries:
+        return {"added": 0, "removed": 0, "changed": 0}
+
+    with sync_lock:
+        present, delta = sync_paths(FileIndex.KIND_XML, entries)
+        registered = XMLFile.registered_paths(entries)
+        added = XMLFile.create_many(sorted(path for path in present if path not in registered))
+        XMLFile.refresh_content_hashes(delta.changed)
+        document_cache.invalidate_paths(delta.changed)
+        index_pending_signals(root_dir=os.path.dirname(export_dir))
+        removed = XMLFile.delete_by_paths([path for path in registered if path not in present])
+
+    return {"added": added, "removed": removed, "changed": len(delta.changed)}
 
 
 def scan_and_register_xml_files(base_dir: Optional[str] = None, recursive: bool = True) -> int:
@@ -113,43 +167,151 @@ def scan_and_register_xml_files(base_dir: Optional[str] = None, recursive: bool
 
 # ---------- Upload & Silme ----------
 
+class _UploadTarget:
+    """
+    Yüklenen tek bir dosya: gelen parçalar export dizinindeki geçici dosyaya yazılırken sha256 özeti
+    hesaplanır ve (validate=True ise) expat ile artımlı olarak iyi biçimlilik denetlenir.
+    İçerik ne belleğe toplanır ne de ikinci kez okunur. Geçici dosyanın uzantısı taramalara takılmaz.
+    """
+
+    def __init__(self, dir_path: str, filename: str, validate: bool = False):
+        self.filename = filename
+        self.tmp_path = os.path.join(dir_path, f".upload-{uuid.uuid4().hex}.tmp")
+        self.error: Optional[str] = None
+        self._digest = hashlib.sha256()
+        self._parser = expat.ParserCreate() if validate else None
+        self._f = open(self.tmp_path, "wb")
+
+    def write(self, data: bytes) -> None:
+        if self.error is not None:
+            return  # geçersiz dosya zaten atılacak
+        self._digest.update(data)
+        self._f.write(data)
+        if self._parser is not None:
+            self._feed(data, False)
+
+    def _feed(self, data: bytes, final: bool) -> None:
+        try:
+            self._parser.Parse(data, final)
+        except expat.ExpatError as e:
+            self.error = f"Geçersiz XML: {expat.ErrorString(e.code)} (satır {e.lineno}, sütun {e.offset})"
+
+    def finish(self) -> str:
+        """
+        Dosyayı kapatır ve içerik özetini döndürür. Doğrulama hatası varsa self.error doludur.
+        """
+        self._f.close()
+        if self._parser is not None and self.error is None:
+            self._feed(b"", True)
+        return self._digest.hexdigest()
+
+    def discard(self) -> None:
+        self._f.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def _file_entry(row: XMLFile) -> Dict:
+    return {"id": row.id, "file_name": os.path.basename(row.file_path), "file_path": row.file_path}
+
+
+def _upload_name(raw_name: Optional[str], skipped: List[Dict]) -> Optional[str]:
+    """
+    Yüklenen dosyanın güvenli adını döndürür; uygun değilse sebebini skipped'a ekleyip None döner.
+    """
+    fn = secure_filename(raw_name or "")
+    if not fn:
+        skipped.append({"filename": raw_name, "reason": "Geçersiz dosya adı"})
+        return None
+
+    _, ext = os.path.splitext(fn)
+    if ext.lower() not in ALLOWED_EXTS:
+        skipped.append({"filename": fn, "reason": "Sadece .xml desteklenir"})
+        return None
+    return fn
+
+
+def _store_upload(target: _UploadTarget, content_hash: str, export_dir: str,
+                  saved_by_hash: Dict[str, str]) -> Tuple[Optional[Tuple[str, str]], Optional[Dict]]:
+    """
+    Tamamlanmış yüklemeyi yerine taşır ya da (içerik zaten kayıtlıysa) atar.
+    Dönüş: ((db yolu, mutlak yol), kopya bilgisi) - ikisinden biri doludur.
+    """
+    existing = XMLFile.get_by_content_hash(content_hash)
+    if existing or content_hash in saved_by_hash:
+        target.discard()
+        entry = _file_entry(existing) if existing else {"file_path": saved_by_hash[content_hash]}
+        return None, dict(entry, filename=target.filename)
+
+    target_abs, _final_name = _claim_target_path(target.tmp_path, export_dir, target.filename)
+    db_path = _path_for_db(target_abs, export_dir)
+    saved_by_hash[content_hash] = db_path
+    return (db_path, target_abs), None
+
+
+def _resolve_duplicates(duplicates: List[Dict]) -> None:
+    # Aynı istekte birden fazla kez gelen içerik: ilk kopyanın yeni kaydını göster
+    for entry in duplicates:
+        if "id" not in entry:
+            row = XMLFile.get_by_path(entry["file_path"])
+            entry.update(_file_entry(row) if row else {"id": None})
+
+
 def save_uploaded_xmls(file_storages: List) -> Dict[str, List[Dict]]:
     """
     Yüklenen XML dosyalarını kaydeder ve veritabanını otomatik olarak senkronize eder.
+    İçeriği kayıtlı bir dosyayla birebir aynı olan yüklemeler kopya olarak saklanmaz;
+    'duplicates' listesinde mevcut kaydın id'si döndürülür.
     """
     export_dir = _export_base_dir()
     _ensure_dir(export_dir)
 
-    saved = []
     skipped = []
+    duplicates = []
+    hashed: Dict[str, Tuple[str, str]] = {}  # db yolu -> (mutlak yol, özet)
+    saved_by_hash: Dict[str, str] = {}       # bu istekte kaydedilenler: özet -> db yolu
 
     for fs in file_storages:
         if not fs:
             continue
 
-        fn = secure_filename(fs.filename or "")
+        fn = _upload_name(fs.filename, skipped)
         if not fn:
-            skipped.append({"filename": fs.filename, "reason": "Geçersiz dosya adı"})
             continue
 
-        _, ext = os.path.splitext(fn)
-        if ext.lower() not in ALLOWED_EXTS:
-            skipped.append({"filename": fn, "reason": "Sadece .xml desteklenir"})
+        try:
+            target = _UploadTarget(export_dir, fn)
+        except Exception as e:
+            skipped.append({"filename": fn, "reason": f"Kaydedilemedi: {e}"})
             continue
-
-        target_abs, final_name = _unique_target_path(export_dir, fn)
-
         try:
-            fs.save(target_abs)
+            for chunk in iter(lambda: fs.stream.read(_UPLOAD_CHUNK_SIZE), b""):
+                target.write(chunk)
         except Exception as e:
+            target.discard()
             skipped.append({"filename": fn, "reason": f"Kaydedilemedi: {e}"})
             continue
+        content_hash = target.finish()
+
+        stored, duplicate = _store_upload(target, content_hash, export_dir, saved_by_hash)
+        if duplicate:
+            duplicates.append(duplicate)
+        else:
+            db_path, target_abs = stored
+            hashed[db_path] = (target_abs, content_hash)
+
+    # Özetler indekse yazılır; tarama bu dosyaları yeniden okumadan kaydeder
+    record_hashed_files(FileIndex.KIND_XML, hashed)
 
     # Dosya kaydetme işlemi tamamlandıktan sonra, veritabanını tarayıp senkronize et
     rescan_result = scan_and_sync_xml_files()
-    
+
+    _resolve_duplicates(duplicates)
+
     # Yeni eklenen ve silinen dosyalar hakkında bilgi veren bir mesaj oluştur
     message = f"{rescan_result.get('added', 0)} yeni dosya eklendi, {rescan_result.get('removed', 0)} dosya silindi."
+    if duplicates:
+        message += f" {len(duplicates)} dosya zaten kayıtlı olduğu için tekrar saklanmadı."
 
     # Güncel dosya listesini veritabanından al
     new_files = XMLFile.list_all()
@@ -163,7 +325,79 @@ def save_uploaded_xmls(file_storages: List) -> Dict[str, List[Dict]]:
         })
     
     # Güncellenmiş sonuçları döndür
-    return {"saved": saved_files, "skipped": skipped, "message": message}
+    return {"saved": saved_files, "skipped": skipped, "duplicates": duplicates, "message": message}
+
+
+def save_uploaded_xml_stream(stream, boundary: bytes) -> Dict[str, List[Dict]]:
+    """
+    multipart/form-data gövdesini request.files'a almadan, gelirken işler: her dosya parçası
+    doğrudan export dizinindeki geçici dosyaya yazılır, yazılırken özetlenir ve XML olarak artımlı
+    doğrulanır; biten dosya atomik olarak yerine taşınır. Tam tarama yapılmaz: yalnızca yüklenen
+    dosyalar indekse ve tek toplu INSERT ile veritabanına işlenir. Dönüşte yalnızca bu istekte
+    kaydedilen, kopya bulunan ve atlanan dosyalar yer alır.
+    """
+    export_dir = _export_base_dir()
+    _ensure_dir(export_dir)
+
+    skipped: List[Dict] = []
+    duplicates: List[Dict] = []
+    hashed: Dict[str, Tuple[str, str]] = {}  # db yolu -> (mutlak yol, özet)
+    uploaded_names: Dict[str, str] = {}      # db yolu -> istemcideki dosya adı
+    saved_by_hash: Dict[str, str] = {}
+
+    decoder = MultipartDecoder(boundary, max_form_memory_size=_MAX_MULTIPART_BUFFER)
+    target: Optional[_UploadTarget] = None
+    try:
+        while True:
+            data = stream.read(_STREAM_READ_SIZE)
+            decoder.receive_data(data or None)  # None: gövdenin sonu
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, File):
+                    fn = _upload_name(event.filename, skipped) if event.name == "files" else None
+                    target = _UploadTarget(export_dir, fn, validate=True) if fn else None
+                elif isinstance(event, Field):
+                    target = None
+                elif isinstance(event, Data) and target is not None:
+                    target.write(event.data)
+                    if not event.more_data:
+                        content_hash = target.finish()
+                        if target.error:
+                            target.discard()
+                            skipped.append({"filename": target.filename, "reason": target.error})
+                        else:
+                            stored, duplicate = _store_upload(target, content_hash, export_dir, saved_by_hash)
+                            if duplicate:
+                                duplicates.append(duplicate)
+                            else:
+                                db_path, target_abs = stored
+                                hashed[db_path] = (target_abs, content_hash)
+                                uploaded_names[db_path] = target.filename
+                        target = None
+                event = decoder.next_event()
+            if not data or isinstance(event, Epilogue):
+                break
+    finally:
+        # Bağlantı dosyanın ortasında koparsa yarım dosya bırakılmaz. Tamamlanmış dosyalar yerindedir;
+        # bu istekte kaydedilemeseler de sonraki tarama/izleyici tarafından eklenirler.
+        if target is not None:
+            target.discard()
+
+    if hashed:
+        record_hashed_files(FileIndex.KIND_XML, hashed)
+        apply_xml_changes([target_abs for target_abs, _ in hashed.values()])
+
+    saved = []
+    for row in XMLFile.get_by_paths(list(hashed)):
+        saved.append(dict(_file_entry(row), filename=uploaded_names[row.file_path]))
+    _resolve_duplicates(duplicates)
+
+    message = f"{len(saved)} yeni dosya eklendi."
+    if duplicates:
+        message += f" {len(duplicates)} dosya zaten kayıtlı olduğu için tekrar saklanmadı."
+    if skipped:
+        message += f" {len(skipped)} dosya atlandı."
+    return {"saved": saved, "duplicates": duplicates, "skipped": skipped, "message": message}
 
 
 def delete_xml_file(file_id: int) -> bool:
@@ -173,6 +407,14 @@ def delete_xml_file(file_id: int) -> bool:
     return XMLFile.delete_by_id_with_diffs(file_id)
 
 
+def get_document_cache_stats() -> Dict:
+    """
+    Diff, filtreleme, birleştirme ve dışa aktarmanın paylaştığı belge önbelleğinin isabet/ıska sayaçları
+    ve bellekte tutulan tahmini byte miktarı.
+    """
+    return document_cache.get_stats()
+
+
 def get_file_path_by_id(file_id: int) -> Optional[str]:
     """
     Verilen file_id'ye karşılık gelen dosyanın tam yolunu döndürür.
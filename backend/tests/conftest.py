@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testler backend dizinindeki paketleri (services, codesys_doc_tracker) doğrudan içe aktarır
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
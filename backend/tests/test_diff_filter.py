@@ -0,0 +1,21 @@
+import pytest
+
+from services.diff_filter import NoiseFilter, validate_rule
+
+
+def test_regex_rule_is_matched_inside_combined_filter():
+    validate_rule("regex", r"(?i:timestamp)\s*=")
+    noise = NoiseFilter([{"kind": "regex", "pattern": r"(?i:timestamp)\s*="}, {"kind": "contains", "pattern": "x"}])
+    assert noise("TimeStamp = 12")
+    assert not noise("value = 1")
+
+
+@pytest.mark.parametrize("pattern", [r"(?i)timestamp", r"(a)\1", r"(a)?(?(1)b|c)"])
+def test_regex_rule_that_breaks_combined_filter_is_rejected(pattern):
+    with pytest.raises(ValueError):
+        validate_rule("regex", pattern)
+
+
+def test_named_backreference_and_escaped_backslash_are_allowed():
+    validate_rule("regex", r"(?P<q>['\"]).*(?P=q)")
+    validate_rule("regex", r"C:\\1")
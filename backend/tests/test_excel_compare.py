@@ -0,0 +1,34 @@
+import pandas as pd
+
+from services.excel_compare import align_frames, compare_frames
+
+
+def test_duplicate_key_on_new_side_only_pairs_by_occurrence():
+    old = pd.DataFrame({"ID": [1, 2, 3], "V": [10, 20, 30]})
+    new = pd.DataFrame({"ID": [1, 2, 2, 3], "V": [10, 20, 21, 31]})
+
+    result = compare_frames(old, new, "ID")
+
+    assert result["summary"] == {"added": 1, "removed": 0, "modified": 1, "unchanged": 2}
+    assert result["added"] == [{"ID": 2, "V": 21}]
+    assert [row["key"] for row in result["modified"]] == [3]
+
+
+def test_duplicate_key_on_old_side_only_pairs_by_occurrence():
+    old = pd.DataFrame({"ID": ["a", "b", "b"], "V": [1, 2, 3]})
+    new = pd.DataFrame({"ID": ["a", "b"], "V": [1, 2]})
+
+    diff = align_frames(old, new, "ID")
+
+    assert diff.summary == {"added": 0, "removed": 1, "modified": 0, "unchanged": 2}
+    assert diff.removed_pos.tolist() == [2]
+
+
+def test_duplicate_keys_on_both_sides():
+    old = pd.DataFrame({"ID": [1, 1, 2], "V": [1, 2, 3]})
+    new = pd.DataFrame({"ID": [1, 1, 1, 2], "V": [1, 5, 6, 3]})
+
+    result = compare_frames(old, new, "ID")
+
+    assert result["summary"] == {"added": 1, "removed": 0, "modified": 1, "unchanged": 2}
+    assert result["modified"][0]["changes"] == {"V": {"from": 2, "to": 5}}
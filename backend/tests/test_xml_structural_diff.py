@@ -0,0 +1,39 @@
+import io
+
+from services.xml_structural_diff import iter_leaves, iter_structural_diff
+
+_DOCUMENT = """<?xml version="1.0" encoding="utf-8"?>
+<project xmlns="http://www.plcopen.org/xml/tc6_0200">
+  <types><pous>
+    <pou name="P_IOVD_A" pouType="{pou_type}">
+      <interface><localVars>
+        <variable name="S_In" address="{address}"><type><BOOL/></type></variable>
+      </localVars></interface>
+    </pou>
+  </pous></types>
+</project>
+"""
+
+
+def _document(pou_type="program", address="%IX0.0") -> io.BytesIO:
+    return io.BytesIO(_DOCUMENT.format(pou_type=pou_type, address=address).encode("utf-8"))
+
+
+def test_attributes_of_elements_with_children_are_leaves():
+    leaves = dict(iter_leaves(_document()))
+
+    assert leaves["project/types/pous/pou[P_IOVD_A]/@"] == ['<pou name="P_IOVD_A" pouType="program">']
+    variable = "project/types/pous/pou[P_IOVD_A]/interface/localVars/variable[S_In]/@"
+    assert leaves[variable] == ['<variable address="%IX0.0" name="S_In">']
+
+
+def test_changed_attributes_on_parent_elements_are_reported():
+    old = _document()
+    new = _document(pou_type="functionBlock", address="%IX9.9")
+
+    report = list(iter_structural_diff(lambda: _document(), new))
+    changed = [line for line in report if line.startswith(("-", "+"))]
+
+    assert any('address="%IX9.9"' in line for line in changed)
+    assert any('pouType="functionBlock"' in line for line in changed)
+    assert list(iter_structural_diff(lambda: _document(), old)) == []
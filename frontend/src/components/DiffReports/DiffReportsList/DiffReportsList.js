@@ -14,6 +14,7 @@ const prettyApiError = (err) => {
   if (status === 401) return 'Oturum süreniz dolmuştur, lütfen giriş yapın.';
   if (status === 403) return 'Bu işlem için yetkiniz yok.';
   if (status === 404) return 'Kayıt bulunamadı.';
+  if (status === 410 && raw) return raw;
   if (status === 409 || looksLikeFk)
     return 'Bu kayıt ilişkili not/ilişkiler içerdiği için silinemez.';
 
@@ -21,12 +22,16 @@ const prettyApiError = (err) => {
   return 'Bir hata oluştu.';
 };
 
+// Önizlemede her seferinde çekilecek satır sayısı (rapor sayfa sayfa okunur)
+const PAGE_SIZE = 1000;
+const EMPTY_PREVIEW = { open: false, fileName: '', lines: [], nextOffset: null, totalLines: 0 };
+
 function DiffReportsList() {
   const [rows, setRows] = useState([]);
   const [loading, setLoading] = useState(true);
   const [busy, setBusy] = useState(false);
   const [error, setError] = useState('');
-  const [preview, setPreview] = useState({ open: false, fileName: '', content: '' });
+  const [preview, setPreview] = useState(EMPTY_PREVIEW);
 
   const getAuth = useCallback(() => {
     const token = localStorage.getItem('jwt_token');
@@ -66,25 +71,55 @@ function DiffReportsList() {
     }
   };
 
+  const fetchPage = useCallback(async (fileName, offset) => {
+    const res = await axios.get(
+      `http://localhost:5000/api/diffs/report/${encodeURIComponent(fileName)}`,
+      { ...getAuth(), params: { offset, limit: PAGE_SIZE } }
+    );
+    return res.data.data;
+  }, [getAuth]);
+
   const handlePreview = async (fileName) => {
     setBusy(true);
     setError('');
     try {
-      await axios.post('http://localhost:5000/api/diffs/resync', {}, getAuth());
-      const res = await axios.get(
-        `http://localhost:5000/api/diffs/report/${encodeURIComponent(fileName)}`,
-        { ...getAuth(), responseType: 'text' }
-      );
-      setPreview({ open: true, fileName, content: res.data });
+      // Önbellek temizliğinde silinmiş rapor bu istekte yeniden üretilir; yeni adı sayfa yanıtından gelir
+      const page = await fetchPage(fileName, 0);
+      setPreview({
+        open: true,
+        fileName: page.file_name,
+        lines: page.lines,
+        nextOffset: page.next_offset,
+        totalLines: page.total_lines
+      });
+      if (page.file_name !== fileName) await fetchList();
     } catch (e) {
       setError(prettyApiError(e));
-      setPreview({ open: false, fileName: '', content: '' });
+      setPreview(EMPTY_PREVIEW);
     } finally {
       setBusy(false);
     }
   };
 
-  const closePreview = () => setPreview({ open: false, fileName: '', content: '' });
+  const loadMore = async () => {
+    if (preview.nextOffset === null) return;
+    setBusy(true);
+    try {
+      const page = await fetchPage(preview.fileName, preview.nextOffset);
+      setPreview(prev => ({
+        ...prev,
+        lines: prev.lines.concat(page.lines),
+        nextOffset: page.next_offset,
+        totalLines: page.total_lines
+      }));
+    } catch (e) {
+      setError(prettyApiError(e));
+    } finally {
+      setBusy(false);
+    }
+  };
+
+  const closePreview = () => setPreview(EMPTY_PREVIEW);
 
   if (loading) return <div className="loading-message">Raporlar yükleniyor…</div>;
 
@@ -99,16 +134,24 @@ function DiffReportsList() {
           <tr>
             <th>Dosya Adı</th>
             <th>Oluşturulma</th>
+            <th>Değişiklik</th>
             <th style={{ width: '200px' }}>Aksiyonlar</th>
           </tr>
         </thead>
         <tbody>
           {rows.length === 0 ? (
-            <tr><td colSpan={3} style={{ textAlign: 'center' }}>Kayıt bulunamadı.</td></tr>
+            <tr><td colSpan={4} style={{ textAlign: 'center' }}>Kayıt bulunamadı.</td></tr>
           ) : rows.map(r => (
             <tr key={r.id}>
-              <td title={r.file_path}>{r.file_name}</td>
+              <td title={r.report_available ? r.file_path : 'Rapor temizlendi; görüntülenince yeniden üretilir'}>
+                {r.file_name}{!r.report_available && ' (temizlendi)'}
+              </td>
               <td>{r.created_at ? new Date(r.created_at).toLocaleString() : '-'}</td>
+              <td title={r.stats ? Object.keys(r.stats.pou_changes).join(', ') : ''}>
+                {r.stats
+                  ? `+${r.stats.added_lines} / -${r.stats.removed_lines} / ~${r.stats.changed_lines}`
+                  : '-'}
+              </td>
               <td className="actions">
                 <button
                   className="btn btn-view"
@@ -137,7 +180,15 @@ function DiffReportsList() {
               <h4>{preview.fileName}</h4>
               <button className="btn btn-delete" onClick={closePreview}>Kapat</button>
             </div>
-            <pre className="modal-content">{preview.content}</pre>
+            <pre className="modal-content">{preview.lines.join('\n')}</pre>
+            {preview.nextOffset !== null && (
+              <div className="modal-footer">
+                <span>{preview.lines.length} / {preview.totalLines} satır</span>
+                <button className="btn btn-view" onClick={loadMore} disabled={busy}>
+                  Devamını yükle
+                </button>
+              </div>
+            )}
           </div>
         </div>
       )}
@@ -21,7 +21,7 @@ function XMLMergePage() {
   const [xmlFiles, setXmlFiles] = useState([]);
   const [selectedFileId, setSelectedFileId] = useState('');
   const [codeBlock, setCodeBlock] = useState('');
-  const [mergedContent, setMergedContent] = useState('');
+  const [downloadToken, setDownloadToken] = useState('');
   const [mergedFileName, setMergedFileName] = useState('');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
@@ -71,18 +71,18 @@ function XMLMergePage() {
     setLoading(true);
     setError('');
     setSuccessMsg('');          // ✅ önceki başarı mesajını temizle
-    setMergedContent('');
+    setDownloadToken('');
     setMergedFileName('');
 
     try {
       const response = await axios.post(
-        `${API_URL}/`,
-        { file_id: selectedFileId, code_block: codeBlock },
+        `${API_URL}/batch`,
+        { items: [{ file_id: selectedFileId, code_block: codeBlock }] },
         getAuthHeaders()
       );
 
       if (response.data.success) {
-        setMergedContent(response.data.content);
+        setDownloadToken(response.data.token);
         setMergedFileName(response.data.file_name);
         const msg = response.data.message || 'XML birleştirme başarılı. Dosya birleştirilmiştir.';
         setSuccessMsg(msg);      // ✅ ekranda yeşil mesaj
@@ -102,16 +102,16 @@ function XMLMergePage() {
   };
 
   const handleDownload = async () => {
-    if (!mergedContent) {
+    if (!downloadToken) {
       toast.error('Önce birleştirme işlemini yapmalısınız.');
       return;
     }
 
     try {
       const authHeaders = getAuthHeaders();
-      const response = await axios.post(
-        `${API_URL}/download`,
-        { content: mergedContent, file_name: mergedFileName },
+      // Birleştirilmiş dosya sunucuda hazır; içerik geri gönderilmeden token ile indirilir
+      const response = await axios.get(
+        `${API_URL}/download/${downloadToken}`,
         { ...authHeaders, responseType: 'blob' }
       );
 
@@ -178,7 +178,7 @@ function XMLMergePage() {
         <button onClick={handleMerge} disabled={loading || !selectedFileId || !codeBlock}>
           {loading ? 'Birleştiriliyor...' : 'Birleştir'}
         </button>
-        <button onClick={handleDownload} disabled={!mergedContent}>
+        <button onClick={handleDownload} disabled={!downloadToken}>
           Birleştirilmiş Dosyayı İndir
         </button>
       </div>
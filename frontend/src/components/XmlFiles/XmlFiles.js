@@ -5,6 +5,10 @@ import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 import './XmlFiles.css';
 
+// Akışlı yüklemede istek başına dosya sayısı ve aynı anda gönderilen istek sayısı
+const UPLOAD_BATCH_SIZE = 10;
+const UPLOAD_CONCURRENCY = 3;
+
 // Ortak hata mesajı yardımcı fonksiyonu
 const getApiErrorMessage = (err, fallback = 'Bir hata oluştu.') => {
   const status = err?.response?.status;
@@ -139,14 +143,36 @@ function XmlFiles() {
         return;
       }
 
-      const fd = new FormData();
-      files.forEach((f) => fd.append('files', f, f.name));
-
-      await axios.post('http://localhost:5000/api/xmlfiles/upload', fd, {
-        ...auth,
-        headers: { ...auth.headers, 'Content-Type': 'multipart/form-data' }
-      });
+      // Dosyalar küçük gruplar halinde, aynı anda birkaç istekle akışlı yükleme uç noktasına gönderilir
+      const batches = [];
+      for (let i = 0; i < files.length; i += UPLOAD_BATCH_SIZE) {
+        batches.push(files.slice(i, i + UPLOAD_BATCH_SIZE));
+      }
+      const results = [];
+      let next = 0;
+      const worker = async () => {
+        while (next < batches.length) {
+          const batch = batches[next++];
+          const fd = new FormData();
+          batch.forEach((f) => fd.append('files', f, f.name));
+          const res = await axios.post('http://localhost:5000/api/xmlfiles/upload/stream', fd, {
+            ...auth,
+            headers: { ...auth.headers, 'Content-Type': 'multipart/form-data' }
+          });
+          results.push(res.data?.data || {});
+        }
+      };
+      await Promise.all(Array.from({ length: Math.min(UPLOAD_CONCURRENCY, batches.length) }, worker));
 
+      const duplicates = results.flatMap((r) => r.duplicates || []);
+      const skipped = results.flatMap((r) => r.skipped || []);
+      if (duplicates.length) {
+        const names = duplicates.map((d) => `${d.filename} → ${d.file_name || d.file_path}`).join(', ');
+        toast.info(`Aynı içerik zaten kayıtlı, tekrar saklanmadı: ${names}`);
+      }
+      if (skipped.length) {
+        toast.warn(`Atlanan dosyalar: ${skipped.map((s) => `${s.filename} (${s.reason})`).join(', ')}`);
+      }
       toast.success('XML dosyaları başarıyla yüklendi.');
       await fetchList();
     } catch (e) {